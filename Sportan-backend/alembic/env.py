@@ -9,6 +9,7 @@ from alembic import context
 from app.core.config import settings
 from app.core.database import Base
 from app.modules.ai import models as ai_models  # noqa: F401
+from app.modules.analytics import models as analytics_models  # noqa: F401
 from app.modules.coaching import models as coaching_models  # noqa: F401
 
 # Import all models so Alembic can detect them for autogenerate
@@ -0,0 +1,50 @@
+"""server side write defaults
+
+Revision ID: 7c3e1a9d4b52
+Revises: 2ecbac0b57a7
+Create Date: 2026-10-19 09:12:41.218604
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e1a9d4b52"
+down_revision: str | Sequence[str] | None = "2ecbac0b57a7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+UUID_DEFAULT = sa.text("gen_random_uuid()")
+UTC_NOW_DEFAULT = sa.text("timezone('utc', now())")
+
+# (table, column, default) for every write path that now relies on INSERT ... RETURNING
+SERVER_DEFAULTS = [
+    ("groups", "id", UUID_DEFAULT),
+    ("groups", "created_at", UTC_NOW_DEFAULT),
+    ("group_athletes", "joined_at", UTC_NOW_DEFAULT),
+    ("athletes", "id", UUID_DEFAULT),
+    ("athletes", "created_at", UTC_NOW_DEFAULT),
+    ("parents", "id", UUID_DEFAULT),
+    ("parents", "created_at", UTC_NOW_DEFAULT),
+    ("assigned_workouts", "id", UUID_DEFAULT),
+    ("assigned_workouts", "status", sa.text("'PENDING'")),
+    ("assigned_workouts", "created_at", UTC_NOW_DEFAULT),
+    ("workouts", "id", UUID_DEFAULT),
+    ("workouts", "created_at", UTC_NOW_DEFAULT),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, default in SERVER_DEFAULTS:
+        op.alter_column(table, column, server_default=default)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, _ in reversed(SERVER_DEFAULTS):
+        op.alter_column(table, column, server_default=None)
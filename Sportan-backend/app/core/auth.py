@@ -2,7 +2,7 @@ import logging
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt import PyJWKClient
 from jwt.exceptions import InvalidTokenError, PyJWKClientError
@@ -70,3 +70,15 @@ def get_token_payload(token: Annotated[str, Depends(oauth2_scheme)]) -> dict:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Authentication error: {str(e)}",
         ) from e
+
+
+def verify_system_token(token: str | None):
+    if token is None or token != settings.SYSTEM_CRON_TOKEN:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid system token")
+
+
+def system_token_dependency(x_system_token: str = Header(..., alias="X-System-Token")):
+    verify_system_token(x_system_token)
+
+
+SystemTokenDep = Annotated[None, Depends(system_token_dependency)]
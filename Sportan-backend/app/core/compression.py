@@ -0,0 +1,185 @@
+"""
+Response compression (brotli or gzip) as a pure ASGI middleware.
+
+Bodies sent in one message are compressed whole once they pass the size threshold.
+Streamed bodies (`more_body=True`) go through an incremental compressor that is flushed
+after every chunk, so nothing is buffered and clients see each chunk as it is produced.
+Server-sent events and responses that already carry a Content-Encoding pass through.
+"""
+
+import logging
+import zlib
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+EXCLUDED_MEDIA_TYPES = ("text/event-stream",)
+
+
+# Ours in order of preference, for codings the client weighs equally
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def _qvalue(params: list[str]) -> float:
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return min(max(float(value), 0.0), 1.0)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def _choose_encoding(accept_encoding: str) -> str | None:
+    """The supported coding with the highest q-value; `q=0` refuses a coding (RFC 9110 §12.5.3)."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if coding:
+            weights[coding] = _qvalue(params)
+    # `*` covers any coding the header does not name
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        # wbits=31: gzip container
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = _choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def stream(self, encoding: str) -> _GzipStream | _BrotliStream:
+        if encoding == "br":
+            return _BrotliStream(self.brotli_quality)
+        return _GzipStream(self.gzip_level)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream = send
+        self.encoding = encoding
+        self.content_encoding = "identity"
+        self.start_message: Message | None = None
+        self.compressor: _GzipStream | _BrotliStream | None = None
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            if self._passthrough(message):
+                # Never compressed, so event streams get their headers before the first event
+                await self.downstream(message)
+                return
+            # Hold the headers until the first body chunk decides how to encode
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        self.raw_bytes += len(body)
+
+        if self.start_message is not None:
+            body = self._start(body, more_body)
+            await self.downstream(self.start_message)
+            self.start_message = None
+        elif self.compressor is not None:
+            body = self._compress_chunk(body, more_body)
+
+        self.wire_bytes += len(body)
+        await self.downstream({"type": "http.response.body", "body": body, "more_body": more_body})
+        if not more_body:
+            self._log()
+
+    @staticmethod
+    def _passthrough(start_message: Message) -> bool:
+        headers = Headers(raw=start_message["headers"])
+        media_type = headers.get("content-type", "").split(";")[0].strip()
+        return "content-encoding" in headers or media_type in EXCLUDED_MEDIA_TYPES
+
+    def _start(self, body: bytes, more_body: bool) -> bytes:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        if not more_body and len(body) < self.middleware.minimum_size:
+            return body
+
+        self.content_encoding = self.encoding
+        self.compressor = self.middleware.stream(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        body = self._compress_chunk(body, more_body)
+        if more_body:
+            # Streamed: the final length is unknown, fall back to chunked transfer
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+        return body
+
+    def _compress_chunk(self, body: bytes, more_body: bool) -> bytes:
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        return chunk
+
+    def _log(self) -> None:
+        # Route template once matched, so savings aggregate per endpoint rather than per id
+        route = self.scope.get("route")
+        path = getattr(route, "path", self.scope["path"])
+        logger.debug(
+            "%s %s raw=%d wire=%d encoding=%s",
+            self.scope["method"],
+            path,
+            self.raw_bytes,
+            self.wire_bytes,
+            self.content_encoding,
+        )
@@ -1,7 +1,16 @@
-from pydantic import AliasChoices, Field
+from pydantic import AliasChoices, BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class AIProviderConfig(BaseModel):
+    name: str
+    base_url: str
+    api_key: str
+    model: str
+    # Structured (JSON schema) output; false asks this provider for plain text
+    json_mode: bool = True
+
+
 class Settings(BaseSettings):
     DATABASE_URL: str
     SUPABASE_URL: str
@@ -11,8 +20,48 @@ class Settings(BaseSettings):
     AI_API_KEY: str = Field(validation_alias=AliasChoices("AI_API_KEY", "GEMINI_API_KEY"))
     AI_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta/openai/"
     AI_DEFAULT_MODEL: str = "gemini-2.5-flash"
+    # Ask the provider for JSON report sections; turn off for providers without structured output
+    AI_JSON_MODE: bool = True
+    # JSON list of OpenAI-compatible providers in order of preference; empty means the one above
+    AI_PROVIDERS: list[AIProviderConfig] = []
+    AI_PROVIDER_TIMEOUT_SECONDS: float = 120.0
+    # A call slower than this percentile of its provider's recent latencies is raced on the next provider
+    AI_HEDGE_PERCENTILE: float = Field(default=95.0, gt=0, le=100)
+    AI_HEDGE_MIN_SAMPLES: int = 20
+    # Failures in a row that take a provider out of rotation, and for how long
+    AI_BREAKER_FAILURES: int = 5
+    AI_BREAKER_COOLDOWN_SECONDS: float = 30.0
+    # Estimated tokens per report prompt; long workout histories are summarised to fit
+    AI_PROMPT_TOKEN_BUDGET: int = 6000
+    # Calls in flight per provider and process, and their sustained rate (token bucket)
+    AI_PROVIDER_CONCURRENCY: int = 8
+    AI_PROVIDER_REQUESTS_PER_SECOND: float = 4.0
+    AI_PROVIDER_BURST: int = 8
+    # Athletes read per page by the weekly insights batch
+    AI_BATCH_CHUNK_SIZE: int = 100
+    # Background AI report workers per process; 0 leaves jobs to a separate worker process
+    AI_REPORT_WORKERS: int = 2
+    AI_REPORT_POLL_SECONDS: float = 2.0
+    # A running job whose worker died is retried after this long, up to AI_REPORT_MAX_ATTEMPTS
+    AI_REPORT_JOB_TIMEOUT_SECONDS: int = 300
+    AI_REPORT_MAX_ATTEMPTS: int = 3
+    # Provider tokens a coach may use per UTC day; 0 means no limit
+    AI_COACH_DAILY_TOKEN_BUDGET: int = 0
+    # Usage events are buffered in memory and written every AI_USAGE_FLUSH_SECONDS, or once
+    # AI_USAGE_BATCH_SIZE are waiting; beyond AI_USAGE_MAX_PENDING the oldest are dropped
+    AI_USAGE_FLUSH_SECONDS: float = 5.0
+    AI_USAGE_BATCH_SIZE: int = 200
+    AI_USAGE_MAX_PENDING: int = 10000
+    # Age-band norms need this many athletes per (metric, band), so no table describes a handful of kids
+    ANALYTICS_NORM_MIN_ATHLETES: int = 10
+    # How long a process serves norm tables from memory before checking for a newer computation
+    ANALYTICS_NORM_CACHE_SECONDS: float = 300.0
     SYSTEM_CRON_TOKEN: str
     PROJECT_NAME: str = "Sportan Backend"
+    # Responses smaller than this many bytes are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    GZIP_COMPRESSION_LEVEL: int = Field(default=6, ge=1, le=9)
+    BROTLI_COMPRESSION_QUALITY: int = Field(default=4, ge=0, le=11)
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,5 +1,6 @@
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import Computed, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -8,6 +9,22 @@ from app.core.config import settings
 engine = create_async_engine(settings.DATABASE_URL, echo=False)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Server-side defaults let INSERT ... RETURNING hand back complete rows without a refresh
+UUID_SERVER_DEFAULT = text("gen_random_uuid()")
+UTC_NOW_SERVER_DEFAULT = text("timezone('utc', now())")
+
+# Text search configuration of the generated search vectors, and of the queries matched against them
+SEARCH_CONFIG = "english"
+
+
+def tsvector_of(*weighted: tuple[str, str]) -> Computed:
+    """Stored generated tsvector over (column, weight) pairs; weight A ranks above B (see search.service)."""
+    parts = [
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted
+    ]
+    return Computed(" || ".join(parts), persisted=True)
+
 
 class Base(DeclarativeBase):
     pass
@@ -0,0 +1,29 @@
+"""
+In-process counters, exposed at GET /system/metrics.
+
+Counters are per process and reset on restart; scrape them per instance. Pairs named
+`<name>.hit` / `<name>.miss` are also reported as a hit rate for `<name>`.
+"""
+
+from collections import Counter
+from typing import Any
+
+_counters: Counter[str] = Counter()
+
+
+def increment(name: str, amount: int = 1) -> None:
+    _counters[name] += amount
+
+
+def snapshot() -> dict[str, Any]:
+    counters = dict(sorted(_counters.items()))
+    prefixes = {name.rsplit(".", 1)[0] for name in counters if name.endswith((".hit", ".miss"))}
+    hit_rates = {}
+    for prefix in sorted(prefixes):
+        hits, misses = counters.get(f"{prefix}.hit", 0), counters.get(f"{prefix}.miss", 0)
+        hit_rates[prefix] = round(hits / (hits + misses), 4)
+    return {"counters": counters, "hit_rates": hit_rates}
+
+
+def reset() -> None:
+    _counters.clear()
@@ -0,0 +1,29 @@
+"""
+Read-only row projections for list endpoints.
+
+List queries select only the columns a `*Read` schema needs and hand back plain dicts,
+so no ORM entities are built or tracked in the session identity map.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def columns_for(model: type, schema: type[BaseModel]) -> list[InstrumentedAttribute]:
+    """Model columns backing every field of a read schema, in schema order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def as_dicts(rows: Sequence[Row], skip: int = 0) -> list[dict[str, Any]]:
+    """Turn result rows into dicts, dropping the first `skip` columns (e.g. a scoping anchor)."""
+    return [dict(zip(row._fields[skip:], row[skip:], strict=True)) for row in rows]
+
+
+async def fetch_dicts(db: AsyncSession, stmt: Select) -> list[dict[str, Any]]:
+    result = await db.execute(stmt)
+    return as_dicts(result.all())
@@ -0,0 +1,53 @@
+"""
+Client-side limits for calls to rate-limited upstream APIs.
+
+`Limiter` bounds how many calls are in flight (a semaphore) and how fast new ones start
+(a token bucket: `rate` per second sustained, bursts of up to `burst`). Waiters are served
+in arrival order. Limits are per process.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # Holding the lock while sleeping keeps waiters in order
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class Limiter:
+    """`async with limiter:` around each upstream call."""
+
+    def __init__(self, concurrency: int, rate: float, burst: int):
+        self._slots = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate, burst)
+
+    async def __aenter__(self):
+        await self._slots.acquire()
+        try:
+            await self._bucket.acquire()
+        except BaseException:
+            self._slots.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._slots.release()
@@ -0,0 +1,112 @@
+"""
+JSON responses encoded with orjson.
+
+`ORJSONResponse` is the app-wide default response class. orjson encodes UUIDs, dates,
+datetimes and enums natively, so service output needs no `jsonable_encoder` pass.
+
+`EventStreamResponse` sends server-sent events, one JSON `data:` line per event.
+
+`immutable()` is for resources that never change once created (stored AI reports): the
+client may cache them for a year, and `not_modified()` answers a revalidation by ETag
+without touching the database.
+
+`revalidated()` is for per-user snapshots that change without notice (the coach bootstrap):
+the ETag is a hash of the encoded body, and a client that already holds that body gets a
+304 without one. The data is still read; only the transfer is saved.
+
+`trusted()` is for routes whose service already returns data shaped exactly like the
+declared `response_model` (column projections, aggregates built from a schema). Returning
+a Response from the endpoint makes FastAPI skip response validation; the `response_model`
+still documents the route in OpenAPI.
+"""
+
+import hashlib
+import uuid
+from collections.abc import AsyncIterable
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Per user (behind auth), so only the client's own cache may keep it
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Per user, and checked with the server (If-None-Match) before every reuse
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _default(value: Any) -> Any:
+    # asyncpg hands back its own uuid.UUID subclass, which orjson only encodes for the exact type
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    # Pydantic models returned by services as-is (e.g. AthleteSummary)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def trusted(content: Any, status_code: int = 200) -> ORJSONResponse:
+    """Encode pre-shaped service output directly, skipping `response_model` re-validation."""
+    return ORJSONResponse(content, status_code=status_code)
+
+
+def entity_tag(resource_id: uuid.UUID) -> str:
+    # Weak: the body is the same resource whichever content encoding the middleware picks
+    return f'W/"{resource_id}"'
+
+
+def _client_holds(request: Request, etag: str) -> bool:
+    return etag in {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """304 if the client already holds this version, else None."""
+    if _client_holds(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL})
+    return None
+
+
+def immutable(content: Any, etag: str) -> ORJSONResponse:
+    return ORJSONResponse(content, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+
+def revalidated(request: Request, content: Any) -> Response:
+    """Encode `content` with an ETag of the bytes; 304 without a body if the client already holds them."""
+    body = orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    # Weak, as for entity_tag: the middleware may compress the body
+    etag = f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if _client_holds(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type=ORJSONResponse.media_type, headers=headers)
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data, default=_default) + b"\n\n"
+
+
+class EventStreamResponse(StreamingResponse):
+    """Server-sent events from an async iterable of `(event, data)` pairs."""
+
+    def __init__(self, events: AsyncIterable[tuple[str, Any]], status_code: int = 200):
+        async def encode():
+            async for event, data in events:
+                yield sse_event(event, data)
+
+        super().__init__(
+            encode(),
+            status_code=status_code,
+            media_type="text/event-stream",
+            # Deliver each event as it is written: no caching, no proxy buffering
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
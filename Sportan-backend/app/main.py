@@ -1,13 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core import metrics
+from app.core.auth import SystemTokenDep
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.modules.ai.batch import stop_background_runs
+from app.modules.ai.jobs import report_workers
 from app.modules.ai.router import router as ai_router
+from app.modules.ai.usage import usage_writer
+from app.modules.analytics.router import router as analytics_router
 from app.modules.coaching.router import router as coaching_router
 from app.modules.identity.router import router as identity_router
+from app.modules.search.router import router as search_router
 from app.modules.training.router import router as training_router
 
-app = FastAPI(title=settings.PROJECT_NAME)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    report_workers.start()
+    usage_writer.start()
+    yield
+    await report_workers.stop()
+    await stop_background_runs()
+    # Last, so usage from the jobs and runs stopped above is written
+    await usage_writer.stop()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,13 +39,26 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_COMPRESSION_QUALITY,
+)
 
 app.include_router(identity_router)
 app.include_router(coaching_router)
 app.include_router(training_router)
 app.include_router(ai_router)
+app.include_router(analytics_router)
+app.include_router(search_router)
 
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to Sportan API"}
+
+
+@app.get("/system/metrics", include_in_schema=False)
+async def get_metrics(_: SystemTokenDep):
+    return metrics.snapshot()
@@ -0,0 +1,288 @@
+"""
+Weekly insights for every athlete who trained in the last 7 days, as one batch.
+
+A run walks the active athletes in pages ordered by id (keyset, `id > cursor`), generates
+up to AI_PROVIDER_CONCURRENCY athletes at a time, and records the cursor and counters after
+each page. A run that stopped (deploy, crash, cancel) resumes after the last finished page. Athletes
+of a page that was cut short are looked at again; the ones already done hit the report cache
+and count as skipped. Insights cover the run's week (`window_start` and the 7 days after it),
+also when the run is resumed on a later day.
+
+An athlete is skipped when a weekly insight with identical inputs exists, i.e. nothing was
+logged or edited since the last one, when their coach has used up today's token budget, or
+when a coach request for the same insight is being generated (ai.inflight).
+Provider calls go through the per-provider limiters of ai.service's router, so a batch can't
+exceed a provider's rate limit or starve coach requests of it.
+
+Run from the scheduler with POST /system/ai/weekly-insights/batch, or as:
+    uv run python -m app.modules.ai.batch [--resume RUN_ID] [--chunk-size 100]
+"""
+
+import argparse
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, timedelta
+from enum import Enum
+
+from fastapi import HTTPException
+from sqlalchemy import and_, exists, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import UTC_NOW_SERVER_DEFAULT, AsyncSessionLocal, engine
+from app.modules.ai import inflight, usage
+from app.modules.ai import models as ai_models
+from app.modules.ai import service as ai_service
+from app.modules.identity import models as identity_models
+from app.modules.training import models as training_models
+
+logger = logging.getLogger(__name__)
+
+KIND = ai_models.ReportKind.WEEKLY_INSIGHT
+
+
+class Outcome(str, Enum):
+    GENERATED = "generated"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+async def start_run(db: AsyncSession) -> ai_models.ReportBatchRun:
+    window_start = datetime.utcnow().date() - timedelta(days=7)
+    result = await db.execute(
+        insert(ai_models.ReportBatchRun)
+        .values(kind=KIND, window_start=window_start)
+        .returning(ai_models.ReportBatchRun)
+    )
+    run = result.scalars().one()
+    await db.commit()
+    return run
+
+
+async def get_run(db: AsyncSession, run_id: uuid.UUID) -> ai_models.ReportBatchRun:
+    run = await db.get(ai_models.ReportBatchRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Batch run not found")
+    return run
+
+
+async def _active_athletes(
+    db: AsyncSession, run: ai_models.ReportBatchRun, limit: int
+) -> list[tuple[uuid.UUID, uuid.UUID]]:
+    """Next page of (athlete_id, coach_id) with a workout in the run's window."""
+    athlete = identity_models.Athlete
+    workout = training_models.Workout
+    query = (
+        select(athlete.id, athlete.coach_id)
+        .where(exists().where(workout.athlete_id == athlete.id, workout.date >= run.window_start))
+        .order_by(athlete.id)
+        .limit(limit)
+    )
+    if run.cursor is not None:
+        query = query.where(athlete.id > run.cursor)
+    result = await db.execute(query)
+    return [tuple(row) for row in result.all()]
+
+
+async def _generate(athlete_id: uuid.UUID, coach_id: uuid.UUID, window_start: date) -> Outcome:
+    try:
+        async with AsyncSessionLocal() as db:
+            # The run's week, also when it is resumed on a later day
+            inputs = await ai_service.weekly_insight_inputs(db, athlete_id, coach_id, window_start)
+            if inputs.prompt is None:
+                return Outcome.SKIPPED
+            if await ai_service.find_cached_report(db, ai_models.WeeklyInsight, athlete_id, inputs.input_hash):
+                return Outcome.SKIPPED
+            if await usage.over_budget(db, coach_id):
+                metrics.increment("ai_batch.over_budget")
+                return Outcome.SKIPPED
+        # Session closed: no pooled connection waits on the limiter or the provider
+        job, owned = await inflight.claim(KIND, athlete_id, coach_id, inputs.input_hash, ai_service.dump_inputs(inputs))
+        if not owned:
+            # The coach asked for this insight meanwhile; their job generates it
+            metrics.increment("ai_report_jobs.coalesced")
+            return Outcome.SKIPPED
+        try:
+            report = await ai_service.generate_from_inputs(KIND, athlete_id, coach_id, inputs)
+        except asyncio.CancelledError:
+            await asyncio.shield(inflight.requeue(job.id))
+            raise
+        except Exception as exc:
+            await inflight.finish(job.id, ai_models.ReportJobStatus.FAILED, error=str(exc))
+            raise
+        await inflight.finish(job.id, ai_models.ReportJobStatus.SUCCEEDED, report_id=report.id)
+    except ai_service.AIReportGenerationError as exc:
+        logger.warning("Weekly insight for athlete %s failed: %s", athlete_id, exc)
+        return Outcome.FAILED
+    except HTTPException as exc:
+        # Athlete deleted or moved to another coach since the page was read
+        logger.warning("Weekly insight for athlete %s failed: %s", athlete_id, exc.detail)
+        return Outcome.FAILED
+    except Exception:
+        logger.exception("Weekly insight for athlete %s failed", athlete_id)
+        return Outcome.FAILED
+    return Outcome.GENERATED
+
+
+async def _process_page(
+    athletes: list[tuple[uuid.UUID, uuid.UUID]], window_start: date, concurrency: int
+) -> dict[Outcome, int]:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(athlete_id: uuid.UUID, coach_id: uuid.UUID) -> Outcome:
+        async with slots:
+            return await _generate(athlete_id, coach_id, window_start)
+
+    outcomes = await asyncio.gather(*(one(athlete_id, coach_id) for athlete_id, coach_id in athletes))
+    counts = dict.fromkeys(Outcome, 0)
+    for outcome in outcomes:
+        counts[outcome] += 1
+        metrics.increment(f"ai_batch.{outcome.value}")
+    return counts
+
+
+async def _record_page(run_id: uuid.UUID, cursor: uuid.UUID, counts: dict[Outcome, int]):
+    run = ai_models.ReportBatchRun
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(run)
+            .where(run.id == run_id)
+            .values(
+                cursor=cursor,
+                processed=run.processed + sum(counts.values()),
+                generated=run.generated + counts[Outcome.GENERATED],
+                skipped=run.skipped + counts[Outcome.SKIPPED],
+                failed=run.failed + counts[Outcome.FAILED],
+                updated_at=UTC_NOW_SERVER_DEFAULT,
+            )
+        )
+        await db.commit()
+
+
+async def _finish_run(run_id: uuid.UUID, status: ai_models.ReportJobStatus, error: str | None = None):
+    run = ai_models.ReportBatchRun
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(run)
+            .where(run.id == run_id)
+            .values(status=status, error=error, updated_at=UTC_NOW_SERVER_DEFAULT, finished_at=UTC_NOW_SERVER_DEFAULT)
+        )
+        await db.commit()
+
+
+async def run_batch(run_id: uuid.UUID, chunk_size: int | None = None, concurrency: int | None = None):
+    """Process a run page by page from its cursor until no active athletes are left."""
+    chunk_size = chunk_size or settings.AI_BATCH_CHUNK_SIZE
+    concurrency = concurrency or settings.AI_PROVIDER_CONCURRENCY
+    try:
+        while True:
+            async with AsyncSessionLocal() as db:
+                run = await get_run(db, run_id)
+                if run.status == ai_models.ReportJobStatus.SUCCEEDED:
+                    return
+                athletes = await _active_athletes(db, run, chunk_size)
+                window_start = run.window_start
+            if not athletes:
+                break
+
+            counts = await _process_page(athletes, window_start, concurrency)
+            await _record_page(run_id, athletes[-1][0], counts)
+            logger.info(
+                "Batch %s: page of %d athletes, %d generated, %d skipped, %d failed",
+                run_id,
+                len(athletes),
+                counts[Outcome.GENERATED],
+                counts[Outcome.SKIPPED],
+                counts[Outcome.FAILED],
+            )
+    except asyncio.CancelledError:
+        # Shutdown: leave it FAILED so it can be resumed right away
+        await _finish_run(run_id, ai_models.ReportJobStatus.FAILED, error="Cancelled")
+        raise
+    except Exception as exc:
+        logger.exception("Batch %s stopped", run_id)
+        await _finish_run(run_id, ai_models.ReportJobStatus.FAILED, error=str(exc))
+        raise
+    await _finish_run(run_id, ai_models.ReportJobStatus.SUCCEEDED)
+
+
+async def resume_run(db: AsyncSession, run_id: uuid.UUID) -> ai_models.ReportBatchRun:
+    """Mark a stopped run as running again; its cursor is kept.
+
+    A RUNNING run only counts as stopped once its last page is older than the job timeout.
+    """
+    await get_run(db, run_id)
+    run = ai_models.ReportBatchRun
+    stale_before = func.timezone("utc", func.now()) - timedelta(seconds=settings.AI_REPORT_JOB_TIMEOUT_SECONDS)
+    result = await db.execute(
+        update(run)
+        .where(
+            run.id == run_id,
+            or_(
+                run.status == ai_models.ReportJobStatus.FAILED,
+                and_(run.status == ai_models.ReportJobStatus.RUNNING, run.updated_at < stale_before),
+            ),
+        )
+        .values(
+            status=ai_models.ReportJobStatus.RUNNING, error=None, finished_at=None, updated_at=UTC_NOW_SERVER_DEFAULT
+        )
+        .returning(run)
+    )
+    resumed = result.scalars().first()
+    if not resumed:
+        raise HTTPException(status_code=409, detail="Batch run is running or already finished")
+    await db.commit()
+    return resumed
+
+
+# Runs started through the API; kept referenced so they are not garbage collected mid-run
+_background_runs: set[asyncio.Task] = set()
+
+
+def run_in_background(run_id: uuid.UUID):
+    task = asyncio.create_task(run_batch(run_id))
+    _background_runs.add(task)
+    task.add_done_callback(_background_runs.discard)
+
+
+async def stop_background_runs():
+    for task in _background_runs:
+        task.cancel()
+    await asyncio.gather(*_background_runs, return_exceptions=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Generate weekly insights for all recently active athletes.")
+    parser.add_argument("--resume", type=uuid.UUID, help="continue a stopped run from its cursor")
+    parser.add_argument("--chunk-size", type=int, default=settings.AI_BATCH_CHUNK_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.AI_PROVIDER_CONCURRENCY)
+    args = parser.parse_args()
+
+    try:
+        async with AsyncSessionLocal() as db:
+            run = await (resume_run(db, args.resume) if args.resume else start_run(db))
+            run_id = run.id
+        logger.info("Batch %s over athletes active since %s", run_id, run.window_start)
+        usage.usage_writer.start()
+        await run_batch(run_id, args.chunk_size, args.concurrency)
+        async with AsyncSessionLocal() as db:
+            run = await get_run(db, run_id)
+        logger.info(
+            "Batch %s %s: %d athletes, %d generated, %d skipped, %d failed",
+            run_id,
+            run.status.value,
+            run.processed,
+            run.generated,
+            run.skipped,
+            run.failed,
+        )
+    finally:
+        await usage.usage_writer.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,287 @@
+"""
+Weekly insight for a whole training group, in one provider call.
+
+The roster comes from `coaching_service.get_group_athletes` (which also checks that the coach
+owns the group) and the week's training from one aggregate query: sessions, training days,
+titles and per-metric avg/min/max for every athlete on the roster. Each athlete becomes one
+labelled line of the prompt ("A3 Jane Doe: 4 sessions on 3 days ..."), so the prompt grows by
+a line per athlete rather than by their workouts. If the lines do not fit
+AI_PROMPT_TOKEN_BUDGET, metric details are dropped first, then the least active athletes are
+folded into a single line.
+
+With `athlete_notes`, the provider also writes one note per listed athlete; the labels in its
+reply are resolved back to athlete ids before the insight is stored. Identical inputs (roster,
+stats, week, notes or not) reuse the stored insight, as for athlete reports.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import JSON, String, cast, desc, distinct, func, insert, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics, projection
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.modules.ai import models as ai_models
+from app.modules.ai import prompts, sections, usage
+from app.modules.ai import service as ai_service
+from app.modules.coaching import models as coaching_models
+from app.modules.coaching import scoping
+from app.modules.coaching import service as coaching_service
+from app.modules.training import models as training_models
+
+KIND = ai_models.ReportKind.GROUP_INSIGHT
+
+# Bump when the prompt template changes, so cached insights from the old wording are not reused
+GROUP_PROMPT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class GroupInputs:
+    input_hash: str
+    # None when nobody on the roster trained this week and no provider call is needed
+    prompt: str | None
+    window_start: date
+    window_end: date
+    athlete_count: int
+    # Prompt label -> {"athlete_id", "name"} for the athletes listed in the prompt
+    labels: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+async def weekly_stats(db: AsyncSession, athlete_ids: list[uuid.UUID], since: date) -> dict[uuid.UUID, dict[str, Any]]:
+    """Sessions, training days, titles and numeric metric stats since `since`, per athlete, in one query."""
+    workout = training_models.Workout
+    scope = [workout.athlete_id.in_(athlete_ids), workout.date >= since]
+
+    sessions = (
+        select(
+            workout.athlete_id,
+            func.count().label("sessions"),
+            func.count(distinct(workout.date)).label("days"),
+            func.array_agg(distinct(workout.title)).label("titles"),
+        )
+        .where(*scope)
+        .group_by(workout.athlete_id)
+        .cte("sessions")
+    )
+    entry, value = prompts.numeric_metrics()
+    per_metric = (
+        select(
+            workout.athlete_id,
+            cast(entry.c.key, String).label("key"),
+            func.round(func.avg(value), 2).label("avg"),
+            func.min(value).label("min"),
+            func.max(value).label("max"),
+        )
+        .select_from(workout)
+        .join(entry, true())
+        .where(*scope, entry.c.value.regexp_match(prompts.NUMERIC_PATTERN))
+        .group_by(workout.athlete_id, entry.c.key)
+        .cte("per_metric")
+    )
+    metric = func.json_build_object(
+        "key", per_metric.c.key, "avg", per_metric.c.avg, "min", per_metric.c.min, "max", per_metric.c.max
+    )
+    per_athlete = (
+        select(
+            per_metric.c.athlete_id,
+            func.json_agg(aggregate_order_by(metric, per_metric.c.key), type_=JSON).label("metrics"),
+        )
+        .group_by(per_metric.c.athlete_id)
+        .cte("per_athlete")
+    )
+    query = select(
+        sessions.c.athlete_id, sessions.c.sessions, sessions.c.days, sessions.c.titles, per_athlete.c.metrics
+    ).outerjoin(per_athlete, per_athlete.c.athlete_id == sessions.c.athlete_id)
+    return {row["athlete_id"]: row for row in await projection.fetch_dicts(db, query)}
+
+
+def athlete_line(label: str, name: str, stats: dict[str, Any] | None, with_metrics: bool = True) -> str:
+    if not stats:
+        return f"- {label} {name}: no sessions"
+    titles = ", ".join(sorted(title for title in stats["titles"] if title))
+    line = f"- {label} {name}: {stats['sessions']} sessions on {stats['days']} days ({titles})"
+    if with_metrics and stats["metrics"]:
+        line += "; " + "; ".join(f"{m['key']} avg {m['avg']} ({m['min']}-{m['max']})" for m in stats["metrics"])
+    return line
+
+
+def _template(window_start: date, window_end: date, athlete_count: int, athlete_notes: bool, roster: str) -> str:
+    return f"""
+    Analyze the training week ({window_start} to {window_end}) of a training group of {athlete_count} athletes.
+    Per-athlete notes requested: {"yes" if athlete_notes else "no"}.
+
+    Athletes (label, name: this week's training):
+    {roster}
+    """
+
+
+def _fit_roster(lines: list[tuple[str, str, str, int]], budget: int) -> tuple[list[str], list[str]]:
+    """Roster lines within `budget` tokens, and the labels they list.
+
+    `lines` are (label, full line, line without metrics, sessions), most active first.
+    """
+    for use in (1, 2):
+        roster = [line[use] for line in lines]
+        if sum(prompts.estimate_tokens(text) + 1 for text in roster) <= budget:
+            return roster, [line[0] for line in lines]
+
+    kept: list[str] = []
+    used = prompts.COLLAPSED_LINE_TOKENS
+    for index, (_, _, short, _) in enumerate(lines):
+        if used + prompts.estimate_tokens(short) + 1 > budget:
+            rest = lines[index:]
+            sessions = sum(line[3] for line in rest)
+            return kept + [f"- {len(rest)} more athletes: {sessions} sessions in total"], [
+                line[0] for line in lines[:index]
+            ]
+        kept.append(short)
+        used += prompts.estimate_tokens(short) + 1
+    return kept, [line[0] for line in lines]
+
+
+async def group_insight_inputs(
+    db: AsyncSession, group_id: uuid.UUID, coach_id: uuid.UUID, athlete_notes: bool
+) -> GroupInputs:
+    # 1. Verify ownership and get the roster, then the week's training in one aggregate query
+    athletes = await coaching_service.get_group_athletes(db, group_id, coach_id)
+    window_end = datetime.now(UTC).date()
+    window_start = window_end - timedelta(days=7)
+    stats = await weekly_stats(db, [a["id"] for a in athletes], window_start) if athletes else {}
+
+    # Most active first, so those are the ones kept if the roster has to be shortened
+    ordered = sorted(athletes, key=lambda a: (-(stats.get(a["id"]) or {}).get("sessions", 0), a["full_name"]))
+    labelled = {f"A{index}": a for index, a in enumerate(ordered, 1)}
+    # Stored in the insight's JSONB sections, so the id is kept as a string
+    labels = {label: {"athlete_id": str(a["id"]), "name": a["full_name"]} for label, a in labelled.items()}
+
+    input_hash = ai_service._input_hash(
+        KIND,
+        GROUP_PROMPT_VERSION,
+        window=[window_start, window_end],
+        athlete_notes=athlete_notes,
+        roster=[[a["id"], a["full_name"], stats.get(a["id"])] for a in ordered],
+    )
+    inputs = {
+        "input_hash": input_hash,
+        "window_start": window_start,
+        "window_end": window_end,
+        "athlete_count": len(athletes),
+    }
+    if not stats:
+        return GroupInputs(prompt=None, **inputs)
+
+    # 2. Prepare Prompt: the roster gets whatever the template leaves of the budget
+    template = sections.json_prompt(KIND, _template(window_start, window_end, len(athletes), athlete_notes, ""))
+    budget = settings.AI_PROMPT_TOKEN_BUDGET - prompts.estimate_tokens(template)
+    lines = [
+        (
+            label,
+            athlete_line(label, athlete["full_name"], stats.get(athlete["id"])),
+            athlete_line(label, athlete["full_name"], stats.get(athlete["id"]), with_metrics=False),
+            (stats.get(athlete["id"]) or {}).get("sessions", 0),
+        )
+        for label, athlete in labelled.items()
+    ]
+    roster, listed = _fit_roster(lines, budget)
+    prompt = _template(window_start, window_end, len(athletes), athlete_notes, "\n    ".join(roster))
+    return GroupInputs(prompt=prompt, labels={label: labels[label] for label in listed}, **inputs)
+
+
+def resolve_labels(structured: dict[str, Any], labels: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Replace the prompt labels in the notes with athlete ids and names, dropping unknown labels."""
+    notes = [
+        {**labels[note["athlete"]], "note": note["note"]}
+        for note in structured["athletes"]
+        if note["athlete"] in labels
+    ]
+    return {**structured, "athletes": notes}
+
+
+async def _find_cached(db: AsyncSession, group_id: uuid.UUID, input_hash: str) -> ai_models.GroupInsight | None:
+    insight = ai_models.GroupInsight
+    result = await db.execute(
+        select(insight)
+        .where(insight.group_id == group_id, insight.input_hash == input_hash)
+        .order_by(desc(insight.created_at))
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def _save(group_id: uuid.UUID, inputs: GroupInputs, report_text: str, structured: dict[str, Any] | None):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            insert(ai_models.GroupInsight)
+            .values(
+                group_id=group_id,
+                report_text=report_text,
+                sections=structured,
+                window_start=inputs.window_start,
+                window_end=inputs.window_end,
+                athlete_count=inputs.athlete_count,
+                input_hash=inputs.input_hash,
+            )
+            .returning(ai_models.GroupInsight)
+        )
+        insight = result.scalars().one()
+        await db.commit()
+        return insight
+
+
+async def generate_group_insight(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    coach_id: uuid.UUID,
+    athlete_notes: bool = False,
+    force_refresh: bool = False,
+) -> ai_models.GroupInsight:
+    inputs = await group_insight_inputs(db, group_id, coach_id, athlete_notes)
+    if force_refresh:
+        metrics.increment("ai_report_cache.bypass")
+    else:
+        cached = await _find_cached(db, group_id, inputs.input_hash)
+        metrics.increment("ai_report_cache.hit" if cached else "ai_report_cache.miss")
+        if cached:
+            return cached
+    if inputs.prompt:
+        await usage.check_budget(db, coach_id)
+
+    # 3. Hand the pooled connection back before the (slow) provider call
+    await db.close()
+    structured = None
+    if inputs.prompt:
+        completion = await ai_service._create_ai_report(
+            sections.json_prompt(KIND, inputs.prompt), sections.SCHEMAS[KIND]
+        )
+        usage.usage_writer.record(coach_id, None, KIND, completion.usage)
+        # A reply that is not valid sections JSON is kept as the report text
+        structured = sections.parse(KIND, completion.text)
+        if structured:
+            structured = resolve_labels(structured, inputs.labels)
+        report_content = sections.render(KIND, structured) if structured else completion.text
+    else:
+        report_content = ai_service.NO_WEEKLY_DATA_TEXT
+
+    # 4. Save Report
+    return await _save(group_id, inputs, report_content, structured)
+
+
+async def get_latest_group_insight(
+    db: AsyncSession, group_id: uuid.UUID, coach_id: uuid.UUID
+) -> ai_models.GroupInsight | None:
+    insight = ai_models.GroupInsight
+    # Ownership check and latest insight in one statement
+    query = (
+        scoping.owned_group(group_id, coach_id)
+        .add_columns(insight)
+        .outerjoin(insight, insight.group_id == coaching_models.Group.id)
+        .order_by(desc(insight.created_at))
+        .limit(1)
+    )
+    rows = await scoping.fetch_scoped(db, query, "Group not found")
+    return rows[0][1]
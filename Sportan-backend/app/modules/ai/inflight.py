@@ -0,0 +1,141 @@
+"""
+One generation per report inputs, whichever path asks for it.
+
+POST requests queue a job (ai.jobs), streams and batch runs generate in their own process, but
+all of them take the same slot first: the in-flight row in `ai_report_jobs` for (kind,
+athlete, coach, input_hash), unique while QUEUED or RUNNING (uq_ai_report_jobs_in_flight).
+The caller whose insert goes through generates the report and finishes the row with its id.
+A caller whose insert conflicts gets the row that holds the slot and waits for that job's
+report instead of calling the provider again.
+
+Streams and batch runs insert their row as RUNNING, with the prompt inputs, so workers leave
+it alone while it is being generated. If that process dies, the row goes stale after
+AI_REPORT_JOB_TIMEOUT_SECONDS and a worker generates the report from the stored inputs. A
+stream whose client goes away puts its row back in the queue right away.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import desc, func, select, update
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.modules.ai import models as ai_models
+from app.modules.ai.providers import AIReportGenerationError
+from app.modules.coaching import scoping
+
+# Database clock, so stale-job detection agrees across worker hosts
+UTC_NOW = func.timezone("utc", func.now())
+# How often a caller waiting on another job's report looks at its row
+WAIT_POLL_SECONDS = 0.5
+
+FINISHED = (ai_models.ReportJobStatus.SUCCEEDED, ai_models.ReportJobStatus.FAILED)
+
+
+def insert_job(
+    kind: ai_models.ReportKind, athlete_id: uuid.UUID, coach_id: uuid.UUID, input_hash: str, **values: Any
+) -> Insert:
+    """INSERT of a job for these inputs, only if the athlete is the coach's and no job for them is in flight."""
+    return scoping.insert_if_owned(
+        ai_models.ReportJob,
+        scoping.owned_athlete(athlete_id, coach_id),
+        {"kind": kind, "athlete_id": athlete_id, "coach_id": coach_id, "input_hash": input_hash, **values},
+    ).on_conflict_do_nothing(
+        index_elements=["kind", "athlete_id", "coach_id", "input_hash"], index_where=ai_models.REPORT_JOB_IN_FLIGHT
+    )
+
+
+async def find_job(
+    db: AsyncSession, kind: ai_models.ReportKind, athlete_id: uuid.UUID, coach_id: uuid.UUID, input_hash: str
+) -> ai_models.ReportJob | None:
+    """The latest job for these inputs: the one in flight, or the one that finished since an insert conflicted."""
+    job = ai_models.ReportJob
+    result = await db.execute(
+        select(job)
+        .where(job.kind == kind, job.athlete_id == athlete_id, job.coach_id == coach_id, job.input_hash == input_hash)
+        .order_by(desc(job.created_at))
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def claim(
+    kind: ai_models.ReportKind,
+    athlete_id: uuid.UUID,
+    coach_id: uuid.UUID,
+    input_hash: str,
+    inputs: dict[str, Any],
+    force_refresh: bool = False,
+) -> tuple[ai_models.ReportJob, bool]:
+    """The job holding the slot for these inputs, and whether this caller owns it and must generate the report.
+
+    `inputs` is ai.service.dump_inputs of the inputs, kept for a worker should this process die.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            insert_job(
+                kind,
+                athlete_id,
+                coach_id,
+                input_hash,
+                status=ai_models.ReportJobStatus.RUNNING,
+                started_at=UTC_NOW,
+                attempts=1,
+                force_refresh=force_refresh,
+                inputs=inputs,
+            )
+        )
+        job = result.scalars().first()
+        owned = job is not None
+        if not owned:
+            job = await find_job(db, kind, athlete_id, coach_id, input_hash)
+        await db.commit()
+    if job is None:
+        # Athlete deleted or moved to another coach since the request was checked
+        raise AIReportGenerationError("Athlete not found")
+    return job, owned
+
+
+async def finish(
+    job_id: uuid.UUID,
+    status: ai_models.ReportJobStatus,
+    report_id: uuid.UUID | None = None,
+    error: str | None = None,
+):
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(ai_models.ReportJob)
+            .where(ai_models.ReportJob.id == job_id)
+            .values(status=status, report_id=report_id, error=error, finished_at=UTC_NOW)
+        )
+        await db.commit()
+
+
+async def requeue(job_id: uuid.UUID):
+    """Hand a job its owner gave up on to the workers, for whoever else is waiting on its report."""
+    job = ai_models.ReportJob
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(job)
+            .where(job.id == job_id, job.status == ai_models.ReportJobStatus.RUNNING)
+            .values(status=ai_models.ReportJobStatus.QUEUED)
+        )
+        await db.commit()
+
+
+async def wait_for(job_id: uuid.UUID) -> ai_models.ReportJob | None:
+    """The job once it has finished; None if it was deleted with its athlete."""
+    deadline = time.monotonic() + settings.AI_REPORT_JOB_TIMEOUT_SECONDS
+    while True:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ai_models.ReportJob, job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        if time.monotonic() > deadline:
+            raise AIReportGenerationError("Report generation did not finish")
+        await asyncio.sleep(WAIT_POLL_SECONDS)
@@ -0,0 +1,262 @@
+"""
+Durable AI report jobs.
+
+The POST endpoints enqueue a row in `ai_report_jobs` and answer 202 with the job. They do
+build the prompt inputs first: the hash of those inputs answers a repeated request from the
+stored report without queueing anything, and joins a duplicate request to the job already in
+flight. The prompt and rolled digest are stored on the job row, so the worker does not build
+them a second time.
+
+Workers claim queued rows with FOR UPDATE SKIP LOCKED, so any number of workers, in any
+number of processes, never pick the same job. A worker re-checks ownership and the report
+cache in one query, calls the provider with the stored prompt and records the outcome; the
+report itself lands in talent_reports / weekly_insights.
+
+A job whose worker died mid-run (deploy, crash) stays RUNNING until the job timeout passes,
+then it is claimed again, up to AI_REPORT_MAX_ATTEMPTS.
+
+Run workers outside the API process with:
+    uv run python -m app.modules.ai.jobs
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import and_, desc, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.modules.ai import inflight, usage
+from app.modules.ai import models as ai_models
+from app.modules.ai import service as ai_service
+from app.modules.ai.inflight import UTC_NOW
+from app.modules.coaching import scoping
+from app.modules.identity import models as identity_models
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_report_job(
+    db: AsyncSession,
+    kind: ai_models.ReportKind,
+    athlete_id: uuid.UUID,
+    coach_id: uuid.UUID,
+    force_refresh: bool = False,
+) -> ai_models.ReportJob:
+    inputs = await ai_service.report_inputs(db, kind, athlete_id, coach_id, force_refresh)
+    if not force_refresh:
+        # Unchanged inputs: answer with the stored report now, no job for the workers
+        cached = await ai_service.find_cached_report(db, ai_service.REPORT_MODELS[kind], athlete_id, inputs.input_hash)
+        if cached:
+            metrics.increment("ai_report_cache.hit")
+            result = await db.execute(
+                insert(ai_models.ReportJob)
+                .values(
+                    kind=kind,
+                    athlete_id=athlete_id,
+                    coach_id=coach_id,
+                    status=ai_models.ReportJobStatus.SUCCEEDED,
+                    cache_hit=True,
+                    report_id=cached.id,
+                    input_hash=inputs.input_hash,
+                    inputs=ai_service.dump_inputs(inputs),
+                    started_at=UTC_NOW,
+                    finished_at=UTC_NOW,
+                )
+                .returning(ai_models.ReportJob)
+            )
+            job = result.scalars().one()
+            await db.commit()
+            return job
+
+    await usage.check_budget(db, coach_id)
+
+    # Insert only if the athlete belongs to the coach, and no job for the same inputs is in flight
+    result = await db.execute(
+        inflight.insert_job(
+            kind,
+            athlete_id,
+            coach_id,
+            inputs.input_hash,
+            force_refresh=force_refresh,
+            inputs=ai_service.dump_inputs(inputs),
+        )
+    )
+    job = result.scalars().first()
+    if job:
+        await db.commit()
+        report_workers.wake()
+        return job
+
+    # A double tap, a second device or a stream: share the job (and so the report) of the first
+    # request. It may have finished since the conflict; the latest job for these inputs still has its report.
+    job = await inflight.find_job(db, kind, athlete_id, coach_id, inputs.input_hash)
+    if not job:
+        raise HTTPException(status_code=404, detail="Athlete not found")
+    metrics.increment("ai_report_jobs.coalesced")
+    await db.commit()
+    return job
+
+
+async def get_report_job(db: AsyncSession, job_id: uuid.UUID, coach_id: uuid.UUID) -> ai_models.ReportJob:
+    result = await db.execute(
+        select(ai_models.ReportJob).where(ai_models.ReportJob.id == job_id, ai_models.ReportJob.coach_id == coach_id)
+    )
+    job = result.scalars().first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+async def claim_next_job(db: AsyncSession) -> ai_models.ReportJob | None:
+    """Atomically move the oldest claimable job to RUNNING; None when the queue is empty."""
+    job = ai_models.ReportJob
+    stale_before = UTC_NOW - timedelta(seconds=settings.AI_REPORT_JOB_TIMEOUT_SECONDS)
+    candidate = (
+        select(job.id)
+        .where(
+            job.attempts < settings.AI_REPORT_MAX_ATTEMPTS,
+            or_(
+                job.status == ai_models.ReportJobStatus.QUEUED,
+                and_(job.status == ai_models.ReportJobStatus.RUNNING, job.started_at < stale_before),
+            ),
+        )
+        .order_by(job.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(job)
+        .where(job.id == candidate)
+        .values(status=ai_models.ReportJobStatus.RUNNING, started_at=UTC_NOW, attempts=job.attempts + 1)
+        .returning(job)
+    )
+    claimed = result.scalars().first()
+    await db.commit()
+    return claimed
+
+
+async def fail_abandoned_jobs(db: AsyncSession) -> int:
+    """Give up on RUNNING jobs that timed out on their last allowed attempt."""
+    stale_before = UTC_NOW - timedelta(seconds=settings.AI_REPORT_JOB_TIMEOUT_SECONDS)
+    result = await db.execute(
+        update(ai_models.ReportJob)
+        .where(
+            ai_models.ReportJob.status == ai_models.ReportJobStatus.RUNNING,
+            ai_models.ReportJob.started_at < stale_before,
+            ai_models.ReportJob.attempts >= settings.AI_REPORT_MAX_ATTEMPTS,
+        )
+        .values(
+            status=ai_models.ReportJobStatus.FAILED,
+            finished_at=UTC_NOW,
+            error="Report generation did not finish",
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def _generate_from_job(job: ai_models.ReportJob):
+    """The job's report from the inputs stored when it was queued."""
+    model = ai_service.REPORT_MODELS[job.kind]
+    # Ownership check and cache lookup in one statement; a report with these inputs may have
+    # been saved while the job was queued
+    query = (
+        scoping.owned_athlete(job.athlete_id, job.coach_id)
+        .add_columns(model)
+        .outerjoin(model, and_(model.athlete_id == identity_models.Athlete.id, model.input_hash == job.input_hash))
+        .order_by(desc(model.created_at))
+        .limit(1)
+    )
+    async with AsyncSessionLocal() as db:
+        rows = await scoping.fetch_scoped(db, query, "Athlete not found")
+    cached = rows[0][1]
+    if cached and not job.force_refresh:
+        return cached
+    inputs = ai_service.load_inputs(job.input_hash, job.inputs)
+    return await ai_service.generate_from_inputs(job.kind, job.athlete_id, job.coach_id, inputs)
+
+
+async def run_job(job: ai_models.ReportJob) -> None:
+    try:
+        report = await _generate_from_job(job)
+    except ai_service.AIReportGenerationError as exc:
+        await inflight.finish(job.id, ai_models.ReportJobStatus.FAILED, error=str(exc))
+    except HTTPException as exc:
+        # Athlete deleted or moved to another coach since the job was queued
+        await inflight.finish(job.id, ai_models.ReportJobStatus.FAILED, error=str(exc.detail))
+    except Exception:
+        logger.exception("AI report job %s failed", job.id)
+        await inflight.finish(job.id, ai_models.ReportJobStatus.FAILED, error="Unexpected error")
+    else:
+        await inflight.finish(job.id, ai_models.ReportJobStatus.SUCCEEDED, report_id=report.id)
+
+
+class ReportWorkerPool:
+    """`concurrency` worker tasks that claim and run jobs until stopped."""
+
+    def __init__(self, concurrency: int, poll_seconds: float):
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        # A job interrupted here stays RUNNING and is retried after the job timeout
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self):
+        """Skip the poll interval after a local enqueue; other processes still find the job by polling."""
+        self._wake.set()
+
+    async def _work(self):
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    job = await claim_next_job(db)
+                    if job is None:
+                        await fail_abandoned_jobs(db)
+            except Exception:
+                logger.exception("Claiming an AI report job failed")
+                job = None
+
+            if job is not None:
+                await run_job(job)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+
+report_workers = ReportWorkerPool(settings.AI_REPORT_WORKERS, settings.AI_REPORT_POLL_SECONDS)
+
+
+async def run_workers():
+    pool = ReportWorkerPool(max(settings.AI_REPORT_WORKERS, 1), settings.AI_REPORT_POLL_SECONDS)
+    pool.start()
+    usage.usage_writer.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+        await usage.usage_writer.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_workers())
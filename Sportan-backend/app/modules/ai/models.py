@@ -1,11 +1,14 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
+from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Text
+from sqlalchemy import JSON, Boolean, Date, DateTime, ForeignKey, Index, Integer, String, Text, false, text
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import UTC_NOW_SERVER_DEFAULT, UUID_SERVER_DEFAULT, Base, tsvector_of
 
 if TYPE_CHECKING:
     from app.modules.identity.models import Athlete
@@ -13,21 +16,223 @@ if TYPE_CHECKING:
 
 class TalentReport(Base):
     __tablename__ = "talent_reports"
+    __table_args__ = (
+        Index("ix_talent_reports_athlete_id_input_hash", "athlete_id", "input_hash"),
+        # Report history, newest first (keyset on created_at, id)
+        Index("ix_talent_reports_athlete_id_created_at", "athlete_id", "created_at"),
+        # Containment filters (`sections @> '{"focus_areas": ["endurance"]}'`) across reports
+        Index(
+            "ix_talent_reports_sections",
+            "sections",
+            postgresql_using="gin",
+            postgresql_ops={"sections": "jsonb_path_ops"},
+        ),
+        Index("ix_talent_reports_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id"), nullable=False)
     report_text: Mapped[str] = mapped_column(Text)
+    # Validated JSON sections (see ai.sections); NULL when the report came back as plain text
+    sections: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # sha256 of the prompt inputs (see ai.service._input_hash); NULL for reports from before the cache
+    input_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Full-text search (see search.service); deferred so loading the entity does not read it
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, tsvector_of(("report_text", "B")), deferred=True)
 
     athlete: Mapped["Athlete"] = relationship("app.modules.identity.models.Athlete", back_populates="talent_reports")
 
 
 class WeeklyInsight(Base):
     __tablename__ = "weekly_insights"
+    __table_args__ = (
+        Index("ix_weekly_insights_athlete_id_input_hash", "athlete_id", "input_hash"),
+        # Report history, newest first (keyset on created_at, id)
+        Index("ix_weekly_insights_athlete_id_created_at", "athlete_id", "created_at"),
+        # Containment filters (`sections @> '{"focus_areas": ["endurance"]}'`) across reports
+        Index(
+            "ix_weekly_insights_sections",
+            "sections",
+            postgresql_using="gin",
+            postgresql_ops={"sections": "jsonb_path_ops"},
+        ),
+        Index("ix_weekly_insights_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id"), nullable=False)
     report_text: Mapped[str] = mapped_column(Text)
+    # Validated JSON sections (see ai.sections); NULL when the report came back as plain text
+    sections: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # sha256 of the prompt inputs (see ai.service._input_hash); NULL for reports from before the cache
+    input_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Full-text search (see search.service); deferred so loading the entity does not read it
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, tsvector_of(("report_text", "B")), deferred=True)
 
     athlete: Mapped["Athlete"] = relationship("app.modules.identity.models.Athlete", back_populates="weekly_insights")
+
+
+class ReportKind(str, Enum):
+    TALENT_REPORT = "talent_report"
+    WEEKLY_INSIGHT = "weekly_insight"
+    GROUP_INSIGHT = "group_insight"
+
+
+class ReportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class GroupInsight(Base):
+    """Weekly insight for a whole training group, from one provider call (see ai.groups)."""
+
+    __tablename__ = "group_insights"
+    __table_args__ = (
+        Index("ix_group_insights_group_id_created_at", "group_id", "created_at"),
+        Index("ix_group_insights_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
+    group_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
+    report_text: Mapped[str] = mapped_column(Text)
+    # GroupInsightSections with athlete labels resolved to ids; NULL when stored as plain text
+    sections: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    window_start: Mapped[date] = mapped_column(Date)
+    window_end: Mapped[date] = mapped_column(Date)
+    athlete_count: Mapped[int] = mapped_column(Integer)
+    # sha256 of the prompt inputs, as for athlete reports
+    input_hash: Mapped[str] = mapped_column(String(64))
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
+    # Full-text search (see search.service); deferred so loading the entity does not read it
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, tsvector_of(("report_text", "B")), deferred=True)
+
+
+class LatestReport(Base):
+    """Each athlete's newest report of a kind; upserted in the transaction that inserts the report."""
+
+    __tablename__ = "ai_latest_reports"
+
+    athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), primary_key=True)
+    kind: Mapped[ReportKind] = mapped_column(SQLEnum(ReportKind), primary_key=True)
+    # Id of the row in talent_reports or weekly_insights, depending on `kind`
+    report_id: Mapped[uuid.UUID] = mapped_column()
+    # The report's created_at; an upsert only moves the pointer forward
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+# Predicate of uq_ai_report_jobs_in_flight; ON CONFLICT must repeat it verbatim to infer the index
+REPORT_JOB_IN_FLIGHT = text("status IN ('QUEUED', 'RUNNING')")
+
+
+class ReportJob(Base):
+    """A queued AI report generation, claimed by workers with FOR UPDATE SKIP LOCKED."""
+
+    __tablename__ = "ai_report_jobs"
+    __table_args__ = (
+        Index("ix_ai_report_jobs_status_created_at", "status", "created_at"),
+        # At most one queued or running job per report inputs: duplicate requests join it
+        Index(
+            "uq_ai_report_jobs_in_flight",
+            "kind",
+            "athlete_id",
+            "coach_id",
+            "input_hash",
+            unique=True,
+            postgresql_where=REPORT_JOB_IN_FLIGHT,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
+    kind: Mapped[ReportKind] = mapped_column(SQLEnum(ReportKind))
+    athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), nullable=False)
+    coach_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("coaches.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[ReportJobStatus] = mapped_column(
+        SQLEnum(ReportJobStatus), server_default=ReportJobStatus.QUEUED.name
+    )
+    attempts: Mapped[int] = mapped_column(Integer, server_default="0")
+    force_refresh: Mapped[bool] = mapped_column(Boolean, server_default=false())
+    # sha256 of the report inputs when the job was queued; NULL for jobs from before deduplication
+    input_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Prompt and rolled digest built when the job was queued (ai.service.dump_inputs), so the
+    # worker does not build them again
+    inputs: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # Answered from a stored report with identical inputs instead of a provider call
+    cache_hit: Mapped[bool] = mapped_column(Boolean, server_default=false())
+    # Id of the finished row in talent_reports or weekly_insights, depending on `kind`
+    report_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class AthleteSummary(Base):
+    """Rolling digest of an athlete's training, carried from one talent report to the next."""
+
+    __tablename__ = "athlete_summaries"
+
+    athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), primary_key=True)
+    # Session count, date range, title counts and per-metric count/sum/min/max (see ai.summaries)
+    stats: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # created_at of the newest workout folded into `stats`; NULL rebuilds from the full history
+    through: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Text of the talent report the digest was last rolled forward with
+    narrative: Mapped[str | None] = mapped_column(Text, nullable=True)
+    narrative_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Bumped when a workout is edited or deleted, so reports for the old data are not reused
+    revision: Mapped[int] = mapped_column(Integer, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
+
+
+class ReportBatchRun(Base):
+    """A pass of the weekly insights batch over active athletes, resumable from `cursor`."""
+
+    __tablename__ = "ai_report_batch_runs"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
+    kind: Mapped[ReportKind] = mapped_column(SQLEnum(ReportKind))
+    # Athletes with a workout on or after this date are in the run
+    window_start: Mapped[date] = mapped_column(Date)
+    status: Mapped[ReportJobStatus] = mapped_column(
+        SQLEnum(ReportJobStatus), server_default=ReportJobStatus.RUNNING.name
+    )
+    # Highest athlete id whose page is done; the run continues after it
+    cursor: Mapped[uuid.UUID | None] = mapped_column(nullable=True)
+    processed: Mapped[int] = mapped_column(Integer, server_default="0")
+    generated: Mapped[int] = mapped_column(Integer, server_default="0")
+    skipped: Mapped[int] = mapped_column(Integer, server_default="0")
+    failed: Mapped[int] = mapped_column(Integer, server_default="0")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class UsageEvent(Base):
+    """Tokens and latency of one successful provider call, written in batches by ai.usage."""
+
+    __tablename__ = "ai_usage_events"
+    __table_args__ = (
+        # Today's total per coach for the budget check, and per-coach usage reads
+        Index("ix_ai_usage_events_coach_id_created_at", "coach_id", "created_at"),
+        Index("ix_ai_usage_events_created_at", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
+    coach_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("coaches.id", ondelete="CASCADE"), nullable=False)
+    # NULL for group insights; kept when the athlete is deleted, since the tokens were still spent
+    athlete_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("athletes.id", ondelete="SET NULL"), nullable=True)
+    kind: Mapped[ReportKind] = mapped_column(SQLEnum(ReportKind))
+    provider: Mapped[str] = mapped_column(String)
+    model: Mapped[str] = mapped_column(String)
+    prompt_tokens: Mapped[int] = mapped_column(Integer)
+    completion_tokens: Mapped[int] = mapped_column(Integer)
+    # Token counts estimated from the text length because the provider sent none
+    estimated: Mapped[bool] = mapped_column(Boolean, server_default=false())
+    streamed: Mapped[bool] = mapped_column(Boolean, server_default=false())
+    latency_ms: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
@@ -0,0 +1,197 @@
+"""
+Token-budgeted workout history for AI prompts.
+
+Recent sessions are listed verbatim, newest first, until they use their share of the
+budget. Everything older is summarised per month (session count, titles, and per-metric
+avg/min/max) by SQL aggregates, so the prompt stays under the budget however long the
+history is. If even the monthly lines do not fit, the oldest months collapse into one line.
+
+Token counts are estimated (about 4 characters per token), which is close enough for
+budgeting and needs no tokenizer.
+"""
+
+import math
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, Date, Numeric, String, case, cast, desc, distinct, func, literal, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import projection
+from app.modules.training import models as training_models
+
+CHARS_PER_TOKEN = 4
+# Share of the history budget for verbatim sessions; the rest is for monthly aggregates
+VERBATIM_SHARE = 0.6
+# Never fetch more verbatim candidates than could possibly fit (a line is at least ~8 tokens)
+MIN_TOKENS_PER_LINE = 8
+
+# Upper bound for the "YYYY-MM to YYYY-MM: N sessions over M months" line
+COLLAPSED_LINE_TOKENS = 16
+
+NUMERIC_PATTERN = r"^-?[0-9]+(\.[0-9]+)?$"
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def workout_line(workout: dict[str, Any]) -> str:
+    return f"- {workout['date']}: {workout['title']} ({workout['metrics']}, {workout['notes']})"
+
+
+@dataclass(frozen=True)
+class WorkoutHistory:
+    text: str
+    verbatim_sessions: int
+    aggregated_sessions: int
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def workout_scope(athlete_id: uuid.UUID, since: datetime | None) -> list[ColumnElement[bool]]:
+    """The athlete's workouts, or only those logged after `since`."""
+    workout = training_models.Workout
+    scope = [workout.athlete_id == athlete_id]
+    if since is not None:
+        scope.append(workout.created_at > since)
+    return scope
+
+
+def numeric_metrics():
+    """Lateral (key, value) rows for each workout's metrics, and the value as a number.
+
+    Callers must filter on `entry.c.value.regexp_match(NUMERIC_PATTERN)` before using the number.
+    """
+    workout = training_models.Workout
+    # json_each_text only accepts objects; metrics may be JSON null or a scalar
+    metrics_object = case(
+        (func.json_typeof(workout.metrics) == "object", workout.metrics), else_=literal("{}", workout.metrics.type)
+    )
+    entry = func.json_each_text(metrics_object).table_valued("key", "value").lateral()
+    return entry, cast(entry.c.value, Numeric)
+
+
+async def _recent_workouts(
+    db: AsyncSession, athlete_id: uuid.UUID, since: datetime | None, limit: int
+) -> list[dict[str, Any]]:
+    workout = training_models.Workout
+    query = (
+        select(workout.date, workout.title, workout.metrics, workout.notes)
+        .where(*workout_scope(athlete_id, since))
+        .order_by(desc(workout.date), desc(workout.created_at))
+        .limit(limit)
+    )
+    return await projection.fetch_dicts(db, query)
+
+
+async def _monthly_aggregates(
+    db: AsyncSession, athlete_id: uuid.UUID, since: datetime | None, through: date
+) -> list[dict[str, Any]]:
+    """Per-month session counts, titles and numeric metric stats for workouts up to `through`, newest first."""
+    workout = training_models.Workout
+    month = cast(func.date_trunc("month", workout.date), Date).label("month")
+    scope = [*workout_scope(athlete_id, since), workout.date <= through]
+
+    sessions = await projection.fetch_dicts(
+        db,
+        select(month, func.count().label("sessions"), func.array_agg(distinct(workout.title)).label("titles"))
+        .where(*scope)
+        .group_by(month)
+        .order_by(desc(month)),
+    )
+    if not sessions:
+        return []
+
+    entry, value = numeric_metrics()
+    stats = await projection.fetch_dicts(
+        db,
+        select(
+            month,
+            cast(entry.c.key, String).label("key"),
+            func.round(func.avg(value), 2).label("avg"),
+            func.min(value).label("min"),
+            func.max(value).label("max"),
+        )
+        .select_from(workout)
+        .join(entry, true())
+        .where(*scope, entry.c.value.regexp_match(NUMERIC_PATTERN))
+        .group_by(month, entry.c.key)
+        .order_by(entry.c.key),
+    )
+
+    metrics_by_month: dict[date, list[dict[str, Any]]] = defaultdict(list)
+    for row in stats:
+        metrics_by_month[row["month"]].append(row)
+    for row in sessions:
+        row["metrics"] = metrics_by_month[row["month"]]
+    return sessions
+
+
+def month_line(row: dict[str, Any]) -> str:
+    titles = ", ".join(sorted(row["titles"]))
+    line = f"- {row['month']:%Y-%m}: {row['sessions']} sessions ({titles})"
+    stats = [f"{m['key']} avg {m['avg']} ({m['min']}-{m['max']})" for m in row["metrics"]]
+    if stats:
+        line += "; " + "; ".join(stats)
+    return line
+
+
+async def workout_history(
+    db: AsyncSession, athlete_id: uuid.UUID, budget_tokens: int, since: datetime | None = None
+) -> WorkoutHistory:
+    """Workout history text for a prompt, estimated to fit in `budget_tokens`.
+
+    With `since`, only workouts logged (created) after it are included.
+    """
+    verbatim_budget = int(budget_tokens * VERBATIM_SHARE)
+    max_lines = max(verbatim_budget // MIN_TOKENS_PER_LINE, 1)
+    candidates = await _recent_workouts(db, athlete_id, since, limit=max_lines + 1)
+    if not candidates:
+        text = "No workouts logged yet." if since is None else "No new workouts logged."
+        return WorkoutHistory(text=text, verbatim_sessions=0, aggregated_sessions=0)
+
+    lines: list[str] = []
+    used = 0
+    for workout in candidates:
+        line = workout_line(workout)
+        if used + estimate_tokens(line) + 1 > verbatim_budget:
+            break
+        lines.append(line)
+        used += estimate_tokens(line) + 1
+
+    month_lines: list[str] = []
+    aggregated = 0
+    if len(lines) < len(candidates):
+        # Cut on a day boundary so a day is either listed or aggregated, never split
+        through = candidates[len(lines)]["date"]
+        while lines and candidates[len(lines) - 1]["date"] == through:
+            used -= estimate_tokens(lines.pop()) + 1
+
+        aggregate_budget = budget_tokens - used
+        months = await _monthly_aggregates(db, athlete_id, since, through=through)
+        for index, row in enumerate(months):
+            line = month_line(row)
+            # Keep room for the line that collapses whatever does not fit
+            if estimate_tokens(line) + 1 > aggregate_budget - COLLAPSED_LINE_TOKENS:
+                older = months[index:]
+                sessions = sum(m["sessions"] for m in older)
+                span = f"{older[-1]['month']:%Y-%m} to {row['month']:%Y-%m}"
+                month_lines.append(f"- {span}: {sessions} sessions over {len(older)} months")
+                aggregated += sessions
+                break
+            month_lines.append(line)
+            aggregate_budget -= estimate_tokens(line) + 1
+            aggregated += row["sessions"]
+
+    sections = []
+    if lines:
+        sections.append("Recent sessions (newest first):\n" + "\n".join(lines))
+    if month_lines:
+        sections.append("Earlier training, monthly summary (newest first):\n" + "\n".join(month_lines))
+    return WorkoutHistory(text="\n\n".join(sections), verbatim_sessions=len(lines), aggregated_sessions=aggregated)
@@ -0,0 +1,420 @@
+"""
+Routing of AI provider calls over one or more OpenAI-compatible endpoints.
+
+Providers come from AI_PROVIDERS, in order of preference, or are the single
+AI_BASE_URL / AI_API_KEY / AI_DEFAULT_MODEL provider. Each one keeps its recent latencies
+and outcomes, and a circuit breaker:
+
+- A call goes to the first provider whose breaker is closed. If it fails, the next one is
+  tried right away.
+- If it is still running after the provider's AI_HEDGE_PERCENTILE latency, a duplicate is sent
+  to the next provider and the first answer wins; the other call is cancelled. Hedging starts
+  once the provider has AI_HEDGE_MIN_SAMPLES latencies.
+- AI_BREAKER_FAILURES failures in a row open the breaker: the provider is skipped for
+  AI_BREAKER_COOLDOWN_SECONDS, then a single trial call decides whether it closes again.
+
+Calls with a response schema ask for JSON mode (`response_format` with the JSON schema). A
+provider configured with `json_mode: false` is asked for plain text instead, and so is one that
+rejects `response_format` with a 400, for the next JSON_MODE_RETRY_SECONDS; the caller
+validates whatever comes back. Any other 400 (prompt too long, content policy) fails the call
+and leaves JSON mode on.
+
+Streams fail over only until their first chunk and are not hedged, since a duplicate stream
+would hold a second provider slot for the whole report.
+
+Every successful call reports its `Usage`: provider, model, token counts from the provider's
+`usage` (estimated from the text length if it sends none) and latency. A hedged call that
+loses the race is cancelled before its usage arrives and is not reported.
+
+Per-provider latency percentiles, error rate and breaker state are at GET /system/ai/providers.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from openai import DEFAULT_MAX_RETRIES, AsyncOpenAI, BadRequestError, OpenAIError
+from pydantic import BaseModel
+
+from app.core import metrics, rate_limit
+from app.core.config import AIProviderConfig, settings
+from app.modules.ai.prompts import CHARS_PER_TOKEN, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Recent calls per provider that the percentiles and error rate are computed over
+WINDOW_SIZE = 200
+# After a provider rejects JSON mode it is asked for text this long, then JSON mode is tried again
+JSON_MODE_RETRY_SECONDS = 600.0
+# A 400 naming one of these is about JSON mode rather than the prompt
+JSON_MODE_PARAMS = ("response_format", "json_schema", "response_schema")
+
+
+class AIReportGenerationError(Exception):
+    """Raised when the AI provider fails to return a usable report."""
+
+
+@dataclass
+class Usage:
+    """Tokens and latency of one provider call; streams fill it in when they end."""
+
+    provider: str = ""
+    model: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    # The provider sent no token counts; these are estimated from the text length
+    estimated: bool = False
+
+
+@dataclass(frozen=True)
+class Completion:
+    text: str
+    usage: Usage
+
+
+class CallWindow:
+    """Latencies and outcomes of a provider's last `size` calls."""
+
+    def __init__(self, size: int = WINDOW_SIZE):
+        self._latencies: deque[float] = deque(maxlen=size)
+        self._outcomes: deque[bool] = deque(maxlen=size)
+
+    def record(self, ok: bool, latency: float | None = None):
+        self._outcomes.append(ok)
+        if latency is not None:
+            self._latencies.append(latency)
+
+    def add_latency(self, latency: float):
+        self._latencies.append(latency)
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank percentile of the recent latencies, in seconds."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+
+class CircuitBreaker:
+    """Opens after `threshold` failures in a row; after `cooldown` seconds one trial call may go through."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state this claims the one trial call."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._trial:
+            return False
+        self._trial = True
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial or self.failures >= self.threshold:
+            self._opened_at = time.monotonic()
+        self._trial = False
+
+    def release(self):
+        """A call ended without an outcome (cancelled); free the trial slot it may hold."""
+        self._trial = False
+
+
+def _message_text(completion: Any) -> str | None:
+    content = getattr(completion.choices[0].message, "content", None)
+    if isinstance(content, list):
+        content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content
+
+
+def _rejects_json_mode(exc: BadRequestError) -> bool:
+    if exc.param == "response_format":
+        return True
+    # Not every OpenAI-compatible API sets `param`; the message then names the parameter
+    message = str(exc).lower()
+    return any(param in message for param in JSON_MODE_PARAMS)
+
+
+def _fill_usage(usage: Usage, reported: Any, prompt: str, reply_chars: int):
+    """Token counts from the provider's `usage`, or estimates when it has none."""
+    if reported is not None and reported.prompt_tokens is not None:
+        usage.prompt_tokens = reported.prompt_tokens
+        usage.completion_tokens = reported.completion_tokens or 0
+        return
+    usage.prompt_tokens = estimate_tokens(prompt)
+    usage.completion_tokens = math.ceil(reply_chars / CHARS_PER_TOKEN)
+    usage.estimated = True
+
+
+class Provider:
+    def __init__(self, name: str, model: str, client: AsyncOpenAI, limiter: rate_limit.Limiter, json_mode: bool = True):
+        self.name = name
+        self.model = model
+        self.client = client
+        self.limiter = limiter
+        self.json_mode = json_mode
+        # time.monotonic() until which JSON mode is skipped, after the provider rejected it
+        self.json_mode_off_until = 0.0
+        self.window = CallWindow()
+        self.breaker = CircuitBreaker(settings.AI_BREAKER_FAILURES, settings.AI_BREAKER_COOLDOWN_SECONDS)
+
+    @classmethod
+    def from_config(cls, config: AIProviderConfig, max_retries: int = DEFAULT_MAX_RETRIES) -> "Provider":
+        client = AsyncOpenAI(
+            api_key=config.api_key,
+            base_url=config.base_url,
+            timeout=settings.AI_PROVIDER_TIMEOUT_SECONDS,
+            max_retries=max_retries,
+        )
+        limiter = rate_limit.Limiter(
+            settings.AI_PROVIDER_CONCURRENCY, settings.AI_PROVIDER_REQUESTS_PER_SECOND, settings.AI_PROVIDER_BURST
+        )
+        return cls(config.name, config.model, client, limiter, config.json_mode)
+
+    def _failed(self):
+        self.window.record(ok=False)
+        self.breaker.record_failure()
+        metrics.increment(f"ai_provider.{self.name}.error")
+
+    @property
+    def uses_json_mode(self) -> bool:
+        return self.json_mode and time.monotonic() >= self.json_mode_off_until
+
+    async def complete(self, prompt: str, response_schema: type[BaseModel] | None = None) -> Completion:
+        options = {}
+        if response_schema is not None and self.uses_json_mode:
+            schema = {"name": response_schema.__name__, "schema": response_schema.model_json_schema()}
+            options["response_format"] = {"type": "json_schema", "json_schema": schema}
+        started = None
+        try:
+            async with self.limiter:
+                started = time.monotonic()
+                completion = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    **options,
+                )
+                latency = time.monotonic() - started
+        except asyncio.CancelledError:
+            if started is not None:
+                # Lost a hedge race: it took at least this long, which keeps the slow tail in the window
+                self.window.add_latency(time.monotonic() - started)
+            self.breaker.release()
+            raise
+        except BadRequestError as exc:
+            if "response_format" not in options or not _rejects_json_mode(exc):
+                self._failed()
+                raise AIReportGenerationError(f"AI provider error: {exc}") from exc
+            logger.warning(
+                "AI provider %s rejected JSON mode, asking for text for %ds: %s",
+                self.name,
+                JSON_MODE_RETRY_SECONDS,
+                exc,
+            )
+            self.json_mode_off_until = time.monotonic() + JSON_MODE_RETRY_SECONDS
+            return await self.complete(prompt, response_schema)
+        except OpenAIError as exc:
+            self._failed()
+            raise AIReportGenerationError(f"AI provider error: {exc}") from exc
+
+        content = _message_text(completion)
+        if not content:
+            self._failed()
+            raise AIReportGenerationError("AI provider returned an empty response")
+        self.window.record(ok=True, latency=latency)
+        self.breaker.record_success()
+        usage = Usage(self.name, self.model, latency=latency)
+        _fill_usage(usage, getattr(completion, "usage", None), prompt, len(content))
+        return Completion(content, usage)
+
+    async def stream(self, prompt: str, usage: Usage | None = None) -> AsyncIterator[str]:
+        """Text deltas as they arrive; the limiter slot is held until the stream ends.
+
+        `usage`, if given, is filled in once the stream has ended without an error.
+        """
+        reported = None
+        reply_chars = 0
+        try:
+            async with self.limiter:
+                started = time.monotonic()
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    stream=True,
+                    # Token counts arrive on the last chunk
+                    stream_options={"include_usage": True},
+                )
+                async with stream:
+                    async for chunk in stream:
+                        if getattr(chunk, "usage", None) is not None:
+                            reported = chunk.usage
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            reply_chars += len(chunk.choices[0].delta.content)
+                            yield chunk.choices[0].delta.content
+                latency = time.monotonic() - started
+        except (asyncio.CancelledError, GeneratorExit):
+            self.breaker.release()
+            raise
+        except OpenAIError as exc:
+            self._failed()
+            raise AIReportGenerationError(f"AI provider error: {exc}") from exc
+        # No latency sample: a whole stream is not comparable with the completions hedging is based on
+        self.window.record(ok=True)
+        self.breaker.record_success()
+        if usage is not None:
+            usage.provider, usage.model, usage.latency = self.name, self.model, latency
+            _fill_usage(usage, reported, prompt, reply_chars)
+
+    def stats(self) -> dict[str, Any]:
+        p50, p95 = self.window.percentile(50), self.window.percentile(95)
+        return {
+            "name": self.name,
+            "model": self.model,
+            "state": self.breaker.state,
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            "error_rate": round(self.window.error_rate, 4),
+            "samples": self.window.samples,
+        }
+
+
+class ProviderRouter:
+    def __init__(self, providers: list[Provider], hedge_percentile: float, hedge_min_samples: int):
+        self.providers = providers
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+
+    @property
+    def primary_model(self) -> str:
+        return self.providers[0].model
+
+    def _hedge_delay(self, provider: Provider) -> float | None:
+        if len(self.providers) < 2 or provider.window.samples < self.hedge_min_samples:
+            return None
+        return provider.window.percentile(self.hedge_percentile)
+
+    @staticmethod
+    def _next(candidates: list[Provider]) -> Provider | None:
+        """Take the next provider whose breaker lets a call through."""
+        while candidates:
+            provider = candidates.pop(0)
+            if provider.breaker.allow():
+                return provider
+        return None
+
+    async def complete(self, prompt: str, response_schema: type[BaseModel] | None = None) -> Completion:
+        candidates = list(self.providers)
+        provider = self._next(candidates)
+        if provider is None:
+            raise AIReportGenerationError("No AI provider available")
+
+        calls = {asyncio.create_task(provider.complete(prompt, response_schema)): provider}
+        hedge_after = self._hedge_delay(provider)
+        hedge: Provider | None = None
+        hedged = False
+        error: BaseException | None = None
+        try:
+            while calls:
+                done, _ = await asyncio.wait(calls, timeout=hedge_after, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Slower than usual for this provider: race a duplicate on the next one
+                    hedge_after, hedged = None, True
+                    if hedge := self._next(candidates):
+                        metrics.increment("ai_provider.hedge")
+                        calls[asyncio.create_task(hedge.complete(prompt, response_schema))] = hedge
+                    continue
+
+                for task in done:
+                    winner = calls.pop(task)
+                    if task.exception() is None:
+                        if hedge is not None:
+                            metrics.increment("ai_provider.hedge.won" if winner is hedge else "ai_provider.hedge.lost")
+                        return task.result()
+                    error = task.exception()
+
+                if not calls and (provider := self._next(candidates)):
+                    metrics.increment("ai_provider.failover")
+                    calls[asyncio.create_task(provider.complete(prompt, response_schema))] = provider
+                    if not hedged:
+                        hedge_after = self._hedge_delay(provider)
+        finally:
+            for task in calls:
+                task.cancel()
+            await asyncio.gather(*calls, return_exceptions=True)
+        raise error
+
+    async def stream(self, prompt: str, usage: Usage | None = None) -> AsyncIterator[str]:
+        candidates = list(self.providers)
+        error: AIReportGenerationError | None = None
+        while provider := self._next(candidates):
+            if error is not None:
+                metrics.increment("ai_provider.failover")
+            started = False
+            try:
+                async for text in provider.stream(prompt, usage):
+                    started = True
+                    yield text
+                return
+            except AIReportGenerationError as exc:
+                # Text already sent can't be taken back; only fail over before the first chunk
+                if started:
+                    raise
+                error = exc
+        raise error or AIReportGenerationError("No AI provider available")
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [provider.stats() for provider in self.providers]
+
+
+def router_from_settings() -> ProviderRouter:
+    configs = settings.AI_PROVIDERS or [
+        AIProviderConfig(
+            name="default",
+            base_url=settings.AI_BASE_URL,
+            api_key=settings.AI_API_KEY,
+            model=settings.AI_DEFAULT_MODEL,
+            json_mode=settings.AI_JSON_MODE,
+        )
+    ]
+    # With a fallback provider, failing over beats the SDK's own retries with backoff
+    max_retries = 0 if len(configs) > 1 else DEFAULT_MAX_RETRIES
+    return ProviderRouter(
+        [Provider.from_config(config, max_retries) for config in configs],
+        settings.AI_HEDGE_PERCENTILE,
+        settings.AI_HEDGE_MIN_SAMPLES,
+    )
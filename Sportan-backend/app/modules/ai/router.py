@@ -1,19 +1,28 @@
+from datetime import UTC, date, datetime, timedelta
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import responses
+from app.core.auth import SystemTokenDep
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.responses import EventStreamResponse
+from app.modules.ai import batch as ai_batch
+from app.modules.ai import groups as ai_groups
+from app.modules.ai import jobs as ai_jobs
+from app.modules.ai import models as ai_models
 from app.modules.ai import schemas as ai_schemas
 from app.modules.ai import service as ai_service
-from app.modules.ai.service import AIReportGenerationError
-from app.modules.coaching import service as coaching_service
+from app.modules.ai import usage as ai_usage
 from app.modules.identity import models as identity_models
 from app.modules.identity import service as identity_service
 
 router = APIRouter(tags=["ai"])
 
+HistoryLimit = Annotated[int, Query(ge=1, le=100)]
 CoachDep = Annotated[identity_models.Coach, Depends(identity_service.get_current_coach)]
 ParentDep = Annotated[identity_models.Parent, Depends(identity_service.get_current_parent)]
 DbDep = Annotated[AsyncSession, Depends(get_db)]
@@ -22,43 +31,148 @@ DbDep = Annotated[AsyncSession, Depends(get_db)]
 # --- Coach AI Operations ---
 
 
-@router.post("/coach/athletes/{athlete_id}/ai/talent-recognition", response_model=ai_schemas.ReportRead)
-async def generate_talent_report(athlete_id: UUID, coach: CoachDep, db: DbDep):
-    try:
-        return await ai_service.generate_talent_report(db, athlete_id, coach.id)
-    except AIReportGenerationError as exc:
-        raise HTTPException(status_code=502, detail=str(exc)) from exc
+@router.post(
+    "/coach/athletes/{athlete_id}/ai/talent-recognition",
+    response_model=ai_schemas.ReportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def generate_talent_report(athlete_id: UUID, coach: CoachDep, db: DbDep, force_refresh: bool = False):
+    return await ai_jobs.enqueue_report_job(db, ai_models.ReportKind.TALENT_REPORT, athlete_id, coach.id, force_refresh)
+
+
+@router.post("/coach/athletes/{athlete_id}/ai/talent-recognition/stream", response_class=EventStreamResponse)
+async def stream_talent_report(athlete_id: UUID, coach: CoachDep, db: DbDep, force_refresh: bool = False):
+    prepared = await ai_service.prepare_report_stream(
+        db, ai_models.ReportKind.TALENT_REPORT, athlete_id, coach.id, force_refresh
+    )
+    return EventStreamResponse(ai_service.stream_report(prepared))
 
 
 @router.get("/coach/athletes/{athlete_id}/ai/talent-recognition", response_model=ai_schemas.ReportRead)
 async def get_talent_report_coach(athlete_id: UUID, coach: CoachDep, db: DbDep):
-    # Verify ownership
-    await coaching_service.get_athlete(db, athlete_id, coach.id)
-
-    report = await ai_service.get_latest_talent_report(db, athlete_id)
+    report = await ai_service.get_latest_talent_report(db, athlete_id, coach.id)
     if not report:
         raise HTTPException(status_code=404, detail="No report found")
     return report
 
 
-@router.post("/coach/athletes/{athlete_id}/ai/weekly-insights", response_model=ai_schemas.ReportRead)
-async def generate_weekly_insights(athlete_id: UUID, coach: CoachDep, db: DbDep):
-    try:
-        return await ai_service.generate_weekly_insights(db, athlete_id, coach.id)
-    except AIReportGenerationError as exc:
-        raise HTTPException(status_code=502, detail=str(exc)) from exc
+@router.get("/coach/athletes/{athlete_id}/ai/talent-recognition/history", response_model=ai_schemas.ReportPage)
+async def get_talent_report_history(
+    athlete_id: UUID, coach: CoachDep, db: DbDep, before: UUID | None = None, limit: HistoryLimit = 20
+):
+    """Talent reports newest first; pass the previous page's `next_before` to continue."""
+    return await ai_service.list_report_history(
+        db, ai_models.ReportKind.TALENT_REPORT, athlete_id, coach.id, before, limit
+    )
+
+
+@router.post(
+    "/coach/athletes/{athlete_id}/ai/weekly-insights",
+    response_model=ai_schemas.ReportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def generate_weekly_insights(athlete_id: UUID, coach: CoachDep, db: DbDep, force_refresh: bool = False):
+    return await ai_jobs.enqueue_report_job(
+        db, ai_models.ReportKind.WEEKLY_INSIGHT, athlete_id, coach.id, force_refresh
+    )
+
+
+@router.post("/coach/athletes/{athlete_id}/ai/weekly-insights/stream", response_class=EventStreamResponse)
+async def stream_weekly_insights(athlete_id: UUID, coach: CoachDep, db: DbDep, force_refresh: bool = False):
+    prepared = await ai_service.prepare_report_stream(
+        db, ai_models.ReportKind.WEEKLY_INSIGHT, athlete_id, coach.id, force_refresh
+    )
+    return EventStreamResponse(ai_service.stream_report(prepared))
 
 
 @router.get("/coach/athletes/{athlete_id}/ai/weekly-insights", response_model=ai_schemas.ReportRead)
 async def get_weekly_insights_coach(athlete_id: UUID, coach: CoachDep, db: DbDep):
-    await coaching_service.get_athlete(db, athlete_id, coach.id)
-
-    report = await ai_service.get_latest_weekly_insight(db, athlete_id)
+    report = await ai_service.get_latest_weekly_insight(db, athlete_id, coach.id)
     if not report:
         raise HTTPException(status_code=404, detail="No report found")
     return report
 
 
+@router.get("/coach/athletes/{athlete_id}/ai/weekly-insights/history", response_model=ai_schemas.ReportPage)
+async def get_weekly_insights_history(
+    athlete_id: UUID, coach: CoachDep, db: DbDep, before: UUID | None = None, limit: HistoryLimit = 20
+):
+    """Weekly insights newest first; pass the previous page's `next_before` to continue."""
+    return await ai_service.list_report_history(
+        db, ai_models.ReportKind.WEEKLY_INSIGHT, athlete_id, coach.id, before, limit
+    )
+
+
+@router.get("/coach/ai/talent-reports", response_model=list[ai_schemas.ReportRead])
+async def list_talent_reports(coach: CoachDep, db: DbDep, focus_area: ai_schemas.FocusArea | None = None):
+    """Latest talent report per athlete; `focus_area` keeps the athletes flagged for it."""
+    return await ai_service.list_latest_reports(db, ai_models.ReportKind.TALENT_REPORT, coach.id, focus_area)
+
+
+@router.get("/coach/ai/weekly-insights", response_model=list[ai_schemas.ReportRead])
+async def list_weekly_insights(coach: CoachDep, db: DbDep, focus_area: ai_schemas.FocusArea | None = None):
+    """Latest weekly insight per athlete; `focus_area` keeps the athletes flagged for it."""
+    return await ai_service.list_latest_reports(db, ai_models.ReportKind.WEEKLY_INSIGHT, coach.id, focus_area)
+
+
+async def _immutable_report(
+    request: Request, db: AsyncSession, kind: ai_models.ReportKind, report_id: UUID, coach_id: UUID
+):
+    etag = responses.entity_tag(report_id)
+    # Reports never change, so a client holding this id holds the current version: no query needed
+    if cached := responses.not_modified(request, etag):
+        return cached
+    report = await ai_service.get_report(db, kind, report_id, coach_id)
+    return responses.immutable(ai_schemas.ReportRead.model_validate(report), etag)
+
+
+@router.get("/coach/ai/talent-reports/{report_id}", response_model=ai_schemas.ReportRead)
+async def get_talent_report_by_id(report_id: UUID, request: Request, coach: CoachDep, db: DbDep):
+    """One talent report; cacheable for good, since stored reports never change."""
+    return await _immutable_report(request, db, ai_models.ReportKind.TALENT_REPORT, report_id, coach.id)
+
+
+@router.get("/coach/ai/weekly-insights/{report_id}", response_model=ai_schemas.ReportRead)
+async def get_weekly_insight_by_id(report_id: UUID, request: Request, coach: CoachDep, db: DbDep):
+    """One weekly insight; cacheable for good, since stored reports never change."""
+    return await _immutable_report(request, db, ai_models.ReportKind.WEEKLY_INSIGHT, report_id, coach.id)
+
+
+@router.post("/coach/groups/{group_id}/ai/insights", response_model=ai_schemas.GroupInsightRead)
+async def generate_group_insight(
+    group_id: UUID, coach: CoachDep, db: DbDep, athlete_notes: bool = False, force_refresh: bool = False
+):
+    """This week's insight for the whole group, from one provider call; `athlete_notes` adds a note per athlete."""
+    return await ai_groups.generate_group_insight(db, group_id, coach.id, athlete_notes, force_refresh)
+
+
+@router.get("/coach/groups/{group_id}/ai/insights", response_model=ai_schemas.GroupInsightRead)
+async def get_group_insight(group_id: UUID, coach: CoachDep, db: DbDep):
+    insight = await ai_groups.get_latest_group_insight(db, group_id, coach.id)
+    if not insight:
+        raise HTTPException(status_code=404, detail="No report found")
+    return insight
+
+
+@router.get("/coach/ai/usage", response_model=ai_schemas.UsageRead)
+async def get_usage(
+    coach: CoachDep, db: DbDep, since: date | None = None, group_by: ai_usage.UsageGroup = ai_usage.UsageGroup.DAY
+):
+    """The coach's provider tokens and latency since `since` (default: 30 days), and today's total."""
+    since = since or datetime.now(UTC).date() - timedelta(days=30)
+    return {
+        "since": since,
+        "daily_token_budget": settings.AI_COACH_DAILY_TOKEN_BUDGET or None,
+        "tokens_today": await ai_usage.tokens_today(db, coach.id),
+        "groups": await ai_usage.aggregate(db, since, group_by, coach.id),
+    }
+
+
+@router.get("/coach/ai/jobs/{job_id}", response_model=ai_schemas.ReportJobRead)
+async def get_report_job(job_id: UUID, coach: CoachDep, db: DbDep):
+    return await ai_jobs.get_report_job(db, job_id, coach.id)
+
+
 # --- Parent AI Views ---
 
 
@@ -76,3 +190,44 @@ async def get_weekly_insights_parent(parent: ParentDep, db: DbDep):
     if not report:
         raise HTTPException(status_code=404, detail="No report found")
     return report
+
+
+# --- System / Cron ---
+
+
+@router.post(
+    "/system/ai/weekly-insights/batch",
+    response_model=ai_schemas.ReportBatchRunRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    include_in_schema=False,
+)
+async def start_weekly_insights_batch(db: DbDep, _: SystemTokenDep, resume: UUID | None = None):
+    """
+    Called by the scheduler (e.g. Monday morning) to generate weekly insights for every
+    athlete who trained in the last 7 days. Pass `resume` with a stopped run's id to continue it.
+    """
+    run = await (ai_batch.resume_run(db, resume) if resume else ai_batch.start_run(db))
+    ai_batch.run_in_background(run.id)
+    return run
+
+
+@router.get("/system/ai/batch-runs/{run_id}", response_model=ai_schemas.ReportBatchRunRead, include_in_schema=False)
+async def get_batch_run(run_id: UUID, db: DbDep, _: SystemTokenDep):
+    return await ai_batch.get_run(db, run_id)
+
+
+@router.get("/system/ai/providers", include_in_schema=False)
+async def get_provider_stats(_: SystemTokenDep):
+    """Recent latency percentiles, error rate and circuit breaker state of each AI provider."""
+    return ai_service.provider_router.stats()
+
+
+@router.get("/system/ai/usage", response_model=list[ai_schemas.UsageAggregateRead], include_in_schema=False)
+async def get_usage_totals(
+    db: DbDep,
+    _: SystemTokenDep,
+    since: date | None = None,
+    group_by: ai_usage.UsageGroup = ai_usage.UsageGroup.COACH,
+):
+    """Provider tokens and latency across all coaches since `since` (default: 30 days), heaviest first."""
+    return await ai_usage.aggregate(db, since or datetime.now(UTC).date() - timedelta(days=30), group_by)
@@ -1,15 +1,142 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.modules.ai.models import ReportJobStatus, ReportKind
+
+
+class FocusArea(str, Enum):
+    SPEED = "speed"
+    ENDURANCE = "endurance"
+    STRENGTH = "strength"
+    POWER = "power"
+    TECHNIQUE = "technique"
+    CONSISTENCY = "consistency"
+    RECOVERY = "recovery"
+    MOBILITY = "mobility"
+
+
+class TalentReportSections(BaseModel):
+    """Structured talent report, as requested from the provider and stored in `sections`."""
+
+    strengths: list[str]
+    areas_to_improve: list[str]
+    specialization: str
+    recommendations: list[str]
+    # What the athlete should work on most; filterable across athletes
+    focus_areas: list[FocusArea] = Field(max_length=3)
+
+
+class WeeklyInsightSections(BaseModel):
+    """Structured weekly insight, as requested from the provider and stored in `sections`."""
+
+    consistency: str
+    intensity: str
+    quality: str
+    tip: str
+    focus_areas: list[FocusArea] = Field(max_length=3)
+
+
+class AthleteNote(BaseModel):
+    # Label of the athlete in the prompt, e.g. "A3"
+    athlete: str
+    note: str
+
+
+class GroupInsightSections(BaseModel):
+    summary: str
+    highlights: list[str]
+    concerns: list[str]
+    tip: str
+    focus_areas: list[FocusArea] = Field(max_length=3)
+    athletes: list[AthleteNote]
 
 
 class ReportRead(BaseModel):
     id: UUID
     athlete_id: UUID
     report_text: str
+    # TalentReportSections or WeeklyInsightSections; None for reports stored as plain text
+    sections: dict[str, Any] | None = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GroupInsightRead(BaseModel):
+    id: UUID
+    group_id: UUID
+    report_text: str
+    # GroupInsightSections, with `athletes` as {"athlete_id", "name", "note"}; None for plain text
+    sections: dict[str, Any] | None = None
+    window_start: date
+    window_end: date
+    athlete_count: int
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ReportPage(BaseModel):
+    items: list[ReportRead]
+    # Pass as `before` to get the next page; None on the last page
+    next_before: UUID | None
+
+
+class ReportJobRead(BaseModel):
+    id: UUID
+    kind: ReportKind
+    athlete_id: UUID
+    status: ReportJobStatus
+    attempts: int
+    force_refresh: bool
+    cache_hit: bool
+    report_id: UUID | None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReportBatchRunRead(BaseModel):
+    id: UUID
+    kind: ReportKind
+    window_start: date
+    status: ReportJobStatus
+    cursor: UUID | None
+    processed: int
+    generated: int
+    skipped: int
+    failed: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UsageAggregateRead(BaseModel):
+    # Coach id, provider, model, report kind or day, depending on the grouping
+    key: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    p50_latency_ms: float
+    p95_latency_ms: float
+
+
+class UsageRead(BaseModel):
+    since: date
+    # None when no daily budget is configured
+    daily_token_budget: int | None
+    tokens_today: int
+    groups: list[UsageAggregateRead]
@@ -0,0 +1,132 @@
+"""
+Structured report sections.
+
+Job and batch reports ask the provider for a JSON object matching the kind's sections schema
+(JSON mode where the provider supports it, the instructions in the prompt otherwise). A reply
+that validates is stored in the report's `sections` (JSONB, GIN indexed) and rendered to
+`report_text`. Anything else is stored as text with `sections` left NULL.
+
+Streamed reports ask for prose, since JSON arriving token by token is unreadable; they are
+stored as text only.
+"""
+
+import re
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from app.modules.ai import models as ai_models
+from app.modules.ai import schemas as ai_schemas
+
+SCHEMAS: dict[ai_models.ReportKind, type[BaseModel]] = {
+    ai_models.ReportKind.TALENT_REPORT: ai_schemas.TalentReportSections,
+    ai_models.ReportKind.WEEKLY_INSIGHT: ai_schemas.WeeklyInsightSections,
+    ai_models.ReportKind.GROUP_INSIGHT: ai_schemas.GroupInsightSections,
+}
+
+FOCUS_AREAS = ", ".join(area.value for area in ai_schemas.FocusArea)
+
+JSON_INSTRUCTIONS = {
+    ai_models.ReportKind.TALENT_REPORT: f"""
+    Respond with a JSON object for a 'Talent Recognition' report, with these fields:
+    - "strengths": demonstrated strengths, one short sentence each.
+    - "areas_to_improve": areas for improvement, one short sentence each.
+    - "specialization": potential athletic specialization or traits, one or two sentences.
+    - "recommendations": recommendations for development, one short sentence each.
+    - "focus_areas": up to 3 of [{FOCUS_AREAS}] the athlete should work on most.
+    """,
+    ai_models.ReportKind.WEEKLY_INSIGHT: f"""
+    Respond with a JSON object for 'Weekly Insights', with these fields:
+    - "consistency": consistency and volume.
+    - "intensity": intensity and progress.
+    - "quality": quality of sessions.
+    - "tip": a quick tip for next week.
+    - "focus_areas": up to 3 of [{FOCUS_AREAS}] to focus on next week.
+    """,
+    ai_models.ReportKind.GROUP_INSIGHT: f"""
+    Respond with a JSON object for 'Group Weekly Insights', with these fields:
+    - "summary": how the group trained this week, two or three sentences.
+    - "highlights": what went well, one short sentence each, naming athletes where relevant.
+    - "concerns": athletes or patterns that need attention, one short sentence each.
+    - "tip": one tip for the whole group for next week.
+    - "focus_areas": up to 3 of [{FOCUS_AREAS}] for the group next week.
+    - "athletes": if per-athlete notes are requested, one {{"athlete": "<label>", "note": "<one sentence>"}}
+      for each listed athlete, using the labels above; otherwise an empty list.
+    """,
+}
+
+TEXT_INSTRUCTIONS = {
+    ai_models.ReportKind.TALENT_REPORT: """
+    Please provide a 'Talent Recognition' report identifying:
+    1. Demonstrated strengths.
+    2. Areas for improvement.
+    3. Potential athletic specialization or traits.
+    4. Recommendations for development.
+    """,
+    ai_models.ReportKind.WEEKLY_INSIGHT: """
+    Provide 'Weekly Insights' covering:
+    1. Consistency and Volume.
+    2. Intensity and Progress.
+    3. Quality of sessions.
+    4. Quick tip for next week.
+    """,
+}
+
+# Text-only providers often wrap JSON in a markdown code fence
+_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+def json_prompt(kind: ai_models.ReportKind, prompt: str) -> str:
+    return prompt + JSON_INSTRUCTIONS[kind]
+
+
+def text_prompt(kind: ai_models.ReportKind, prompt: str) -> str:
+    return prompt + TEXT_INSTRUCTIONS[kind]
+
+
+def parse(kind: ai_models.ReportKind, text: str) -> dict[str, Any] | None:
+    """The validated sections of a reply, or None if it is not a matching JSON object."""
+    text = text.strip()
+    if match := _FENCE.match(text):
+        text = match.group(1)
+    try:
+        sections = SCHEMAS[kind].model_validate_json(text)
+    except ValidationError:
+        return None
+    return sections.model_dump(mode="json")
+
+
+def _bullets(items: list[str]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+def render(kind: ai_models.ReportKind, sections: dict[str, Any]) -> str:
+    """Plain-text report for `report_text`, the digest narrative and older clients."""
+    focus = ", ".join(sections["focus_areas"]) or "none"
+    if kind == ai_models.ReportKind.TALENT_REPORT:
+        return (
+            f"Strengths:\n{_bullets(sections['strengths'])}\n\n"
+            f"Areas to improve:\n{_bullets(sections['areas_to_improve'])}\n\n"
+            f"Specialization: {sections['specialization']}\n\n"
+            f"Recommendations:\n{_bullets(sections['recommendations'])}\n\n"
+            f"Focus areas: {focus}"
+        )
+    if kind == ai_models.ReportKind.GROUP_INSIGHT:
+        # Athlete labels are resolved to names by ai.groups before rendering
+        text = (
+            f"{sections['summary']}\n\n"
+            f"Highlights:\n{_bullets(sections['highlights'])}\n\n"
+            f"Concerns:\n{_bullets(sections['concerns'])}\n\n"
+            f"Tip: {sections['tip']}\n\n"
+            f"Focus areas: {focus}"
+        )
+        if sections["athletes"]:
+            text += "\n\nAthletes:\n" + _bullets([f"{a['name']}: {a['note']}" for a in sections["athletes"]])
+        return text
+    return (
+        f"Consistency: {sections['consistency']}\n\n"
+        f"Intensity: {sections['intensity']}\n\n"
+        f"Quality: {sections['quality']}\n\n"
+        f"Tip: {sections['tip']}\n\n"
+        f"Focus areas: {focus}"
+    )
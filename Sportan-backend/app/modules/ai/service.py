@@ -1,54 +1,145 @@
+import asyncio
+import hashlib
 import uuid
-from datetime import datetime, timedelta
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
 
-from openai import AsyncOpenAI, OpenAIError
-from sqlalchemy import desc, select
+import orjson
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import and_, desc, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics, projection
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.modules.ai import inflight, prompts, providers, sections, summaries, usage
 from app.modules.ai import models as ai_models
+from app.modules.ai import schemas as ai_schemas
+from app.modules.ai.providers import AIReportGenerationError
+from app.modules.analytics import features as analytics_features
+from app.modules.analytics import service as analytics_service
+from app.modules.coaching import scoping
 from app.modules.coaching import service as coaching_service
+from app.modules.identity import models as identity_models
 from app.modules.training import models as training_models
 from app.modules.training import service as training_service
 
-ai_client = AsyncOpenAI(api_key=settings.AI_API_KEY, base_url=settings.AI_BASE_URL)
+# Every provider call in this process goes through it, whichever path triggered it
+provider_router = providers.router_from_settings()
 
 
-class AIReportGenerationError(Exception):
-    """Raised when the AI provider fails to return a usable report."""
+# Bump when a prompt template changes, so cached reports from the old wording are not reused
+TALENT_PROMPT_VERSION = 5
+WEEKLY_PROMPT_VERSION = 3
 
+NO_WEEKLY_DATA_TEXT = "No training data recorded for the last 7 days."
 
-async def _create_ai_report(prompt: str) -> str:
-    try:
-        completion = await ai_client.chat.completions.create(
-            model=settings.AI_DEFAULT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-        )
-    except OpenAIError as exc:
-        raise AIReportGenerationError(f"AI provider error: {exc}") from exc
-
-    message = completion.choices[0].message
-    content = getattr(message, "content", None)
-    if isinstance(content, list):
-        content = "".join(
-            part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+REPORT_MODELS = {
+    ai_models.ReportKind.TALENT_REPORT: ai_models.TalentReport,
+    ai_models.ReportKind.WEEKLY_INSIGHT: ai_models.WeeklyInsight,
+}
+
+
+@dataclass(frozen=True)
+class ReportInputs:
+    input_hash: str
+    # None when there is nothing to analyse and no provider call is needed
+    prompt: str | None
+    # Rolled-forward digest to store with a talent report
+    summary: summaries.RolledSummary | None = None
+
+
+def dump_inputs(inputs: ReportInputs) -> dict[str, Any]:
+    """Prompt and digest as JSON, stored on a queued job so its worker does not build them again."""
+    summary = summaries.to_json(inputs.summary) if inputs.summary else None
+    return {"prompt": inputs.prompt, "summary": summary}
+
+
+def load_inputs(input_hash: str, data: dict[str, Any]) -> ReportInputs:
+    summary = summaries.from_json(data["summary"]) if data["summary"] else None
+    return ReportInputs(input_hash=input_hash, prompt=data["prompt"], summary=summary)
+
+
+async def _create_ai_report(prompt: str, response_schema: type[BaseModel] | None = None) -> providers.Completion:
+    return await provider_router.complete(prompt, response_schema)
+
+
+async def _stream_ai_report(prompt: str, call_usage: providers.Usage) -> AsyncIterator[str]:
+    """Text deltas from the provider's streaming mode, as they arrive; `call_usage` is filled in at the end."""
+    async for text in provider_router.stream(prompt, call_usage):
+        yield text
+
+
+def _point_latest(kind: ai_models.ReportKind, report: ai_models.TalentReport | ai_models.WeeklyInsight):
+    """Upsert the athlete's latest-report pointer, unless it already points at a newer report."""
+    latest = ai_models.LatestReport
+    stmt = pg_insert(latest).values(
+        athlete_id=report.athlete_id, kind=kind, report_id=report.id, created_at=report.created_at
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[latest.athlete_id, latest.kind],
+        set_={"report_id": stmt.excluded.report_id, "created_at": stmt.excluded.created_at},
+        where=latest.created_at <= stmt.excluded.created_at,
+    )
+
+
+async def _save_report(
+    kind: ai_models.ReportKind,
+    athlete_id: uuid.UUID,
+    report_text: str,
+    input_hash: str,
+    summary: summaries.RolledSummary | None = None,
+    structured: dict[str, Any] | None = None,
+):
+    model = REPORT_MODELS[kind]
+    # Short session of its own: the request session was released before the provider call
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            insert(model)
+            .values(athlete_id=athlete_id, report_text=report_text, sections=structured, input_hash=input_hash)
+            .returning(model)
         )
-    if not content:
-        raise AIReportGenerationError("AI provider returned an empty response")
-    return content
+        report = result.scalars().one()
+        await db.execute(_point_latest(kind, report))
+        if summary is not None:
+            await db.execute(summaries.save_statement(athlete_id, summary, report_text))
+        await db.commit()
+        return report
 
 
-async def generate_talent_report(
-    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID
-) -> ai_models.TalentReport:
-    # 1. Verify ownership and get data
-    athlete = await coaching_service.get_athlete(db, athlete_id, coach_id)
-    workouts = await training_service.get_athlete_workouts(db, athlete_id)
+def _input_hash(kind: ai_models.ReportKind, prompt_version: int, **inputs: Any) -> str:
+    """Content address of a report: same model, template and data means the same report."""
+    payload = {"kind": kind, "model": provider_router.primary_model, "prompt_version": prompt_version, **inputs}
+    return hashlib.sha256(orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
-    # 2. Prepare Prompt
-    workouts_text = "\n".join([f"- {w.date}: {w.title} ({w.metrics}, {w.notes})" for w in workouts])
 
-    prompt = f"""
+def _prompt_workouts(workouts: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    # Stable order, and only the fields the prompt shows, so the hash tracks what the model sees
+    ordered = sorted(workouts, key=lambda w: (w["date"], w["created_at"]))
+    return [{field: w[field] for field in ("date", "title", "metrics", "notes")} for w in ordered]
+
+
+def _talent_prompt(
+    athlete: identity_models.Athlete,
+    summary: summaries.RolledSummary,
+    indicators: dict[str, Any],
+    workouts_text: str,
+) -> str:
+    previous = ""
+    history_heading = "Workout History"
+    if summary.narrative:
+        previous = f"""
+    Previous Assessment ({summary.narrative_at:%Y-%m-%d}):
+    {summaries.narrative_text(summary.narrative)}
+    """
+        if summary.since:
+            history_heading = "Workouts Logged Since the Previous Assessment"
+
+    return f"""
     Analyze the athletic potential of this athlete based on the following data:
     
     Profile:
@@ -56,93 +147,398 @@ async def generate_talent_report(
     - DOB: {athlete.dob}
     - Notes: {athlete.notes}
     
-    Workout History:
+    Training Digest (all logged workouts):
+    {summaries.digest_text(summary.stats)}
+
+    Training Indicators:
+    {analytics_features.indicators_text(indicators)}
+    {previous}
+    {history_heading}:
     {workouts_text}
-    
-    Please provide a 'Talent Recognition' report identifying:
-    1. Demonstrated strengths.
-    2. Areas for improvement.
-    3. Potential athletic specialization or traits.
-    4. Recommendations for development.
     """
 
-    report_content = await _create_ai_report(prompt)
 
-    # 4. Save Report
-    report = ai_models.TalentReport(athlete_id=athlete_id, report_text=report_content)
-    db.add(report)
-    await db.commit()
-    await db.refresh(report)
+async def talent_report_inputs(
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID, force_refresh: bool = False
+) -> ReportInputs:
+    # 1. Verify ownership and get data: the stored digest plus what was logged since
+    athlete = await coaching_service.get_athlete(db, athlete_id, coach_id)
+    summary = await summaries.roll_forward(db, athlete_id, rebuild=force_refresh)
+    indicators = await analytics_service.athlete_features(db, athlete_id)
 
-    return report
+    # 2. Prepare Prompt: the history gets whatever the template leaves of the budget
+    template = sections.json_prompt(
+        ai_models.ReportKind.TALENT_REPORT, _talent_prompt(athlete, summary, indicators, "")
+    )
+    history_budget = settings.AI_PROMPT_TOKEN_BUDGET - prompts.estimate_tokens(template)
+    history = await prompts.workout_history(db, athlete_id, history_budget, since=summary.since)
+    prompt = _talent_prompt(athlete, summary, indicators, history.text)
+
+    # Keyed on the data, not on how much of it the previous report already covered
+    input_hash = _input_hash(
+        ai_models.ReportKind.TALENT_REPORT,
+        TALENT_PROMPT_VERSION,
+        profile={"full_name": athlete.full_name, "dob": athlete.dob, "notes": athlete.notes},
+        stats=summary.stats,
+        through=summary.through,
+        revision=summary.revision,
+        indicators=indicators,
+    )
+    return ReportInputs(input_hash=input_hash, prompt=prompt, summary=summary)
 
 
-async def get_latest_talent_report(db: AsyncSession, athlete_id: uuid.UUID) -> ai_models.TalentReport | None:
+async def weekly_insight_inputs(
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID, window_start: date | None = None
+) -> ReportInputs:
+    """Inputs for the week from `window_start`; by default the last 7 days."""
+    # 1. Verify ownership and get data
+    athlete = await coaching_service.get_athlete(db, athlete_id, coach_id)
+    # Baseline from the digest as of the last talent report
+    summary = await summaries.get_summary(db, athlete_id)
+    baseline = summary.stats if summary else None
+
+    # Get workouts from last 7 days, or from the week a batch run was started for
+    week_ago = window_start or datetime.now(UTC).date() - timedelta(days=7)
+    today = week_ago + timedelta(days=7)
+
+    workout = training_models.Workout
+    query = select(*training_service.WORKOUT_READ_COLUMNS).where(
+        workout.athlete_id == athlete_id, workout.date >= week_ago, workout.date <= today
+    )
+    workouts = _prompt_workouts(await projection.fetch_dicts(db, query))
+
+    input_hash = _input_hash(
+        ai_models.ReportKind.WEEKLY_INSIGHT,
+        WEEKLY_PROMPT_VERSION,
+        profile={"full_name": athlete.full_name},
+        window=[week_ago, today],
+        workouts=workouts,
+        baseline=baseline,
+    )
+    if not workouts:
+        # Can't generate insight without data
+        return ReportInputs(input_hash=input_hash, prompt=None)
+
+    workouts_text = "\n".join(prompts.workout_line(w) for w in workouts)
+    baseline_text = ""
+    if baseline:
+        baseline_text = f"""
+    Baseline (all workouts through {baseline["last_date"]}):
+    {summaries.digest_text(baseline)}
+    """
+
+    prompt = f"""
+    Analyze the training week ({week_ago} to {today}) for:
+    Athlete: {athlete.full_name}
+    
+    Workouts:
+    {workouts_text}
+    {baseline_text}"""
+
+    return ReportInputs(input_hash=input_hash, prompt=prompt)
+
+
+async def report_inputs(
+    db: AsyncSession,
+    kind: ai_models.ReportKind,
+    athlete_id: uuid.UUID,
+    coach_id: uuid.UUID,
+    force_refresh: bool = False,
+) -> ReportInputs:
+    """Prompt inputs of a report; `force_refresh` rebuilds a talent report's digest from the full history."""
+    if kind == ai_models.ReportKind.TALENT_REPORT:
+        return await talent_report_inputs(db, athlete_id, coach_id, force_refresh=force_refresh)
+    return await weekly_insight_inputs(db, athlete_id, coach_id)
+
+
+async def find_cached_report(
+    db: AsyncSession,
+    model: type[ai_models.TalentReport] | type[ai_models.WeeklyInsight],
+    athlete_id: uuid.UUID,
+    input_hash: str,
+):
     result = await db.execute(
-        select(ai_models.TalentReport)
-        .where(ai_models.TalentReport.athlete_id == athlete_id)
-        .order_by(desc(ai_models.TalentReport.created_at))
+        select(model)
+        .where(model.athlete_id == athlete_id, model.input_hash == input_hash)
+        .order_by(desc(model.created_at))
         .limit(1)
     )
     return result.scalars().first()
 
 
+async def _find_reusable_report(
+    db: AsyncSession,
+    model: type[ai_models.TalentReport] | type[ai_models.WeeklyInsight],
+    athlete_id: uuid.UUID,
+    inputs: ReportInputs,
+    force_refresh: bool,
+):
+    if force_refresh:
+        metrics.increment("ai_report_cache.bypass")
+        return None
+    cached = await find_cached_report(db, model, athlete_id, inputs.input_hash)
+    metrics.increment("ai_report_cache.hit" if cached else "ai_report_cache.miss")
+    return cached
+
+
+async def _generate_report(
+    db: AsyncSession,
+    kind: ai_models.ReportKind,
+    athlete_id: uuid.UUID,
+    coach_id: uuid.UUID,
+    inputs: ReportInputs,
+    force_refresh: bool,
+):
+    model = REPORT_MODELS[kind]
+    cached = await _find_reusable_report(db, model, athlete_id, inputs, force_refresh)
+
+    # 3. Hand the pooled connection back before the (slow) provider call
+    await db.close()
+    if cached:
+        return cached
+    return await generate_from_inputs(kind, athlete_id, coach_id, inputs)
+
+
+async def generate_from_inputs(
+    kind: ai_models.ReportKind, athlete_id: uuid.UUID, coach_id: uuid.UUID, inputs: ReportInputs
+):
+    """Provider call and save, without a cache lookup; needs no open session."""
+    structured = None
+    if inputs.prompt:
+        completion = await _create_ai_report(sections.json_prompt(kind, inputs.prompt), sections.SCHEMAS[kind])
+        usage.usage_writer.record(coach_id, athlete_id, kind, completion.usage)
+        # A reply that is not valid sections JSON is kept as the report text
+        structured = sections.parse(kind, completion.text)
+        report_content = sections.render(kind, structured) if structured else completion.text
+    else:
+        report_content = NO_WEEKLY_DATA_TEXT
+
+    # 4. Save Report
+    return await _save_report(kind, athlete_id, report_content, inputs.input_hash, inputs.summary, structured)
+
+
+async def generate_talent_report(
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID, force_refresh: bool = False
+) -> ai_models.TalentReport:
+    inputs = await talent_report_inputs(db, athlete_id, coach_id, force_refresh=force_refresh)
+    return await _generate_report(db, ai_models.ReportKind.TALENT_REPORT, athlete_id, coach_id, inputs, force_refresh)
+
+
+async def _get_latest_report(
+    db: AsyncSession, kind: ai_models.ReportKind, athlete_id: uuid.UUID, coach_id: uuid.UUID | None
+):
+    model = REPORT_MODELS[kind]
+    latest = ai_models.LatestReport
+    if coach_id is not None:
+        # Ownership check, pointer and report in one statement
+        query = (
+            scoping.owned_athlete(athlete_id, coach_id)
+            .add_columns(model)
+            .outerjoin(latest, and_(latest.athlete_id == identity_models.Athlete.id, latest.kind == kind))
+            .outerjoin(model, model.id == latest.report_id)
+        )
+        rows = await scoping.fetch_scoped(db, query, "Athlete not found")
+        return rows[0][1]
+
+    result = await db.execute(
+        select(model)
+        .join(latest, latest.report_id == model.id)
+        .where(latest.athlete_id == athlete_id, latest.kind == kind)
+    )
+    return result.scalars().first()
+
+
+async def list_latest_reports(
+    db: AsyncSession,
+    kind: ai_models.ReportKind,
+    coach_id: uuid.UUID,
+    focus_area: ai_schemas.FocusArea | None = None,
+):
+    """The latest report of each of the coach's athletes, newest first; optionally only those flagging `focus_area`."""
+    model = REPORT_MODELS[kind]
+    latest = ai_models.LatestReport
+    query = scoping.join_owning_athlete(
+        select(model).join(latest, and_(latest.report_id == model.id, latest.kind == kind)),
+        model.athlete_id,
+        coach_id,
+    ).order_by(desc(model.created_at))
+    if focus_area is not None:
+        # jsonb @>, answered from the GIN index on sections
+        query = query.where(model.sections.contains({"focus_areas": [focus_area.value]}))
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def get_latest_talent_report(
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID | None = None
+) -> ai_models.TalentReport | None:
+    return await _get_latest_report(db, ai_models.ReportKind.TALENT_REPORT, athlete_id, coach_id)
+
+
 async def generate_weekly_insights(
-    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID, force_refresh: bool = False
 ) -> ai_models.WeeklyInsight:
-    # 1. Verify ownership and get data
-    athlete = await coaching_service.get_athlete(db, athlete_id, coach_id)
+    inputs = await weekly_insight_inputs(db, athlete_id, coach_id)
+    return await _generate_report(db, ai_models.ReportKind.WEEKLY_INSIGHT, athlete_id, coach_id, inputs, force_refresh)
+
 
-    # Get workouts from last 7 days
-    today = datetime.utcnow().date()
-    week_ago = today - timedelta(days=7)
+async def get_latest_weekly_insight(
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID | None = None
+) -> ai_models.WeeklyInsight | None:
+    return await _get_latest_report(db, ai_models.ReportKind.WEEKLY_INSIGHT, athlete_id, coach_id)
 
-    # We need a filtered query. training_service.get_athlete_workouts returns all.
-    # I'll construct a query here.
+
+async def list_report_history(
+    db: AsyncSession,
+    kind: ai_models.ReportKind,
+    athlete_id: uuid.UUID,
+    coach_id: uuid.UUID,
+    before: uuid.UUID | None = None,
+    limit: int = 20,
+) -> ai_schemas.ReportPage:
+    """A page of the athlete's reports, newest first, continuing after the report `before`."""
+    model = REPORT_MODELS[kind]
+    on = model.athlete_id == identity_models.Athlete.id
+    if before is not None:
+        # Keyset on (created_at, id): stable while new reports arrive, no OFFSET scan
+        cursor = select(model.created_at, model.id).where(model.id == before).scalar_subquery()
+        on = and_(on, tuple_(model.created_at, model.id) < cursor)
     query = (
-        select(training_models.Workout)
-        .where(training_models.Workout.athlete_id == athlete_id, training_models.Workout.date >= week_ago)
-        .order_by(training_models.Workout.date)
+        scoping.owned_athlete(athlete_id, coach_id)
+        .add_columns(model)
+        .outerjoin(model, on)
+        .order_by(desc(model.created_at), desc(model.id))
+        .limit(limit + 1)
+    )
+    reports = scoping.joined(await scoping.fetch_scoped(db, query, "Athlete not found"))
+    next_before = reports[limit - 1].id if len(reports) > limit else None
+    return ai_schemas.ReportPage(
+        items=[ai_schemas.ReportRead.model_validate(report) for report in reports[:limit]], next_before=next_before
     )
-    result = await db.execute(query)
-    workouts = result.scalars().all()
 
-    if not workouts:
-        # Can't generate insight without data
-        # Or generate a "No training recorded" report
-        report_content = "No training data recorded for the last 7 days."
-    else:
-        workouts_text = "\n".join([f"- {w.date}: {w.title} ({w.metrics}, {w.notes})" for w in workouts])
-
-        prompt = f"""
-        Analyze the training week ({week_ago} to {today}) for:
-        Athlete: {athlete.full_name}
-        
-        Workouts:
-        {workouts_text}
-        
-        Provide 'Weekly Insights' covering:
-        1. Consistency and Volume.
-        2. Intensity and Progress.
-        3. Quality of sessions.
-        4. Quick tip for next week.
-        """
-
-        report_content = await _create_ai_report(prompt)
-
-    # Save
-    report = ai_models.WeeklyInsight(athlete_id=athlete_id, report_text=report_content)
-    db.add(report)
-    await db.commit()
-    await db.refresh(report)
+
+async def get_report(db: AsyncSession, kind: ai_models.ReportKind, report_id: uuid.UUID, coach_id: uuid.UUID):
+    model = REPORT_MODELS[kind]
+    query = scoping.join_owning_athlete(select(model).where(model.id == report_id), model.athlete_id, coach_id)
+    report = (await db.execute(query)).scalars().first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
     return report
 
 
-async def get_latest_weekly_insight(db: AsyncSession, athlete_id: uuid.UUID) -> ai_models.WeeklyInsight | None:
-    result = await db.execute(
-        select(ai_models.WeeklyInsight)
-        .where(ai_models.WeeklyInsight.athlete_id == athlete_id)
-        .order_by(desc(ai_models.WeeklyInsight.created_at))
-        .limit(1)
+@dataclass(frozen=True)
+class PreparedReport:
+    """Everything a streamed report needs once the request session is closed."""
+
+    kind: ai_models.ReportKind
+    athlete_id: uuid.UUID
+    coach_id: uuid.UUID
+    inputs: ReportInputs
+    cached: ai_models.TalentReport | ai_models.WeeklyInsight | None
+    force_refresh: bool = False
+
+
+async def prepare_report_stream(
+    db: AsyncSession,
+    kind: ai_models.ReportKind,
+    athlete_id: uuid.UUID,
+    coach_id: uuid.UUID,
+    force_refresh: bool = False,
+) -> PreparedReport:
+    """Ownership check, prompt inputs, cache lookup and budget check, before the response starts."""
+    inputs = await report_inputs(db, kind, athlete_id, coach_id, force_refresh)
+    cached = await _find_reusable_report(db, REPORT_MODELS[kind], athlete_id, inputs, force_refresh)
+    if not cached and inputs.prompt:
+        await usage.check_budget(db, coach_id)
+
+    # The stream outlives the request handler; don't hold a pooled connection for it
+    await db.close()
+    return PreparedReport(
+        kind=kind, athlete_id=athlete_id, coach_id=coach_id, inputs=inputs, cached=cached, force_refresh=force_refresh
     )
-    return result.scalars().first()
+
+
+async def _load_report(kind: ai_models.ReportKind, report_id: uuid.UUID):
+    async with AsyncSessionLocal() as db:
+        return await db.get(REPORT_MODELS[kind], report_id)
+
+
+async def _follow_job(
+    kind: ai_models.ReportKind, job: ai_models.ReportJob
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """The report of a job someone else is generating, as a single `delta` once it is saved."""
+    job = await inflight.wait_for(job.id)
+    report = None
+    if job is not None and job.status == ai_models.ReportJobStatus.SUCCEEDED:
+        report = await _load_report(kind, job.report_id)
+    if report is None:
+        raise AIReportGenerationError(job.error if job is not None and job.error else "Report generation failed")
+    yield "delta", {"text": report.report_text}
+    yield "done", {"report": ai_schemas.ReportRead.model_validate(report), "cache_hit": False}
+
+
+async def stream_report(prepared: PreparedReport) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """`delta` events with report text as the provider writes it, then `done` with the saved report.
+
+    The stream takes the in-flight job slot for its inputs (ai.inflight) before calling the
+    provider. If a queued job, a batch run or another stream holds it, this one waits for that
+    report and sends it as a single `delta`.
+
+    A provider failure ends the stream with an `error` event and nothing is saved. A client
+    disconnect cancels the provider stream and hands the job to the workers, so anyone waiting
+    on it still gets a report.
+    """
+    if prepared.cached:
+        yield "delta", {"text": prepared.cached.report_text}
+        yield "done", {"report": ai_schemas.ReportRead.model_validate(prepared.cached), "cache_hit": True}
+        return
+
+    inputs = prepared.inputs
+    if not inputs.prompt:
+        # Placeholder, no provider call to share
+        yield "delta", {"text": NO_WEEKLY_DATA_TEXT}
+        report = await _save_report(prepared.kind, prepared.athlete_id, NO_WEEKLY_DATA_TEXT, inputs.input_hash)
+        yield "done", {"report": ai_schemas.ReportRead.model_validate(report), "cache_hit": False}
+        return
+
+    try:
+        job, owned = await inflight.claim(
+            prepared.kind,
+            prepared.athlete_id,
+            prepared.coach_id,
+            inputs.input_hash,
+            dump_inputs(inputs),
+            prepared.force_refresh,
+        )
+        if not owned:
+            metrics.increment("ai_report_jobs.coalesced")
+            async for event in _follow_job(prepared.kind, job):
+                yield event
+            return
+    except AIReportGenerationError as exc:
+        yield "error", {"detail": str(exc)}
+        return
+
+    parts = []
+    try:
+        call_usage = providers.Usage()
+        async for text in _stream_ai_report(sections.text_prompt(prepared.kind, inputs.prompt), call_usage):
+            parts.append(text)
+            yield "delta", {"text": text}
+        usage.usage_writer.record(prepared.coach_id, prepared.athlete_id, prepared.kind, call_usage, streamed=True)
+        if not parts:
+            raise AIReportGenerationError("AI provider returned an empty response")
+        report = await _save_report(
+            prepared.kind, prepared.athlete_id, "".join(parts), inputs.input_hash, inputs.summary
+        )
+    except AIReportGenerationError as exc:
+        await inflight.finish(job.id, ai_models.ReportJobStatus.FAILED, error=str(exc))
+        yield "error", {"detail": str(exc)}
+        return
+    except BaseException:
+        # Client gone: shielded, as the response's cancel scope would cancel the update too
+        await asyncio.shield(inflight.requeue(job.id))
+        raise
+
+    await inflight.finish(job.id, ai_models.ReportJobStatus.SUCCEEDED, report_id=report.id)
+    yield "done", {"report": ai_schemas.ReportRead.model_validate(report), "cache_hit": False}
@@ -0,0 +1,234 @@
+"""
+Rolling per-athlete training digest shared by the AI reports.
+
+The digest is a set of mergeable stats: session count, date range, title counts, and
+count/sum/min/max for each numeric metric. It is stored with the text of the last talent
+report. Each talent report rolls the digest forward using SQL aggregates over only the
+workouts logged since `through`. Its prompt lists just those new sessions, next to the
+digest and the previous assessment, so prompt size and provider time stay flat as the
+history grows. Weekly insights read the stored digest as the athlete's baseline.
+
+Sums cannot take back an edited or deleted workout. Those reset `through`, so the next
+talent report rebuilds the stats from the full history, and bump `revision`.
+
+`through` is the newest created_at folded in, and created_at is set when a workout's
+transaction starts, so a workout can commit below it after a roll-forward has read past it.
+Every roll-forward therefore compares the digest's session count with the athlete's workout
+count, read in the same statement as the delta, and rebuilds from the full history when
+they differ.
+"""
+
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import String, and_, cast, func, select, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import UTC_NOW_SERVER_DEFAULT
+from app.modules.ai import models as ai_models
+from app.modules.ai import prompts
+from app.modules.training import models as training_models
+
+# Digest lines are capped so a long tail of titles or metric keys cannot crowd out the history
+MAX_TITLES = 8
+MAX_METRICS = 20
+# The previous report is quoted in the next talent prompt; keep roughly 1000 tokens of it
+MAX_NARRATIVE_CHARS = 4000
+
+
+@dataclass(frozen=True)
+class RolledSummary:
+    """The stored digest rolled forward over the workouts logged since it was saved."""
+
+    # None when the athlete has no workouts
+    stats: dict[str, Any] | None
+    through: datetime | None
+    revision: int
+    narrative: str | None
+    narrative_at: datetime | None
+    # The narrative predates workouts logged after this; None means the whole history is new
+    since: datetime | None
+
+
+# RolledSummary fields stored as ISO strings in to_json
+_DATETIME_FIELDS = ("through", "narrative_at", "since")
+
+
+def to_json(rolled: RolledSummary) -> dict[str, Any]:
+    """JSON-safe form of a rolled digest, e.g. to store it on a queued report job."""
+    data = asdict(rolled)
+    for name in _DATETIME_FIELDS:
+        data[name] = data[name].isoformat() if data[name] else None
+    return data
+
+
+def from_json(data: dict[str, Any]) -> RolledSummary:
+    values = {name: datetime.fromisoformat(data[name]) if data[name] else None for name in _DATETIME_FIELDS}
+    return RolledSummary(**{**data, **values})
+
+
+async def get_summary(db: AsyncSession, athlete_id: uuid.UUID) -> ai_models.AthleteSummary | None:
+    return await db.get(ai_models.AthleteSummary, athlete_id)
+
+
+async def _aggregate(
+    db: AsyncSession, athlete_id: uuid.UUID, since: datetime | None
+) -> tuple[dict[str, Any] | None, datetime | None, int]:
+    """Stats over the athlete's workouts logged after `since`, the newest created_at among them,
+    and how many workouts the athlete has in all."""
+    workout = training_models.Workout
+    logged = and_(*prompts.workout_scope(athlete_id, since))
+
+    # Delta and total from one snapshot, so they can be compared
+    result = await db.execute(
+        select(
+            func.count().filter(logged),
+            func.min(workout.date).filter(logged),
+            func.max(workout.date).filter(logged),
+            func.max(workout.created_at).filter(logged),
+            func.count(),
+        ).where(workout.athlete_id == athlete_id)
+    )
+    sessions, first_date, last_date, through, total = result.one()
+    if not sessions:
+        return None, None, total
+    # Workouts committed after the first read stay out of this delta, like they stay out of `sessions`
+    scope = [logged, workout.created_at <= through]
+
+    result = await db.execute(select(workout.title, func.count()).where(*scope).group_by(workout.title))
+    titles = {title: count for title, count in result.all()}
+
+    entry, value = prompts.numeric_metrics()
+    result = await db.execute(
+        select(cast(entry.c.key, String), func.count(), func.sum(value), func.min(value), func.max(value))
+        .select_from(workout)
+        .join(entry, true())
+        .where(*scope, entry.c.value.regexp_match(prompts.NUMERIC_PATTERN))
+        .group_by(entry.c.key)
+    )
+    metrics = {
+        key: {"count": count, "sum": float(total), "min": float(low), "max": float(high)}
+        for key, count, total, low, high in result.all()
+    }
+
+    stats = {
+        "sessions": sessions,
+        "first_date": first_date.isoformat(),
+        "last_date": last_date.isoformat(),
+        "titles": titles,
+        "metrics": metrics,
+    }
+    return stats, through, total
+
+
+def merge_stats(old: dict[str, Any] | None, new: dict[str, Any] | None) -> dict[str, Any] | None:
+    if not old or not new:
+        return old or new
+
+    titles = dict(old["titles"])
+    for title, count in new["titles"].items():
+        titles[title] = titles.get(title, 0) + count
+
+    metrics = {key: dict(stat) for key, stat in old["metrics"].items()}
+    for key, stat in new["metrics"].items():
+        if key not in metrics:
+            metrics[key] = dict(stat)
+            continue
+        merged = metrics[key]
+        merged["count"] += stat["count"]
+        merged["sum"] += stat["sum"]
+        merged["min"] = min(merged["min"], stat["min"])
+        merged["max"] = max(merged["max"], stat["max"])
+
+    return {
+        "sessions": old["sessions"] + new["sessions"],
+        # ISO dates order correctly as strings
+        "first_date": min(old["first_date"], new["first_date"]),
+        "last_date": max(old["last_date"], new["last_date"]),
+        "titles": titles,
+        "metrics": metrics,
+    }
+
+
+async def roll_forward(db: AsyncSession, athlete_id: uuid.UUID, rebuild: bool = False) -> RolledSummary:
+    """Fold the workouts logged since the stored digest into it; `rebuild` starts over from the full history."""
+    stored = await get_summary(db, athlete_id)
+    revision = stored.revision if stored else 0
+    summary = None if rebuild else stored
+    # A digest reset by an edit keeps its narrative but is rebuilt from the full history
+    since = summary.through if summary else None
+
+    delta, delta_through, total = await _aggregate(db, athlete_id, since)
+    stats = merge_stats(summary.stats if since else None, delta)
+    if (stats["sessions"] if stats else 0) != total:
+        # created_at is when a workout's transaction started, not when it committed: one that
+        # committed after an earlier roll-forward read can sit below `through`. Start over.
+        since = None
+        stats, delta_through, _ = await _aggregate(db, athlete_id, None)
+    return RolledSummary(
+        stats=stats,
+        through=delta_through or since,
+        revision=revision,
+        narrative=summary.narrative if summary else None,
+        narrative_at=summary.narrative_at if summary else None,
+        since=since,
+    )
+
+
+def save_statement(athlete_id: uuid.UUID, rolled: RolledSummary, narrative: str):
+    """Upsert of the rolled digest with the new report as its narrative.
+
+    Skipped if a workout was edited or deleted since the digest was read (the revision moved on).
+    """
+    summary = ai_models.AthleteSummary
+    values = {
+        "stats": rolled.stats,
+        "through": rolled.through,
+        "narrative": narrative,
+        "narrative_at": UTC_NOW_SERVER_DEFAULT,
+        "updated_at": UTC_NOW_SERVER_DEFAULT,
+    }
+    stmt = insert(summary).values(athlete_id=athlete_id, revision=rolled.revision, **values)
+    return stmt.on_conflict_do_update(
+        index_elements=[summary.athlete_id], set_=values, where=summary.revision == rolled.revision
+    )
+
+
+async def invalidate(db: AsyncSession, athlete_id: uuid.UUID):
+    """Mark the digest for a rebuild after a workout edit or delete; the caller commits."""
+    summary = ai_models.AthleteSummary
+    await db.execute(
+        update(summary)
+        .where(summary.athlete_id == athlete_id)
+        .values(stats=None, through=None, revision=summary.revision + 1, updated_at=UTC_NOW_SERVER_DEFAULT)
+    )
+
+
+def digest_text(stats: dict[str, Any] | None) -> str:
+    if not stats:
+        return "No workouts logged yet."
+
+    lines = [f"- {stats['sessions']} sessions from {stats['first_date']} to {stats['last_date']}"]
+
+    titles = sorted(stats["titles"].items(), key=lambda item: (-item[1], item[0]))
+    line = "- Most frequent: " + ", ".join(f"{title} ({count})" for title, count in titles[:MAX_TITLES])
+    if len(titles) > MAX_TITLES:
+        line += f", and {len(titles) - MAX_TITLES} more"
+    lines.append(line)
+
+    metrics = sorted(stats["metrics"].items(), key=lambda item: (-item[1]["count"], item[0]))
+    for key, stat in sorted(metrics[:MAX_METRICS]):
+        lines.append(
+            f"- {key}: avg {stat['sum'] / stat['count']:.2f}, range {stat['min']:g}-{stat['max']:g}"
+            f" over {stat['count']} sessions"
+        )
+    return "\n".join(lines)
+
+
+def narrative_text(narrative: str) -> str:
+    if len(narrative) <= MAX_NARRATIVE_CHARS:
+        return narrative
+    return narrative[:MAX_NARRATIVE_CHARS].rsplit(" ", 1)[0] + " [...]"
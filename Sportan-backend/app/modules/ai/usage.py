@@ -0,0 +1,211 @@
+"""
+Provider usage metering and per-coach daily token budgets.
+
+Each successful provider call is recorded as a `UsageEvent` (coach, athlete, report kind,
+provider, model, tokens, latency). `record` only appends to an in-memory buffer; the
+writer task inserts the buffer in one statement every AI_USAGE_FLUSH_SECONDS, or sooner once
+AI_USAGE_BATCH_SIZE events are waiting, so report generation never waits on the insert.
+Events still buffered when a process dies are lost, and so are the oldest ones if the
+database is unreachable for long enough to fill AI_USAGE_MAX_PENDING (`ai_usage.dropped`).
+
+With AI_COACH_DAILY_TOKEN_BUDGET set, a coach who has used that many tokens since 00:00 UTC
+gets 429 (with Retry-After) for requests that need a provider call; cached reports are
+still served. Calls already queued or in flight finish, so a budget can be overshot by them.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import UTC, date, datetime, timedelta
+from enum import Enum
+
+from fastapi import HTTPException, status
+from sqlalchemy import Date, String, cast, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.modules.ai import models as ai_models
+from app.modules.ai.providers import Usage
+
+logger = logging.getLogger(__name__)
+
+
+class UsageGroup(str, Enum):
+    COACH = "coach"
+    PROVIDER = "provider"
+    MODEL = "model"
+    KIND = "kind"
+    DAY = "day"
+
+
+class UsageWriter:
+    """Buffers usage events and inserts them in batches from a background task."""
+
+    def __init__(self, batch_size: int, flush_seconds: float, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending: list[dict] = []
+        # Taken off the buffer by a flush that has not committed yet
+        self._writing: list[dict] = []
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def record(
+        self,
+        coach_id: uuid.UUID,
+        athlete_id: uuid.UUID | None,
+        kind: ai_models.ReportKind,
+        usage: Usage,
+        streamed: bool = False,
+    ):
+        if len(self._pending) >= self.max_pending:
+            del self._pending[0]
+            metrics.increment("ai_usage.dropped")
+        self._pending.append(
+            {
+                "coach_id": coach_id,
+                "athlete_id": athlete_id,
+                "kind": kind,
+                "provider": usage.provider,
+                "model": usage.model,
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "estimated": usage.estimated,
+                "streamed": streamed,
+                "latency_ms": round(usage.latency * 1000),
+                "created_at": _utc_now(),
+            }
+        )
+        metrics.increment("ai_usage.recorded")
+        metrics.increment("ai_usage.tokens", usage.prompt_tokens + usage.completion_tokens)
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def pending_tokens(self, coach_id: uuid.UUID, since: datetime) -> int:
+        """Tokens of this coach's events that are not in the table yet."""
+        return sum(
+            event["prompt_tokens"] + event["completion_tokens"]
+            for event in self._pending + self._writing
+            if event["coach_id"] == coach_id and event["created_at"] >= since
+        )
+
+    async def flush(self):
+        if not self._pending:
+            return
+        events, self._pending = self._pending, []
+        self._writing = events
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(ai_models.UsageEvent), events)
+                await db.commit()
+        except Exception:
+            logger.exception("Writing %d AI usage events failed", len(events))
+            metrics.increment("ai_usage.flush_failed")
+            # Retry with the next flush, ahead of anything recorded since
+            self._pending = (events + self._pending)[-self.max_pending :]
+            return
+        finally:
+            self._writing = []
+        metrics.increment("ai_usage.flushed", len(events))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_seconds)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+
+usage_writer = UsageWriter(settings.AI_USAGE_BATCH_SIZE, settings.AI_USAGE_FLUSH_SECONDS, settings.AI_USAGE_MAX_PENDING)
+
+
+def _utc_now() -> datetime:
+    """Current UTC time without tzinfo, like the timestamp columns."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _start_of_day() -> datetime:
+    return datetime.combine(_utc_now().date(), datetime.min.time())
+
+
+async def tokens_today(db: AsyncSession, coach_id: uuid.UUID) -> int:
+    since = _start_of_day()
+    event = ai_models.UsageEvent
+    result = await db.execute(
+        select(func.coalesce(func.sum(event.prompt_tokens + event.completion_tokens), 0)).where(
+            event.coach_id == coach_id, event.created_at >= since
+        )
+    )
+    return result.scalar_one() + usage_writer.pending_tokens(coach_id, since)
+
+
+async def over_budget(db: AsyncSession, coach_id: uuid.UUID) -> bool:
+    budget = settings.AI_COACH_DAILY_TOKEN_BUDGET
+    return bool(budget) and await tokens_today(db, coach_id) >= budget
+
+
+async def check_budget(db: AsyncSession, coach_id: uuid.UUID):
+    """Raise 429 if the coach has used up today's token budget."""
+    if not await over_budget(db, coach_id):
+        return
+    metrics.increment("ai_usage.over_budget")
+    reset_in = _start_of_day() + timedelta(days=1) - _utc_now()
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Daily AI token budget used up",
+        headers={"Retry-After": str(int(reset_in.total_seconds()) + 1)},
+    )
+
+
+async def aggregate(
+    db: AsyncSession, since: date, group_by: UsageGroup, coach_id: uuid.UUID | None = None
+) -> list[dict]:
+    """Calls, tokens and latency percentiles since `since`, per group."""
+    event = ai_models.UsageEvent
+    keys = {
+        UsageGroup.COACH: cast(event.coach_id, String),
+        UsageGroup.PROVIDER: event.provider,
+        UsageGroup.MODEL: event.model,
+        # The column holds enum names; answer with the API's values
+        UsageGroup.KIND: func.lower(cast(event.kind, String)),
+        UsageGroup.DAY: cast(cast(event.created_at, Date), String),
+    }
+    key = keys[group_by].label("key")
+    prompt_tokens = func.sum(event.prompt_tokens)
+    completion_tokens = func.sum(event.completion_tokens)
+    query = (
+        select(
+            key,
+            func.count().label("calls"),
+            prompt_tokens.label("prompt_tokens"),
+            completion_tokens.label("completion_tokens"),
+            (prompt_tokens + completion_tokens).label("total_tokens"),
+            func.percentile_cont(0.5).within_group(event.latency_ms).label("p50_latency_ms"),
+            func.percentile_cont(0.95).within_group(event.latency_ms).label("p95_latency_ms"),
+        )
+        .where(event.created_at >= since)
+        .group_by(key)
+        .order_by((prompt_tokens + completion_tokens).desc())
+    )
+    if coach_id is not None:
+        query = query.where(event.coach_id == coach_id)
+    result = await db.execute(query)
+    return [
+        {**row, "p50_latency_ms": round(row["p50_latency_ms"], 1), "p95_latency_ms": round(row["p95_latency_ms"], 1)}
+        for row in result.mappings()
+    ]
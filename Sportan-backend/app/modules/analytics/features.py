@@ -0,0 +1,241 @@
+"""
+Numeric talent indicators, computed without a provider call.
+
+Everything here works on flat NumPy arrays covering many athletes at once: one row per
+session and one row per numeric metric value. Grouped sums (`np.bincount` with weights)
+give every athlete's volume and consistency, and every (athlete, metric) mean and
+least-squares trend, in one pass over the rows. Percentiles then rank each athlete against
+the others in the same age band.
+
+Metrics carry no direction. Keys that read as times (`60m`, `sprint_time`, `pace`) count
+lower as better and everything else higher as better; improvements and percentiles are
+oriented so that higher is always better.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+# Sessions older than this do not count towards an athlete's indicators
+WINDOW_DAYS = 180
+AGE_BAND_YEARS = 2
+# Metric trends are reported as change per this many days
+TREND_DAYS = 30
+
+LOWER_IS_BETTER = re.compile(r"^\d+(\.\d+)?\s*(m|km|mi)$|time|sec|pace|duration", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Observations:
+    """Training rows of a set of athletes; `*_athlete` are indexes into the caller's athlete list."""
+
+    session_athlete: np.ndarray
+    # Days since the start of the window; today is WINDOW_DAYS
+    session_day: np.ndarray
+    metric_athlete: np.ndarray
+    # Indexes into `keys`
+    metric_key: np.ndarray
+    metric_day: np.ndarray
+    metric_value: np.ndarray
+    keys: list[str]
+
+
+def lower_is_better(key: str) -> bool:
+    return bool(LOWER_IS_BETTER.search(key))
+
+
+def age_band(dob: date | None, today: date) -> str | None:
+    if dob is None:
+        return None
+    age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+    low = age // AGE_BAND_YEARS * AGE_BAND_YEARS
+    return f"{low}-{low + AGE_BAND_YEARS - 1}"
+
+
+def _number(value: float) -> float | None:
+    return round(float(value), 3) if np.isfinite(value) else None
+
+
+def training_features(obs: Observations, athlete_count: int) -> list[dict[str, Any]]:
+    """Volume, consistency and per-metric mean and trend of each athlete, from their own rows only."""
+    n, k = athlete_count, len(obs.keys)
+
+    sessions = np.bincount(obs.session_athlete, minlength=n)
+    weeks = WINDOW_DAYS // 7 + 1
+    week = obs.session_day // 7
+    active_weeks = np.bincount(np.unique(obs.session_athlete * weeks + week) // weeks, minlength=n)
+    # Consistency counts the weeks since an athlete's first session in the window, not the whole window
+    first_week = np.full(n, weeks - 1)
+    np.minimum.at(first_week, obs.session_athlete, week)
+    consistency = np.where(sessions > 0, active_weeks / (weeks - first_week), 0.0)
+
+    pair = obs.metric_athlete * k + obs.metric_key
+    x = obs.metric_day.astype(float)
+    y = obs.metric_value.astype(float)
+    count, sx, sy, sxx, sxy = (np.bincount(pair, weights=w, minlength=n * k) for w in (None, x, y, x * x, x * y))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sy / count
+        spread = count * sxx - sx * sx
+        # Least-squares slope per day; undefined when all values are from the same day
+        slope = np.where(spread > 0, (count * sxy - sx * sy) / spread, np.nan)
+        sign = np.tile(np.where([lower_is_better(key) for key in obs.keys], -1.0, 1.0), n)
+        improvement = slope * TREND_DAYS * sign / np.abs(mean)
+
+    features = []
+    for i in range(n):
+        metrics = {}
+        for j in np.flatnonzero(count[i * k : (i + 1) * k]):
+            p = i * k + j
+            metrics[obs.keys[j]] = {
+                "sessions": int(count[p]),
+                "mean": _number(mean[p]),
+                "trend_per_30d": _number(slope[p] * TREND_DAYS),
+                "improvement": _number(improvement[p]),
+            }
+        features.append(
+            {
+                "sessions": int(sessions[i]),
+                "sessions_per_week": _number(sessions[i] / (WINDOW_DAYS / 7)),
+                "consistency": _number(consistency[i]),
+                "metrics": metrics,
+            }
+        )
+    return features
+
+
+def group_percentiles(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Mid-rank percentile (0-100) of each finite value among the finite values of its group.
+
+    `groups` are non-negative integer codes. The lowest value of a group gets 0, the highest 100,
+    a group of one 50; NaN values stay NaN and are not ranked.
+    """
+    result = np.full(values.shape, np.nan)
+    valid = np.isfinite(values)
+    if not valid.any():
+        return result
+    group = groups[valid].astype(np.int64)
+    # Integer ranks of the values, so (group, rank) packs into one sortable key
+    _, rank = np.unique(values[valid], return_inverse=True)
+    stride = rank.max() + 1
+    key = group * stride + rank
+    ordered = np.sort(key)
+    start = np.searchsorted(ordered, group * stride, "left")
+    size = np.searchsorted(ordered, (group + 1) * stride, "left") - start
+    below = np.searchsorted(ordered, key, "left") - start
+    ties = np.searchsorted(ordered, key, "right") - start - below
+    others = size - 1
+    result[valid] = np.where(others > 0, 100 * (below + (ties - 1) / 2) / np.maximum(others, 1), 50.0)
+    return result
+
+
+def _band_percentiles(values: np.ndarray, bands: np.ndarray, has_band: np.ndarray) -> np.ndarray:
+    """Percentiles within the age band; athletes without a date of birth are ranked against everyone."""
+    within_band = group_percentiles(values, bands)
+    if has_band.all():
+        return within_band
+    return np.where(has_band, within_band, group_percentiles(values, np.zeros_like(bands)))
+
+
+def cohort_scores(features: list[dict[str, Any]], bands: list[str | None]) -> list[float | None]:
+    """Add age-band percentiles to each athlete's features (in place) and return their talent scores.
+
+    The score (0-100) is the mean of consistency, the volume percentile, the mean metric percentile
+    and the mean improvement percentile, over whichever of these the athlete has. Athletes with no
+    sessions in the window are not ranked and get no score.
+    """
+    n = len(features)
+    _, band_codes = np.unique(np.array([band or "" for band in bands]), return_inverse=True)
+    has_band = np.array([band is not None for band in bands], dtype=bool)
+    active = np.array([f["sessions"] > 0 for f in features], dtype=bool)
+
+    volume = np.array([f["sessions_per_week"] for f in features], dtype=float)
+    volume_percentile = _band_percentiles(np.where(active, volume, np.nan), band_codes, has_band)
+
+    keys = sorted({key for f in features for key in f["metrics"]})
+    level = np.full((n, len(keys)), np.nan)
+    progress = np.full((n, len(keys)), np.nan)
+    for j, key in enumerate(keys):
+        sign = -1.0 if lower_is_better(key) else 1.0
+        stats = [f["metrics"].get(key) for f in features]
+        means = np.array([s["mean"] if s and s["mean"] is not None else np.nan for s in stats], dtype=float)
+        gains = np.array(
+            [s["improvement"] if s and s["improvement"] is not None else np.nan for s in stats], dtype=float
+        )
+        level[:, j] = _band_percentiles(sign * means, band_codes, has_band)
+        progress[:, j] = _band_percentiles(gains, band_codes, has_band)
+
+    consistency = np.array([f["consistency"] for f in features], dtype=float) * 100
+    components = np.column_stack([consistency, volume_percentile, _row_mean(level), _row_mean(progress)])
+    score = np.where(active, _row_mean(components), np.nan)
+
+    for i, f in enumerate(features):
+        f["age_band"] = bands[i]
+        f["volume_percentile"] = _number(volume_percentile[i])
+        for j, key in enumerate(keys):
+            if key in f["metrics"]:
+                f["metrics"][key]["percentile"] = _number(level[i, j])
+                f["metrics"][key]["improvement_percentile"] = _number(progress[i, j])
+    return [_number(value) for value in score]
+
+
+def _row_mean(values: np.ndarray) -> np.ndarray:
+    """Mean of the finite values of each row, NaN for rows without any."""
+    finite = np.isfinite(values)
+    count = finite.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, np.where(finite, values, 0).sum(axis=1) / count, np.nan)
+
+
+def group_quantiles(values: np.ndarray, groups: np.ndarray, levels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Quantiles at `levels` (0-1) of the values of every group at once, with linear interpolation.
+
+    Returns the group codes, ascending, and a (groups, levels) array; same result as `np.quantile`
+    on each group, from one sort instead of one call per group.
+    """
+    order = np.lexsort((values, groups))
+    ordered, ordered_groups = values[order], groups[order]
+    codes, start, size = np.unique(ordered_groups, return_index=True, return_counts=True)
+    position = start[:, None] + levels[None, :] * (size - 1)[:, None]
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, (start + size - 1)[:, None])
+    fraction = position - low
+    return codes, ordered[low] * (1 - fraction) + ordered[high] * fraction
+
+
+def percentile_of(quantiles: np.ndarray, value: float) -> float:
+    """Percentile (0-100) of `value` in a table of evenly spaced quantiles, by binary search.
+
+    Values between two quantiles are interpolated; a value equal to a run of tied quantiles
+    gets the middle of the run.
+    """
+    step = 100 / (len(quantiles) - 1)
+    low = int(np.searchsorted(quantiles, value, "left"))
+    high = int(np.searchsorted(quantiles, value, "right"))
+    if low < high:
+        return (low + high - 1) / 2 * step
+    if low == 0:
+        return 0.0
+    if low == len(quantiles):
+        return 100.0
+    below, above = quantiles[low - 1], quantiles[low]
+    return (low - 1 + (value - below) / (above - below)) * step
+
+
+def indicators_text(features: dict[str, Any]) -> str:
+    """The athlete's own indicators as prompt lines (no peer percentiles, so the prompt only moves with their data)."""
+    if not features["sessions"]:
+        return f"- No sessions in the last {WINDOW_DAYS} days"
+    lines = [
+        f"- {features['sessions_per_week']:g} sessions per week over the last {WINDOW_DAYS} days, "
+        f"active in {features['consistency']:.0%} of weeks since their first session in that period"
+    ]
+    for key, stat in sorted(features["metrics"].items()):
+        line = f"- {key}: avg {stat['mean']:g} over {stat['sessions']} sessions"
+        if stat["improvement"] is not None:
+            line += f", {'improving' if stat['improvement'] >= 0 else 'declining'} {abs(stat['improvement']):.1%}"
+            line += f" per {TREND_DAYS} days"
+        lines.append(line)
+    return "\n    ".join(lines)
@@ -0,0 +1,41 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import UTC_NOW_SERVER_DEFAULT, Base
+
+
+class AthleteScore(Base):
+    """Numeric talent indicators of an athlete, ranked against the coach's other athletes."""
+
+    __tablename__ = "athlete_scores"
+
+    athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id", ondelete="CASCADE"), primary_key=True)
+    coach_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("coaches.id", ondelete="CASCADE"), index=True)
+    # 0-100; NULL when the athlete has no sessions in the window
+    score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Volume, consistency, age band and per-metric mean/trend/percentiles (see analytics.features)
+    features: Mapped[dict] = mapped_column(JSONB)
+    # created_at of the newest workout when the features were computed; informational, staleness
+    # goes by the number of workouts in the window (analytics.service)
+    through: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Day the features were computed for (the window moves daily); NULL after a workout edit or delete
+    computed_on: Mapped[date | None] = mapped_column(Date, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
+
+
+class MetricNorm(Base):
+    """Percentile table of one metric across all athletes of an age band on the platform."""
+
+    __tablename__ = "metric_norms"
+
+    metric: Mapped[str] = mapped_column(String, primary_key=True)
+    # "12-13", or "all" for every athlete with or without a date of birth
+    age_band: Mapped[str] = mapped_column(String, primary_key=True)
+    athletes: Mapped[int] = mapped_column(Integer)
+    # The 0th to 100th percentiles of the athletes' mean values, ascending
+    quantiles: Mapped[list[float]] = mapped_column(ARRAY(Float))
+    computed_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
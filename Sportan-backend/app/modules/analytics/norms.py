@@ -0,0 +1,183 @@
+"""
+Platform-wide age-band norms for workout metrics.
+
+A periodic job compares each athlete's mean of every numeric metric over the last
+WINDOW_DAYS with all athletes of the same age band, across every coach. One SQL query
+returns a mean per (athlete, metric) with the athlete's date of birth. NumPy sorts them once
+and reads the 0th to 100th percentiles of every (metric, band) group off the sorted array.
+There is also an "all" band per metric, which includes athletes without a date of birth.
+The new tables (101 numbers each) replace the old ones in one transaction. A group with
+fewer than ANALYTICS_NORM_MIN_ATHLETES athletes gets no table. Athletes have no sex field,
+so the norms are per age band only.
+
+Readers keep the tables in memory (`norm_cache`) and check for a newer computation at most
+every ANALYTICS_NORM_CACHE_SECONDS; a lookup is a binary search in one table.
+
+Run from the scheduler with POST /system/analytics/norms, or as:
+    uv run python -m app.modules.analytics.norms
+"""
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import String, cast, delete, func, insert, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.modules.ai import prompts
+from app.modules.analytics import features
+from app.modules.analytics import models as analytics_models
+from app.modules.identity import models as identity_models
+from app.modules.training import models as training_models
+
+logger = logging.getLogger(__name__)
+
+ALL_AGES = "all"
+LEVELS = np.linspace(0, 1, 101)
+
+
+@dataclass(frozen=True)
+class Norm:
+    athletes: int
+    quantiles: np.ndarray
+
+
+async def _athlete_means(db: AsyncSession, today: date) -> list[tuple[date | None, str, float]]:
+    """(dob, metric, mean) for every athlete and numeric metric logged in the window."""
+    workout = training_models.Workout
+    athlete = identity_models.Athlete
+    entry, value = prompts.numeric_metrics()
+    result = await db.execute(
+        select(athlete.dob, cast(entry.c.key, String), func.avg(value))
+        .select_from(workout)
+        .join(athlete, athlete.id == workout.athlete_id)
+        .join(entry, true())
+        .where(
+            workout.date >= today - timedelta(days=features.WINDOW_DAYS),
+            workout.date <= today,
+            entry.c.value.regexp_match(prompts.NUMERIC_PATTERN),
+        )
+        .group_by(workout.athlete_id, athlete.dob, entry.c.key)
+    )
+    return result.all()
+
+
+def norm_tables(
+    means: list[tuple[date | None, str, float]], today: date, min_athletes: int
+) -> dict[tuple[str, str], Norm]:
+    """Percentile tables per (metric, age band) and (metric, "all") with at least `min_athletes` athletes."""
+    groups: dict[tuple[str, str], int] = {}
+    codes, values = [], []
+    for dob, metric, mean in means:
+        band = features.age_band(dob, today)
+        for key in ((metric, band), (metric, ALL_AGES)) if band else ((metric, ALL_AGES),):
+            codes.append(groups.setdefault(key, len(groups)))
+            values.append(float(mean))
+    if not values:
+        return {}
+
+    counts = np.bincount(np.array(codes), minlength=len(groups))
+    present, quantiles = features.group_quantiles(np.array(values), np.array(codes), LEVELS)
+    labels = list(groups)
+    return {
+        labels[code]: Norm(int(counts[code]), table)
+        for code, table in zip(present, quantiles, strict=True)
+        if counts[code] >= min_athletes
+    }
+
+
+async def compute_norms(db: AsyncSession) -> dict[str, int]:
+    """Recompute and replace all norm tables."""
+    today = datetime.now(UTC).date()
+    means = await _athlete_means(db, today)
+    tables = norm_tables(means, today, settings.ANALYTICS_NORM_MIN_ATHLETES)
+
+    norm = analytics_models.MetricNorm
+    await db.execute(delete(norm))
+    if tables:
+        await db.execute(
+            insert(norm),
+            [
+                {
+                    "metric": metric,
+                    "age_band": band,
+                    "athletes": t.athletes,
+                    "quantiles": np.round(t.quantiles, 4).tolist(),
+                }
+                for (metric, band), t in tables.items()
+            ],
+        )
+    await db.commit()
+    norm_cache.expire()
+    metrics.increment("analytics_norms.computed")
+    return {"tables": len(tables), "metrics": len({metric for metric, _ in tables}), "athlete_metrics": len(means)}
+
+
+class NormCache:
+    """Norm tables held in memory by this process."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._tables: dict[tuple[str, str], Norm] = {}
+        self._computed_at: datetime | None = None
+        self._checked = -math.inf
+        self._lock = asyncio.Lock()
+
+    def expire(self):
+        self._checked = -math.inf
+
+    async def tables(self, db: AsyncSession) -> dict[tuple[str, str], Norm]:
+        """The tables, reloaded only if the check interval has passed and a newer computation is stored."""
+        if time.monotonic() - self._checked < self.ttl:
+            return self._tables
+        async with self._lock:
+            if time.monotonic() - self._checked < self.ttl:
+                return self._tables
+            norm = analytics_models.MetricNorm
+            result = await db.execute(select(func.max(norm.computed_at)))
+            computed_at = result.scalar()
+            if computed_at != self._computed_at:
+                result = await db.execute(select(norm.metric, norm.age_band, norm.athletes, norm.quantiles))
+                self._tables = {
+                    (metric, band): Norm(athletes, np.array(quantiles))
+                    for metric, band, athletes, quantiles in result.all()
+                }
+                self._computed_at = computed_at
+                metrics.increment("analytics_norms.loaded")
+            self._checked = time.monotonic()
+        return self._tables
+
+
+norm_cache = NormCache(settings.ANALYTICS_NORM_CACHE_SECONDS)
+
+
+def platform_percentile(
+    tables: dict[tuple[str, str], Norm], metric: str, age_band: str | None, value: float | None
+) -> float | None:
+    """Where `value` sits among athletes of the age band on the platform, 0-100, higher is better."""
+    norm = tables.get((metric, age_band or ALL_AGES))
+    if norm is None or value is None:
+        return None
+    percentile = features.percentile_of(norm.quantiles, value)
+    return round(100 - percentile if features.lower_is_better(metric) else percentile, 1)
+
+
+async def main():
+    try:
+        async with AsyncSessionLocal() as db:
+            summary = await compute_norms(db)
+        logger.info("Computed norms: %s", summary)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
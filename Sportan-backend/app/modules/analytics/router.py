@@ -0,0 +1,58 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import SystemTokenDep
+from app.core.database import get_db
+from app.modules.analytics import norms as analytics_norms
+from app.modules.analytics import schemas as analytics_schemas
+from app.modules.analytics import service as analytics_service
+from app.modules.analytics import similarity as analytics_similarity
+from app.modules.identity import models as identity_models
+from app.modules.identity import service as identity_service
+
+router = APIRouter(tags=["analytics"])
+
+CoachDep = Annotated[identity_models.Coach, Depends(identity_service.get_current_coach)]
+DbDep = Annotated[AsyncSession, Depends(get_db)]
+
+
+@router.get("/coach/analytics/scores", response_model=list[analytics_schemas.AthleteScoreRead])
+async def list_athlete_scores(coach: CoachDep, db: DbDep):
+    """Talent indicators of all the coach's athletes, highest score first."""
+    return await analytics_service.list_scores(db, coach.id)
+
+
+@router.get("/coach/athletes/{athlete_id}/scores", response_model=analytics_schemas.AthleteScoreRead)
+async def get_athlete_score(athlete_id: UUID, coach: CoachDep, db: DbDep):
+    return await analytics_service.get_athlete_score(db, athlete_id, coach.id)
+
+
+@router.get("/coach/athletes/{athlete_id}/similar", response_model=list[analytics_schemas.SimilarAthleteRead])
+async def get_similar_athletes(
+    athlete_id: UUID, coach: CoachDep, db: DbDep, k: Annotated[int, Query(ge=1, le=50)] = 10
+):
+    """The coach's athletes with the closest training profile, closest first."""
+    return await analytics_similarity.similar_athletes(db, athlete_id, coach.id, k)
+
+
+@router.get("/coach/analytics/norms", response_model=list[analytics_schemas.NormRead])
+async def get_metric_norms(metric: str, _: CoachDep, db: DbDep):
+    """Platform percentile tables of one metric, per age band; served from memory."""
+    tables = await analytics_norms.norm_cache.tables(db)
+    return [
+        {"metric": key, "age_band": band, "athletes": norm.athletes, "quantiles": norm.quantiles.tolist()}
+        for (key, band), norm in sorted(tables.items())
+        if key == metric
+    ]
+
+
+# --- System / Cron ---
+
+
+@router.post("/system/analytics/norms", include_in_schema=False)
+async def compute_metric_norms(db: DbDep, _: SystemTokenDep):
+    """Called by the scheduler (e.g. nightly) to recompute the platform-wide age-band norms."""
+    return await analytics_norms.compute_norms(db)
@@ -0,0 +1,47 @@
+from datetime import date
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class MetricScore(BaseModel):
+    sessions: int
+    mean: float | None
+    # Least-squares change of the value per 30 days, in the metric's own units
+    trend_per_30d: float | None
+    # The trend as a share of the mean, positive when the athlete is getting better
+    improvement: float | None
+    # 0-100 against the coach's athletes in the same age band
+    percentile: float | None
+    improvement_percentile: float | None
+    # 0-100 against all athletes of the age band on the platform; None without a norm table
+    platform_percentile: float | None = None
+
+
+class AthleteScoreRead(BaseModel):
+    athlete_id: UUID
+    full_name: str
+    score: float | None
+    age_band: str | None
+    sessions: int
+    sessions_per_week: float | None
+    consistency: float | None
+    volume_percentile: float | None
+    metrics: dict[str, MetricScore]
+    computed_on: date | None
+
+
+class SimilarAthleteRead(BaseModel):
+    athlete_id: UUID
+    full_name: str
+    score: float | None
+    # Root mean square difference over the compared features: 0 is identical, 1 opposite
+    distance: float
+
+
+class NormRead(BaseModel):
+    metric: str
+    age_band: str
+    athletes: int
+    # The 0th to 100th percentiles, ascending
+    quantiles: list[float]
@@ -0,0 +1,188 @@
+"""
+Stored talent scores, refreshed incrementally per coach.
+
+A refresh reads which of the coach's athletes are stale: no score yet, a different number
+of workouts in the window than the score was computed from, a workout edited or deleted
+(`invalidate`), or computed on an earlier day (the window has moved). The count catches a
+workout whose transaction committed late with an older created_at, which a created_at
+watermark would miss. Only those athletes' workouts are read and turned
+into features; everyone else's come from their stored rows. Percentiles and scores are
+then recomputed across the whole roster, since a change for one athlete moves the
+others' ranks, and all rows are upserted in one statement.
+"""
+
+import uuid
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import String, and_, cast, func, select, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.database import UTC_NOW_SERVER_DEFAULT
+from app.modules.ai import prompts
+from app.modules.analytics import features, norms
+from app.modules.analytics import models as analytics_models
+from app.modules.identity import models as identity_models
+from app.modules.training import models as training_models
+
+
+async def observations(db: AsyncSession, athlete_ids: list[uuid.UUID], today: date) -> features.Observations:
+    """Sessions and numeric metric values of these athletes in the window, as index arrays."""
+    workout = training_models.Workout
+    start = today - timedelta(days=features.WINDOW_DAYS)
+    scope = [workout.athlete_id.in_(athlete_ids), workout.date >= start, workout.date <= today]
+    index = {athlete_id: i for i, athlete_id in enumerate(athlete_ids)}
+
+    result = await db.execute(select(workout.athlete_id, workout.date).where(*scope))
+    sessions = result.all()
+
+    entry, value = prompts.numeric_metrics()
+    result = await db.execute(
+        select(workout.athlete_id, workout.date, cast(entry.c.key, String), value)
+        .select_from(workout)
+        .join(entry, true())
+        .where(*scope, entry.c.value.regexp_match(prompts.NUMERIC_PATTERN))
+    )
+    values = result.all()
+    keys, key_index = np.unique(np.array([row[2] for row in values], dtype=str), return_inverse=True)
+
+    return features.Observations(
+        session_athlete=np.array([index[row[0]] for row in sessions], dtype=np.int64),
+        session_day=np.array([(row[1] - start).days for row in sessions], dtype=np.int64),
+        metric_athlete=np.array([index[row[0]] for row in values], dtype=np.int64),
+        metric_key=key_index.astype(np.int64),
+        metric_day=np.array([(row[1] - start).days for row in values], dtype=np.int64),
+        metric_value=np.array([float(row[3]) for row in values], dtype=float),
+        keys=[str(key) for key in keys],
+    )
+
+
+async def athlete_features(db: AsyncSession, athlete_id: uuid.UUID) -> dict[str, Any]:
+    """One athlete's own indicators (no percentiles), computed on the fly."""
+    obs = await observations(db, [athlete_id], datetime.now(UTC).date())
+    return features.training_features(obs, 1)[0]
+
+
+async def refresh_coach_scores(db: AsyncSession, coach_id: uuid.UUID) -> int:
+    """Recompute the features of the coach's stale athletes and re-rank everyone; returns the athletes recomputed."""
+    athlete = identity_models.Athlete
+    score = analytics_models.AthleteScore
+    workout = training_models.Workout
+    today = datetime.now(UTC).date()
+    in_window = and_(workout.date >= today - timedelta(days=features.WINDOW_DAYS), workout.date <= today)
+
+    # One row per athlete with their stored score, newest workout and workouts in the window
+    result = await db.execute(
+        select(
+            athlete.id,
+            athlete.dob,
+            score.features,
+            score.computed_on,
+            func.max(workout.created_at).label("latest"),
+            func.count(workout.id).filter(in_window).label("window_sessions"),
+        )
+        .outerjoin(score, score.athlete_id == athlete.id)
+        .outerjoin(workout, workout.athlete_id == athlete.id)
+        .where(athlete.coach_id == coach_id)
+        .group_by(athlete.id, score.athlete_id)
+        .order_by(athlete.id)
+    )
+    roster = result.all()
+    stale = [
+        row.id
+        for row in roster
+        if row.computed_on is None or row.computed_on < today or row.window_sessions != row.features["sessions"]
+    ]
+    if not stale:
+        metrics.increment("analytics_scores.fresh")
+        return 0
+
+    fresh = features.training_features(await observations(db, stale, today), len(stale))
+    computed = dict(zip(stale, fresh, strict=True))
+    roster_features = [computed.get(row.id) or row.features for row in roster]
+    bands = [features.age_band(row.dob, today) for row in roster]
+    scores = features.cohort_scores(roster_features, bands)
+
+    stmt = insert(score)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[score.athlete_id],
+            set_={
+                "score": stmt.excluded.score,
+                "features": stmt.excluded.features,
+                "through": stmt.excluded.through,
+                "computed_on": stmt.excluded.computed_on,
+                "updated_at": UTC_NOW_SERVER_DEFAULT,
+            },
+        ),
+        [
+            {
+                "athlete_id": row.id,
+                "coach_id": coach_id,
+                "score": value,
+                "features": stored,
+                "through": row.latest,
+                "computed_on": today,
+            }
+            for row, stored, value in zip(roster, roster_features, scores, strict=True)
+        ],
+    )
+    await db.commit()
+    metrics.increment("analytics_scores.recomputed", len(stale))
+    return len(stale)
+
+
+def _score_read(
+    full_name: str, row: analytics_models.AthleteScore, tables: dict[tuple[str, str], norms.Norm]
+) -> dict[str, Any]:
+    band = row.features["age_band"]
+    metric_scores = {
+        key: {**stat, "platform_percentile": norms.platform_percentile(tables, key, band, stat["mean"])}
+        for key, stat in row.features["metrics"].items()
+    }
+    return {
+        "athlete_id": row.athlete_id,
+        "full_name": full_name,
+        "score": row.score,
+        "computed_on": row.computed_on,
+        **row.features,
+        "metrics": metric_scores,
+    }
+
+
+async def list_scores(db: AsyncSession, coach_id: uuid.UUID) -> list[dict[str, Any]]:
+    """The coach's athletes by talent score, highest first, after refreshing the stale ones."""
+    await refresh_coach_scores(db, coach_id)
+    score = analytics_models.AthleteScore
+    result = await db.execute(
+        select(identity_models.Athlete.full_name, score)
+        .join(identity_models.Athlete, identity_models.Athlete.id == score.athlete_id)
+        .where(score.coach_id == coach_id)
+        .order_by(score.score.desc().nulls_last(), identity_models.Athlete.full_name)
+    )
+    tables = await norms.norm_cache.tables(db)
+    return [_score_read(full_name, row, tables) for full_name, row in result.all()]
+
+
+async def get_athlete_score(db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID) -> dict[str, Any]:
+    await refresh_coach_scores(db, coach_id)
+    score = analytics_models.AthleteScore
+    result = await db.execute(
+        select(identity_models.Athlete.full_name, score)
+        .join(identity_models.Athlete, identity_models.Athlete.id == score.athlete_id)
+        .where(score.athlete_id == athlete_id, score.coach_id == coach_id)
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Athlete not found")
+    return _score_read(*row, await norms.norm_cache.tables(db))
+
+
+async def invalidate(db: AsyncSession, athlete_id: uuid.UUID):
+    """Mark the athlete's score for recomputation after a workout edit or delete; the caller commits."""
+    score = analytics_models.AthleteScore
+    await db.execute(update(score).where(score.athlete_id == athlete_id).values(computed_on=None))
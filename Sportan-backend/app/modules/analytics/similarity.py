@@ -0,0 +1,149 @@
+"""
+Similar athletes in a coach's roster, by nearest neighbours over feature vectors.
+
+Each athlete with sessions in the window becomes one vector, built from their stored score
+features (see analytics.service): volume percentile, consistency, and the age-band
+percentile of every metric the coach's athletes log, all on a 0-1 scale. The coach's
+vectors form one float32 matrix. A query computes the distance to every row and picks the
+k nearest with `np.argpartition`, which takes under a millisecond for 5,000 athletes
+(scripts/bench_similarity.py).
+
+Only the dimensions the query athlete has are compared. A sprinter is matched on sprint
+metrics, not on jumps they never logged; candidates without one of those metrics sit at
+the middle (0.5) for it. Distances are root mean square over the compared dimensions, so
+0 is identical and 1 is opposite.
+
+Each process keeps an index per coach (up to SIMILARITY_MAX_COACHES). A coach's index is
+rebuilt from the stored features, without reading workouts, when their scores change: the
+row count or the newest `updated_at` moves. The scores are refreshed incrementally first,
+so new workouts are reflected.
+"""
+
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.modules.analytics import models as analytics_models
+from app.modules.analytics import service as analytics_service
+from app.modules.coaching import scoping
+from app.modules.identity import models as identity_models
+
+SIMILARITY_MAX_COACHES = 256
+
+# Dimensions every active athlete has, before one per metric key
+TRAINING_DIMS = 2
+
+
+@dataclass(frozen=True)
+class SimilarityIndex:
+    athlete_ids: list[uuid.UUID]
+    position: dict[uuid.UUID, int]
+    keys: list[str]
+    # (athletes, TRAINING_DIMS + keys), 0-1; 0.5 where the athlete has no value
+    vectors: np.ndarray
+    # Where the athlete has a value
+    present: np.ndarray
+    version: tuple[Any, ...] = ()
+
+
+def build_index(rows: list[tuple[uuid.UUID, dict[str, Any]]], version: tuple[Any, ...] = ()) -> SimilarityIndex:
+    """Index over (athlete_id, stored features) rows; athletes without sessions in the window are left out."""
+    rows = [(athlete_id, stored) for athlete_id, stored in rows if stored["sessions"]]
+    keys = sorted({key for _, stored in rows for key in stored["metrics"]})
+    column = {key: TRAINING_DIMS + j for j, key in enumerate(keys)}
+
+    vectors = np.full((len(rows), TRAINING_DIMS + len(keys)), 0.5, dtype=np.float32)
+    present = np.zeros(vectors.shape, dtype=bool)
+    for i, (_, stored) in enumerate(rows):
+        values = [(0, stored["volume_percentile"], 100), (1, stored["consistency"], 1)]
+        values += [(column[key], stat.get("percentile"), 100) for key, stat in stored["metrics"].items()]
+        for j, value, scale in values:
+            if value is not None:
+                vectors[i, j] = value / scale
+                present[i, j] = True
+
+    athlete_ids = [athlete_id for athlete_id, _ in rows]
+    return SimilarityIndex(
+        athlete_ids=athlete_ids,
+        position={athlete_id: i for i, athlete_id in enumerate(athlete_ids)},
+        keys=keys,
+        vectors=vectors,
+        present=present,
+        version=version,
+    )
+
+
+def nearest(index: SimilarityIndex, athlete_id: uuid.UUID, k: int) -> list[tuple[uuid.UUID, float]]:
+    """The k athletes closest to `athlete_id` over the dimensions it has, closest first."""
+    i = index.position.get(athlete_id)
+    if i is None or len(index.athlete_ids) < 2:
+        return []
+    dims = index.present[i]
+    diff = index.vectors[:, dims] - index.vectors[i, dims]
+    distance = np.sqrt(np.einsum("ij,ij->i", diff, diff) / max(int(dims.sum()), 1))
+    distance[i] = np.inf
+
+    k = min(k, len(index.athlete_ids) - 1)
+    candidates = np.argpartition(distance, k - 1)[:k]
+    closest = candidates[np.argsort(distance[candidates], kind="stable")]
+    return [(index.athlete_ids[j], round(float(distance[j]), 4)) for j in closest]
+
+
+class IndexCache:
+    """The most recently used coaches' indexes, rebuilt when their stored scores change."""
+
+    def __init__(self, max_coaches: int):
+        self.max_coaches = max_coaches
+        self._indexes: OrderedDict[uuid.UUID, SimilarityIndex] = OrderedDict()
+
+    async def get(self, db: AsyncSession, coach_id: uuid.UUID) -> SimilarityIndex:
+        await analytics_service.refresh_coach_scores(db, coach_id)
+        score = analytics_models.AthleteScore
+        result = await db.execute(select(func.count(), func.max(score.updated_at)).where(score.coach_id == coach_id))
+        version = tuple(result.one())
+
+        index = self._indexes.get(coach_id)
+        if index is None or index.version != version:
+            result = await db.execute(
+                select(score.athlete_id, score.features).where(score.coach_id == coach_id).order_by(score.athlete_id)
+            )
+            index = build_index(result.all(), version)
+            metrics.increment("analytics_similarity.built")
+        self._indexes[coach_id] = index
+        self._indexes.move_to_end(coach_id)
+        while len(self._indexes) > self.max_coaches:
+            self._indexes.popitem(last=False)
+        return index
+
+
+similarity_cache = IndexCache(SIMILARITY_MAX_COACHES)
+
+
+async def similar_athletes(db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID, k: int) -> list[dict]:
+    """The coach's athletes with training profiles closest to this one; empty if it has no recent sessions."""
+    await scoping.fetch_scoped(db, scoping.owned_athlete(athlete_id, coach_id), "Athlete not found")
+    index = await similarity_cache.get(db, coach_id)
+    matches = nearest(index, athlete_id, k)
+    if not matches:
+        return []
+
+    # Names and scores are read fresh for the few matches rather than held in the index
+    athlete = identity_models.Athlete
+    score = analytics_models.AthleteScore
+    result = await db.execute(
+        select(athlete.id, athlete.full_name, score.score)
+        .join(score, score.athlete_id == athlete.id)
+        .where(athlete.id.in_([match_id for match_id, _ in matches]))
+    )
+    found = {row.id: row for row in result.all()}
+    return [
+        {"athlete_id": match_id, "full_name": found[match_id].full_name, "score": found[match_id].score, "distance": d}
+        for match_id, d in matches
+        if match_id in found
+    ]
@@ -0,0 +1,101 @@
+"""
+Everything the coach app needs at launch, in one response.
+
+Instead of /coach/me, /coach/groups, each group's roster and the assignment lists, the
+client reads GET /coach/bootstrap. Four column projections run at the same time, each in a
+short session of its own (an AsyncSession runs one statement at a time): groups,
+memberships, athletes, and assignments from today to UPCOMING_DAYS ahead. The request
+session, which only resolved the coach, is released first, so a bootstrap holds at most four
+pool connections and only while its reads run.
+
+Athletes appear once however many groups they are in; `memberships` links them to groups.
+The counts are derived from the same rows, so they always agree with the lists.
+
+The response carries an ETag of its encoded body (see core.responses.revalidated). On
+relaunch the client sends it back in If-None-Match and gets a 304 without a body when
+nothing changed.
+"""
+
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Select, select
+
+from app.core import metrics, projection
+from app.core.database import AsyncSessionLocal
+from app.modules.coaching import models as coaching_models
+from app.modules.coaching import schemas as coaching_schemas
+from app.modules.identity import models as identity_models
+from app.modules.identity import schemas as identity_schemas
+from app.modules.training import models as training_models
+from app.modules.training.models import WorkoutStatus
+from app.modules.training.service import ASSIGNMENT_READ_COLUMNS
+
+# Assignments scheduled from today up to this many days ahead
+UPCOMING_DAYS = 7
+
+
+async def _read(query: Select) -> list[dict[str, Any]]:
+    async with AsyncSessionLocal() as db:
+        return await projection.fetch_dicts(db, query)
+
+
+def _queries(coach_id: uuid.UUID, today, last_day) -> tuple[Select, Select, Select, Select]:
+    group, membership = coaching_models.Group, coaching_models.GroupAthlete
+    athlete, assignment = identity_models.Athlete, training_models.AssignedWorkout
+    groups = (
+        select(*projection.columns_for(group, coaching_schemas.GroupRead))
+        .where(group.coach_id == coach_id)
+        .order_by(group.name, group.id)
+    )
+    memberships = (
+        select(membership.group_id, membership.athlete_id)
+        .join(group, group.id == membership.group_id)
+        .where(group.coach_id == coach_id)
+        .order_by(membership.group_id, membership.athlete_id)
+    )
+    athletes = (
+        select(*projection.columns_for(athlete, identity_schemas.AthleteRead))
+        .where(athlete.coach_id == coach_id)
+        .order_by(athlete.full_name, athlete.id)
+    )
+    assignments = (
+        select(*ASSIGNMENT_READ_COLUMNS)
+        .join(athlete, athlete.id == assignment.athlete_id)
+        .where(athlete.coach_id == coach_id, assignment.scheduled_date.between(today, last_day))
+        .order_by(assignment.scheduled_date, assignment.id)
+    )
+    return groups, memberships, athletes, assignments
+
+
+async def load_bootstrap(coach: identity_models.Coach) -> dict[str, Any]:
+    """The coach's profile, groups, memberships, athletes, near-term assignments and counts."""
+    today = datetime.now(UTC).date()
+    last_day = today + timedelta(days=UPCOMING_DAYS)
+    groups, memberships, athletes, assignments = await asyncio.gather(
+        *(_read(query) for query in _queries(coach.id, today, last_day))
+    )
+    metrics.increment("coach_bootstrap.loaded")
+
+    todays = [a for a in assignments if a["scheduled_date"] == today]
+    grouped = {m["athlete_id"] for m in memberships}
+    return {
+        "coach": {"id": coach.id, "email": coach.email, "full_name": coach.full_name, "created_at": coach.created_at},
+        "groups": groups,
+        "memberships": memberships,
+        "athletes": athletes,
+        "assignments_today": todays,
+        "assignments_upcoming": [a for a in assignments if a["scheduled_date"] > today],
+        "counts": {
+            "groups": len(groups),
+            "athletes": len(athletes),
+            "athletes_without_group": sum(a["id"] not in grouped for a in athletes),
+            "assignments_today": len(todays),
+            "assignments_today_pending": sum(a["status"] == WorkoutStatus.PENDING for a in todays),
+            "assignments_today_completed": sum(a["status"] == WorkoutStatus.COMPLETED for a in todays),
+            "assignments_upcoming": len(assignments) - len(todays),
+        },
+        "upcoming_until": last_day,
+    }
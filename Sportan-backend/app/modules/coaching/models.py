@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import DateTime, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import UTC_NOW_SERVER_DEFAULT, UUID_SERVER_DEFAULT, Base
 
 if TYPE_CHECKING:
     from app.modules.identity.models import Athlete, Coach
@@ -14,11 +14,11 @@ if TYPE_CHECKING:
 class Group(Base):
     __tablename__ = "groups"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
     coach_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("coaches.id"), nullable=False)
     name: Mapped[str] = mapped_column(String)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
 
     # Relationships
     coach: Mapped["Coach"] = relationship("app.modules.identity.models.Coach", back_populates="groups")
@@ -30,7 +30,7 @@ class GroupAthlete(Base):
 
     group_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("groups.id"), primary_key=True)
     athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id"), primary_key=True)
-    joined_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    joined_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
 
     # Relationships
     group: Mapped["Group"] = relationship(back_populates="group_athletes")
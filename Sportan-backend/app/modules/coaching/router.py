@@ -1,10 +1,12 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.responses import revalidated, trusted
+from app.modules.coaching import bootstrap as coaching_bootstrap
 from app.modules.coaching import schemas as coaching_schemas
 from app.modules.coaching import service as coaching_service
 from app.modules.identity import models as identity_models
@@ -19,6 +21,14 @@ CoachDep = Annotated[identity_models.Coach, Depends(identity_service.get_current
 DbDep = Annotated[AsyncSession, Depends(get_db)]
 
 
+@router.get("/bootstrap", response_model=coaching_schemas.CoachBootstrap)
+async def get_bootstrap(request: Request, coach: CoachDep, db: DbDep):
+    """Launch data in one response; send the ETag back in If-None-Match to get a 304 when nothing changed."""
+    # The request session only resolved the coach; the reads use short sessions of their own
+    await db.close()
+    return revalidated(request, await coaching_bootstrap.load_bootstrap(coach))
+
+
 # --- Groups ---
 @router.post("/groups", response_model=coaching_schemas.GroupRead)
 async def create_group(data: coaching_schemas.GroupCreate, coach: CoachDep, db: DbDep):
@@ -27,7 +37,7 @@ async def create_group(data: coaching_schemas.GroupCreate, coach: CoachDep, db:
 
 @router.get("/groups", response_model=list[coaching_schemas.GroupRead])
 async def get_groups(coach: CoachDep, db: DbDep):
-    return await coaching_service.get_coach_groups(db, coach.id)
+    return trusted(await coaching_service.get_coach_groups(db, coach.id))
 
 
 @router.get("/groups/{group_id}", response_model=coaching_schemas.GroupRead)
@@ -48,7 +58,7 @@ async def delete_group(group_id: UUID, coach: CoachDep, db: DbDep):
 # --- Membership ---
 @router.get("/groups/{group_id}/athletes", response_model=list[identity_schemas.AthleteRead])
 async def get_group_athletes(group_id: UUID, coach: CoachDep, db: DbDep):
-    return await coaching_service.get_group_athletes(db, group_id, coach.id)
+    return trusted(await coaching_service.get_group_athletes(db, group_id, coach.id))
 
 
 @router.post("/groups/{group_id}/athletes", response_model=identity_schemas.AthleteRead)
@@ -68,6 +78,18 @@ async def remove_athlete(group_id: UUID, athlete_id: UUID, coach: CoachDep, db:
 
 
 # --- Athletes (Coach View) ---
+# Registered before /athletes/{athlete_id}, which would otherwise capture "search"
+@router.get("/athletes/search", response_model=list[coaching_schemas.AthleteSearchHit])
+async def search_athletes(
+    coach: CoachDep,
+    db: DbDep,
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    k: Annotated[int, Query(ge=1, le=50)] = 10,
+):
+    """Typeahead: the coach's athletes whose name or parent's name or email match `q`, best match first."""
+    return trusted(await coaching_service.search_athletes(db, coach.id, q, k))
+
+
 @router.get("/athletes/{athlete_id}", response_model=identity_schemas.AthleteRead)
 async def get_athlete(athlete_id: UUID, coach: CoachDep, db: DbDep):
     return await coaching_service.get_athlete(db, athlete_id, coach.id)
@@ -75,9 +97,7 @@ async def get_athlete(athlete_id: UUID, coach: CoachDep, db: DbDep):
 
 @router.get("/athletes/{athlete_id}/summary", response_model=training_schemas.AthleteSummary)
 async def get_athlete_summary(athlete_id: UUID, coach: CoachDep, db: DbDep):
-    # Verify ownership
-    await coaching_service.get_athlete(db, athlete_id, coach.id)
-    return await training_service.get_athlete_summary(db, athlete_id)
+    return trusted(await training_service.get_athlete_summary(db, athlete_id, coach.id))
 
 
 @router.put("/athletes/{athlete_id}", response_model=identity_schemas.AthleteRead)
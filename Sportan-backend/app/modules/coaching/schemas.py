@@ -3,6 +3,9 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr
 
+from app.modules.identity.schemas import AthleteRead, CoachRead
+from app.modules.training.schemas import AssignedWorkoutRead
+
 
 # --- Group Schemas ---
 class GroupBase(BaseModel):
@@ -40,6 +43,16 @@ class AthleteUpdate(BaseModel):
     notes: str | None = None
 
 
+class AthleteSearchHit(BaseModel):
+    id: UUID
+    full_name: str
+    dob: date | None
+    parent_name: str | None
+    parent_email: str | None
+    # pg_trgm word similarity of the query to the best matching field, 0-1
+    score: float
+
+
 # --- Parent Management Schemas ---
 class ParentCreate(BaseModel):
     full_name: str
@@ -51,3 +64,32 @@ class ParentUpdate(BaseModel):
     full_name: str | None = None
     email: EmailStr | None = None
     phone: str | None = None
+
+
+# --- Bootstrap ---
+class GroupMembership(BaseModel):
+    group_id: UUID
+    athlete_id: UUID
+
+
+class BootstrapCounts(BaseModel):
+    groups: int
+    athletes: int
+    athletes_without_group: int
+    assignments_today: int
+    assignments_today_pending: int
+    assignments_today_completed: int
+    assignments_upcoming: int
+
+
+class CoachBootstrap(BaseModel):
+    coach: CoachRead
+    groups: list[GroupRead]
+    memberships: list[GroupMembership]
+    # Every athlete of the coach once, including those in no group
+    athletes: list[AthleteRead]
+    assignments_today: list[AssignedWorkoutRead]
+    # After today, up to and including `upcoming_until`
+    assignments_upcoming: list[AssignedWorkoutRead]
+    counts: BootstrapCounts
+    upcoming_until: date
@@ -0,0 +1,84 @@
+"""
+Coach ownership scoping for single-statement queries.
+
+Instead of loading the athlete or group first just to prove that the coach owns it,
+these helpers anchor the real query on the owned row and outer-join the data onto it.
+No rows back means "not found or not yours"; an anchor row with NULL joined columns
+means the resource exists but has nothing attached.
+"""
+
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import ClauseElement, ColumnElement, Row, Select, literal, select
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.coaching import models as coaching_models
+from app.modules.identity import models as identity_models
+
+
+def owned_athlete(athlete_id: uuid.UUID, coach_id: uuid.UUID) -> Select:
+    """Anchor a select on one athlete belonging to the coach. Add columns and outer joins onto it."""
+    return select(identity_models.Athlete.id.label("scope_id")).where(
+        identity_models.Athlete.id == athlete_id, identity_models.Athlete.coach_id == coach_id
+    )
+
+
+def owned_group(group_id: uuid.UUID, coach_id: uuid.UUID) -> Select:
+    """Anchor a select on one group belonging to the coach. Add columns and outer joins onto it."""
+    return select(coaching_models.Group.id.label("scope_id")).where(
+        coaching_models.Group.id == group_id, coaching_models.Group.coach_id == coach_id
+    )
+
+
+def owned_athlete_ids(coach_id: uuid.UUID) -> Select:
+    """Subquery of athlete ids belonging to the coach, for `column.in_(...)` predicates."""
+    return select(identity_models.Athlete.id).where(identity_models.Athlete.coach_id == coach_id)
+
+
+def join_owning_athlete(stmt: Select, athlete_id_column: ColumnElement[Any], coach_id: uuid.UUID) -> Select:
+    """Restrict a select over athlete-owned rows (workouts, assignments, reports) to one coach."""
+    return stmt.join(identity_models.Athlete, identity_models.Athlete.id == athlete_id_column).where(
+        identity_models.Athlete.coach_id == coach_id
+    )
+
+
+def insert_if_owned(model: type, anchor: Select, values: dict[str, Any]) -> Insert:
+    """
+    INSERT ... SELECT the values only when the anchor row exists, RETURNING the new entity.
+    Ownership check and write are a single statement; no row back means the anchor was not found
+    (or, with an ON CONFLICT clause added by the caller, that the row conflicted).
+    Values may be SQL expressions, such as the database clock.
+    """
+    table = model.__table__
+    columns = list(values)
+    source = anchor.with_only_columns(
+        *(
+            values[name] if isinstance(values[name], ClauseElement) else literal(values[name], table.c[name].type)
+            for name in columns
+        ),
+        maintain_column_froms=True,
+    )
+    return insert(model).from_select(columns, source).returning(model)
+
+
+async def fetch_scoped(db: AsyncSession, stmt: Select, detail: str) -> Sequence[Row]:
+    """Execute an anchored select, raising 404 when the anchor row is missing or owned by someone else."""
+    result = await db.execute(stmt)
+    rows = result.all()
+    if not rows:
+        raise HTTPException(status_code=404, detail=detail)
+    return rows
+
+
+def joined(rows: Sequence[Row], index: int = 1) -> list[Any]:
+    """Pick the outer-joined entity out of anchored rows, dropping the NULL row of an empty join."""
+    return [row[index] for row in rows if row[index] is not None]
+
+
+def joined_columns(rows: Sequence[Row]) -> list[Row]:
+    """Keep anchored rows whose outer-joined columns matched, dropping the all-NULL row of an empty join."""
+    return [row for row in rows if any(value is not None for value in row[1:])]
@@ -1,14 +1,18 @@
 import uuid
+from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import delete, func, select
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from supabase_auth.errors import AuthApiError
 
+from app.core import projection
 from app.core.supabase import get_supabase_admin_client
 from app.modules.coaching import models as coaching_models
 from app.modules.coaching import schemas as coaching_schemas
+from app.modules.coaching import scoping
 from app.modules.identity import models as identity_models
+from app.modules.identity import schemas as identity_schemas
 
 # --- Group Operations ---
 
@@ -16,16 +20,21 @@ from app.modules.identity import models as identity_models
 async def create_group(
     db: AsyncSession, coach_id: uuid.UUID, group_data: coaching_schemas.GroupCreate
 ) -> coaching_models.Group:
-    group = coaching_models.Group(coach_id=coach_id, name=group_data.name, description=group_data.description)
-    db.add(group)
+    result = await db.execute(
+        insert(coaching_models.Group)
+        .values(coach_id=coach_id, name=group_data.name, description=group_data.description)
+        .returning(coaching_models.Group)
+    )
+    group = result.scalar_one()
     await db.commit()
-    await db.refresh(group)
     return group
 
 
-async def get_coach_groups(db: AsyncSession, coach_id: uuid.UUID) -> list[coaching_models.Group]:
-    result = await db.execute(select(coaching_models.Group).where(coaching_models.Group.coach_id == coach_id))
-    return list(result.scalars().all())
+async def get_coach_groups(db: AsyncSession, coach_id: uuid.UUID) -> list[dict[str, Any]]:
+    query = select(*projection.columns_for(coaching_models.Group, coaching_schemas.GroupRead)).where(
+        coaching_models.Group.coach_id == coach_id
+    )
+    return await projection.fetch_dicts(db, query)
 
 
 async def get_group_by_id(db: AsyncSession, group_id: uuid.UUID, coach_id: uuid.UUID) -> coaching_models.Group:
@@ -43,15 +52,22 @@ async def get_group_by_id(db: AsyncSession, group_id: uuid.UUID, coach_id: uuid.
 async def update_group(
     db: AsyncSession, group_id: uuid.UUID, coach_id: uuid.UUID, group_data: coaching_schemas.GroupUpdate
 ) -> coaching_models.Group:
-    group = await get_group_by_id(db, group_id, coach_id)
+    changes = group_data.model_dump(exclude_none=True)
+    if not changes:
+        return await get_group_by_id(db, group_id, coach_id)
 
-    if group_data.name is not None:
-        group.name = group_data.name
-    if group_data.description is not None:
-        group.description = group_data.description
+    # Ownership check, update and reload in one UPDATE ... RETURNING
+    result = await db.execute(
+        update(coaching_models.Group)
+        .where(coaching_models.Group.id == group_id, coaching_models.Group.coach_id == coach_id)
+        .values(**changes)
+        .returning(coaching_models.Group)
+    )
+    group = result.scalars().first()
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
 
     await db.commit()
-    await db.refresh(group)
     return group
 
 
@@ -96,43 +112,43 @@ async def delete_group(db: AsyncSession, group_id: uuid.UUID, coach_id: uuid.UUI
 # --- Membership Operations ---
 
 
-async def get_group_athletes(
-    db: AsyncSession, group_id: uuid.UUID, coach_id: uuid.UUID
-) -> list[identity_models.Athlete]:
-    await get_group_by_id(db, group_id, coach_id)
-
-    # Fetch athletes joined with this group
-    # Using GroupAthlete association
+async def get_group_athletes(db: AsyncSession, group_id: uuid.UUID, coach_id: uuid.UUID) -> list[dict[str, Any]]:
+    # Ownership check and roster in one statement, anchored on the coach's group
     query = (
-        select(identity_models.Athlete)
-        .join(coaching_models.GroupAthlete, identity_models.Athlete.id == coaching_models.GroupAthlete.athlete_id)
-        .where(coaching_models.GroupAthlete.group_id == group_id)
+        scoping.owned_group(group_id, coach_id)
+        .add_columns(*projection.columns_for(identity_models.Athlete, identity_schemas.AthleteRead))
+        .outerjoin(coaching_models.GroupAthlete, coaching_models.GroupAthlete.group_id == coaching_models.Group.id)
+        .outerjoin(identity_models.Athlete, identity_models.Athlete.id == coaching_models.GroupAthlete.athlete_id)
     )
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    rows = await scoping.fetch_scoped(db, query, "Group not found")
+    return projection.as_dicts(scoping.joined_columns(rows), skip=1)
 
 
 async def add_athlete_to_group(db: AsyncSession, group_id: uuid.UUID, athlete_id: uuid.UUID, coach_id: uuid.UUID):
-    # Verify group ownership
-    await get_group_by_id(db, group_id, coach_id)
-
-    # Verify athlete ownership (must belong to same coach)
-    athlete_res = await db.execute(
-        select(identity_models.Athlete).where(
-            identity_models.Athlete.id == athlete_id, identity_models.Athlete.coach_id == coach_id
+    # Group ownership, athlete ownership (must belong to same coach) and existing membership in one statement
+    query = (
+        scoping.owned_group(group_id, coach_id)
+        .add_columns(identity_models.Athlete.id, coaching_models.GroupAthlete.athlete_id)
+        .outerjoin_from(
+            coaching_models.Group,
+            identity_models.Athlete,
+            and_(identity_models.Athlete.id == athlete_id, identity_models.Athlete.coach_id == coach_id),
         )
-    )
-    athlete = athlete_res.scalars().first()
-    if not athlete:
-        raise HTTPException(status_code=404, detail="Athlete not found or does not belong to you")
-
-    # Check if already in group
-    exists_res = await db.execute(
-        select(coaching_models.GroupAthlete).where(
-            coaching_models.GroupAthlete.group_id == group_id, coaching_models.GroupAthlete.athlete_id == athlete_id
+        .outerjoin_from(
+            coaching_models.Group,
+            coaching_models.GroupAthlete,
+            and_(
+                coaching_models.GroupAthlete.group_id == coaching_models.Group.id,
+                coaching_models.GroupAthlete.athlete_id == athlete_id,
+            ),
         )
     )
-    if exists_res.scalars().first():
+    rows = await scoping.fetch_scoped(db, query, "Group not found")
+    _, owned_athlete_id, member_id = rows[0]
+
+    if owned_athlete_id is None:
+        raise HTTPException(status_code=404, detail="Athlete not found or does not belong to you")
+    if member_id is not None:
         raise HTTPException(status_code=400, detail="Athlete already in this group")
 
     # Add
@@ -142,27 +158,31 @@ async def add_athlete_to_group(db: AsyncSession, group_id: uuid.UUID, athlete_id
 
 
 async def remove_athlete_from_group(db: AsyncSession, group_id: uuid.UUID, athlete_id: uuid.UUID, coach_id: uuid.UUID):
-    await get_group_by_id(db, group_id, coach_id)
-
-    # Check membership
-    membership_res = await db.execute(
-        select(coaching_models.GroupAthlete).where(
-            coaching_models.GroupAthlete.group_id == group_id, coaching_models.GroupAthlete.athlete_id == athlete_id
+    # Count how many groups this athlete is in (floating athlete rule)
+    group_count = (
+        select(func.count(coaching_models.GroupAthlete.group_id))
+        .where(coaching_models.GroupAthlete.athlete_id == athlete_id)
+        .correlate(None)
+        .scalar_subquery()
+    )
+    # Group ownership, membership and group count in one statement
+    query = (
+        scoping.owned_group(group_id, coach_id)
+        .add_columns(coaching_models.GroupAthlete, group_count)
+        .outerjoin(
+            coaching_models.GroupAthlete,
+            and_(
+                coaching_models.GroupAthlete.group_id == coaching_models.Group.id,
+                coaching_models.GroupAthlete.athlete_id == athlete_id,
+            ),
         )
     )
-    membership = membership_res.scalars().first()
+    rows = await scoping.fetch_scoped(db, query, "Group not found")
+    _, membership, count = rows[0]
+
     if not membership:
         raise HTTPException(status_code=404, detail="Athlete not in this group")
 
-    # Check floating athlete rule
-    # Count how many groups this athlete is in
-    count_res = await db.execute(
-        select(func.count(coaching_models.GroupAthlete.group_id)).where(
-            coaching_models.GroupAthlete.athlete_id == athlete_id
-        )
-    )
-    count = count_res.scalar()
-
     if count <= 1:
         raise HTTPException(
             status_code=400, detail="Cannot remove athlete from their last group. Delete the athlete profile instead."
@@ -178,20 +198,22 @@ async def remove_athlete_from_group(db: AsyncSession, group_id: uuid.UUID, athle
 async def create_athlete(
     db: AsyncSession, coach_id: uuid.UUID, group_id: uuid.UUID, data: coaching_schemas.AthleteCreate
 ) -> identity_models.Athlete:
-    # Verify group first
-    await get_group_by_id(db, group_id, coach_id)
-
-    # Create Athlete
-    athlete = identity_models.Athlete(coach_id=coach_id, full_name=data.full_name, dob=data.dob, notes=data.notes)
-    db.add(athlete)
-    await db.flush()  # get ID
+    # Create Athlete only if the coach owns the group
+    result = await db.execute(
+        scoping.insert_if_owned(
+            identity_models.Athlete,
+            scoping.owned_group(group_id, coach_id),
+            {"coach_id": coach_id, "full_name": data.full_name, "dob": data.dob, "notes": data.notes},
+        )
+    )
+    athlete = result.scalars().first()
+    if not athlete:
+        raise HTTPException(status_code=404, detail="Group not found")
 
     # Add to Group
-    membership = coaching_models.GroupAthlete(group_id=group_id, athlete_id=athlete.id)
-    db.add(membership)
+    await db.execute(insert(coaching_models.GroupAthlete).values(group_id=group_id, athlete_id=athlete.id))
 
     await db.commit()
-    await db.refresh(athlete)
     return athlete
 
 
@@ -210,17 +232,21 @@ async def get_athlete(db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UU
 async def update_athlete(
     db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID, data: coaching_schemas.AthleteUpdate
 ) -> identity_models.Athlete:
-    athlete = await get_athlete(db, athlete_id, coach_id)
+    changes = data.model_dump(exclude_none=True)
+    if not changes:
+        return await get_athlete(db, athlete_id, coach_id)
 
-    if data.full_name is not None:
-        athlete.full_name = data.full_name
-    if data.dob is not None:
-        athlete.dob = data.dob
-    if data.notes is not None:
-        athlete.notes = data.notes
+    result = await db.execute(
+        update(identity_models.Athlete)
+        .where(identity_models.Athlete.id == athlete_id, identity_models.Athlete.coach_id == coach_id)
+        .values(**changes)
+        .returning(identity_models.Athlete)
+    )
+    athlete = result.scalars().first()
+    if not athlete:
+        raise HTTPException(status_code=404, detail="Athlete not found")
 
     await db.commit()
-    await db.refresh(athlete)
     return athlete
 
 
@@ -231,6 +257,60 @@ async def delete_athlete(db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid
     await db.commit()
 
 
+def _contains_pattern(q: str) -> str:
+    """ILIKE pattern matching `q` anywhere, with LIKE wildcards in `q` escaped."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+async def search_athletes(db: AsyncSession, coach_id: uuid.UUID, q: str, k: int = 10) -> list[dict[str, Any]]:
+    """
+    Typeahead over the coach's athletes by athlete name, parent name or parent email, best match first.
+
+    A field matches when it contains `q` (ILIKE) or has a word close to it (pg_trgm `<%`, so "jonh"
+    finds "John"); the trigram GIN indexes serve both. Athletes and parents are matched in separate
+    branches so each can use its own index. An athlete's score is the best word similarity of `q`
+    to any of the three fields.
+    """
+    athlete, parent = identity_models.Athlete, identity_models.Parent
+    pattern = _contains_pattern(q)
+
+    def matches(column):
+        return or_(column.ilike(pattern, escape="\\"), literal(q).bool_op("<%")(column))
+
+    by_name = select(athlete.id.label("athlete_id"), func.word_similarity(q, athlete.full_name).label("score")).where(
+        athlete.coach_id == coach_id, matches(athlete.full_name)
+    )
+    by_parent = (
+        select(
+            parent.athlete_id,
+            func.greatest(func.word_similarity(q, parent.full_name), func.word_similarity(q, parent.email)).label(
+                "score"
+            ),
+        )
+        .join(athlete, athlete.id == parent.athlete_id)
+        .where(athlete.coach_id == coach_id, or_(matches(parent.full_name), matches(parent.email)))
+    )
+    found = union_all(by_name, by_parent).subquery()
+    best = select(found.c.athlete_id, func.max(found.c.score).label("score")).group_by(found.c.athlete_id).subquery()
+    query = (
+        select(
+            athlete.id,
+            athlete.full_name,
+            athlete.dob,
+            parent.full_name.label("parent_name"),
+            parent.email.label("parent_email"),
+            best.c.score,
+        )
+        .select_from(best)
+        .join(athlete, athlete.id == best.c.athlete_id)
+        .outerjoin(parent, parent.athlete_id == athlete.id)
+        .order_by(best.c.score.desc(), athlete.full_name, athlete.id)
+        .limit(k)
+    )
+    return await projection.fetch_dicts(db, query)
+
+
 # --- Parent Operations ---
 
 
@@ -268,18 +348,20 @@ async def create_parent(
         raise HTTPException(status_code=502, detail=f"Failed to create auth user: {str(e)}") from e
 
     # Create Parent Record
-    # Use auth_id as the ID to link them?
-    parent = identity_models.Parent(
-        id=auth_id,  # Force ID to match Supabase ID
-        athlete_id=data.athlete_id,
-        email=data.email,
-        full_name=data.full_name,
-    )
-
-    db.add(parent)
+    # Use auth_id as the ID to link them
     try:
+        result = await db.execute(
+            insert(identity_models.Parent)
+            .values(
+                id=auth_id,  # Force ID to match Supabase ID
+                athlete_id=data.athlete_id,
+                email=data.email,
+                full_name=data.full_name,
+            )
+            .returning(identity_models.Parent)
+        )
+        parent = result.scalar_one()
         await db.commit()
-        await db.refresh(parent)
     except Exception as e:
         # Rollback Supabase user?
         # supabase.auth.admin.delete_user(auth_user.id)
@@ -299,17 +381,21 @@ async def get_parent(db: AsyncSession, parent_id: uuid.UUID) -> identity_models.
 async def update_parent(
     db: AsyncSession, parent_id: uuid.UUID, data: coaching_schemas.ParentUpdate
 ) -> identity_models.Parent:
-    parent = await get_parent(db, parent_id)
+    changes = data.model_dump(exclude_none=True)
+    if not changes:
+        return await get_parent(db, parent_id)
 
-    if data.full_name is not None:
-        parent.full_name = data.full_name
-    if data.email is not None:
-        parent.email = data.email
-    if data.phone is not None:
-        parent.phone = data.phone
+    result = await db.execute(
+        update(identity_models.Parent)
+        .where(identity_models.Parent.id == parent_id)
+        .values(**changes)
+        .returning(identity_models.Parent)
+    )
+    parent = result.scalars().first()
+    if not parent:
+        raise HTTPException(status_code=404, detail="Parent not found")
 
     await db.commit()
-    await db.refresh(parent)
     return parent
 
 
@@ -330,8 +416,11 @@ async def delete_parent(db: AsyncSession, parent_id: uuid.UUID):
 async def get_athlete_parent(
     db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID
 ) -> identity_models.Parent | None:
-    # Verify athlete
-    await get_athlete(db, athlete_id, coach_id)
-
-    result = await db.execute(select(identity_models.Parent).where(identity_models.Parent.athlete_id == athlete_id))
-    return result.scalars().first()
+    # Verify athlete and fetch its parent in one statement
+    query = (
+        scoping.owned_athlete(athlete_id, coach_id)
+        .add_columns(identity_models.Parent)
+        .outerjoin(identity_models.Parent, identity_models.Parent.athlete_id == identity_models.Athlete.id)
+    )
+    rows = await scoping.fetch_scoped(db, query, "Athlete not found")
+    return rows[0][1]
@@ -2,10 +2,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Date, DateTime, ForeignKey, String
+from sqlalchemy import Date, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import UTC_NOW_SERVER_DEFAULT, UUID_SERVER_DEFAULT, Base, tsvector_of
 
 if TYPE_CHECKING:
     from app.modules.ai.models import TalentReport, WeeklyInsight
@@ -30,13 +31,25 @@ class Coach(Base):
 
 class Athlete(Base):
     __tablename__ = "athletes"
+    __table_args__ = (
+        Index("ix_athletes_search_vector", "search_vector", postgresql_using="gin"),
+        # Typeahead by name (pg_trgm; see coaching.service.search_athletes)
+        Index(
+            "ix_athletes_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    coach_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("coaches.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
+    coach_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("coaches.id"), nullable=False, index=True)
     full_name: Mapped[str] = mapped_column(String)
     dob: Mapped[Date | None] = mapped_column(Date, nullable=True)
     notes: Mapped[str | None] = mapped_column(String, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
+    # Full-text search (see search.service); deferred so loading the entity does not read it
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, tsvector_of(("notes", "B")), deferred=True)
 
     # Relationships
     coach: Mapped["Coach"] = relationship(back_populates="athletes")
@@ -62,13 +75,23 @@ class Athlete(Base):
 
 class Parent(Base):
     __tablename__ = "parents"
+    __table_args__ = (
+        # Typeahead by parent name or email (pg_trgm; see coaching.service.search_athletes)
+        Index(
+            "ix_parents_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+        Index("ix_parents_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
     athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id"), unique=True, nullable=False)
     email: Mapped[str] = mapped_column(String, unique=True, index=True)
     full_name: Mapped[str] = mapped_column(String)
     phone: Mapped[str | None] = mapped_column(String, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
 
     # Relationships
     athlete: Mapped["Athlete"] = relationship(back_populates="parent")
@@ -0,0 +1,28 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.modules.identity import models as identity_models
+from app.modules.identity import service as identity_service
+from app.modules.search import schemas as search_schemas
+from app.modules.search import service as search_service
+
+router = APIRouter(tags=["search"])
+
+CoachDep = Annotated[identity_models.Coach, Depends(identity_service.get_current_coach)]
+DbDep = Annotated[AsyncSession, Depends(get_db)]
+
+
+@router.get("/coach/search", response_model=search_schemas.SearchPage)
+async def search_coach_records(
+    coach: CoachDep,
+    db: DbDep,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    kind: Annotated[list[search_schemas.SearchKind] | None, Query()] = None,
+    offset: Annotated[int, Query(ge=0, le=1000)] = 0,
+    limit: Annotated[int, Query(ge=1, le=50)] = 20,
+):
+    """Workouts, athlete notes and AI reports matching `q`, best match first; repeat `kind` to narrow."""
+    return await search_service.search(db, coach.id, q, kind, offset, limit)
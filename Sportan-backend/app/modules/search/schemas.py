@@ -0,0 +1,37 @@
+from datetime import date
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchKind(str, Enum):
+    WORKOUT = "workout"
+    # The athlete's profile notes
+    ATHLETE = "athlete"
+    TALENT_REPORT = "talent_report"
+    WEEKLY_INSIGHT = "weekly_insight"
+    GROUP_INSIGHT = "group_insight"
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    # Id of the workout, athlete, report or group insight
+    id: UUID
+    # None for group insights
+    athlete_id: UUID | None
+    athlete_name: str | None
+    group_id: UUID | None
+    # Workout title or group name
+    title: str | None
+    # Workout date, or the day the athlete or report was created
+    date: date
+    rank: float
+    # HTML: fragments of the matched text, escaped, with the query words wrapped in <mark></mark>
+    highlight: str
+
+
+class SearchPage(BaseModel):
+    items: list[SearchHit]
+    # Pass as `offset` to get the next page; None on the last page
+    next_offset: int | None
@@ -0,0 +1,147 @@
+"""
+Full-text search across a coach's workouts, athlete notes and AI reports.
+
+Each searchable table has a stored generated `search_vector` (see core.database.tsvector_of)
+with a GIN index, so a match is an index lookup rather than a scan of the text. The query
+is parsed with `websearch_to_tsquery`: plain words must all match (stemmed, so "hamstrings"
+finds "hamstring"), "quoted phrases" match in order, `or` and a leading `-` work as on
+search engines.
+
+One statement searches every requested table. Each source is restricted to the coach's
+rows and ranked with `ts_rank_cd` (workout titles weigh more than notes). The union is
+sorted by rank, then newest first. `ts_headline` re-parses the text, so it runs on the
+rows of the requested page only, after the LIMIT. Its fragments are HTML-escaped, with the
+matched words in <mark></mark>: notes are user text and clients render the highlight as HTML.
+
+The best plan depends on the words: a rare word is found through the GIN index across all
+coaches, a common one by filtering the coach's own rows (through the athlete_id indexes).
+The statement is prepared once per connection, and after five runs PostgreSQL may switch to
+a generic plan that ignores the words, taking hundreds of milliseconds for a common word on
+a million workouts. The search transaction therefore plans every run for its own words
+(`plan_cache_mode`).
+
+Pages use OFFSET: every page ranks all the matches anyway, so a keyset cursor would not
+save that work.
+"""
+
+import html
+import uuid
+
+from sqlalchemy import Date, Select, String, Uuid, cast, func, literal, literal_column, null, select, text, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.database import SEARCH_CONFIG
+from app.core.projection import as_dicts
+from app.modules.ai import models as ai_models
+from app.modules.coaching import models as coaching_models
+from app.modules.identity import models as identity_models
+from app.modules.search import schemas as search_schemas
+from app.modules.search.schemas import SearchKind
+from app.modules.training import models as training_models
+
+CONFIG = literal_column(f"'{SEARCH_CONFIG}'", REGCONFIG)
+# ts_rank_cd normalization: divide by 1 + log(document length), so long reports do not outrank short notes
+RANK_NORMALIZATION = 1
+# ts_headline wraps matches in these private-use characters (stripped from the text first), so
+# the fragments can be HTML-escaped before they become <mark> tags
+MARK_START, MARK_STOP = "\ue000", "\ue001"
+HEADLINE_OPTIONS = f"StartSel={MARK_START}, StopSel={MARK_STOP}, MaxFragments=2, MaxWords=24, MinWords=8"
+# Typed NULLs for columns a source does not have; UNION cannot infer the type of a bare NULL
+NO_ID = cast(null(), Uuid)
+NO_TEXT = cast(null(), String)
+
+
+def _highlight(fragments: str) -> str:
+    """Headline fragments as HTML: the user's text escaped, the matched words in <mark></mark>."""
+    return html.escape(fragments).replace(MARK_START, "<mark>").replace(MARK_STOP, "</mark>")
+
+
+def _source(kind: SearchKind, query, coach_id: uuid.UUID) -> Select:
+    """The coach's matching rows of one kind, in the columns of a SearchHit plus the `document` text."""
+    athlete = identity_models.Athlete
+    match kind:
+        case SearchKind.WORKOUT:
+            model = training_models.Workout
+            columns = (athlete.id, athlete.full_name, NO_ID, model.title, model.date)
+            document = func.concat_ws(". ", model.title, model.notes)
+            base = select(model).join(athlete, athlete.id == model.athlete_id)
+            owned = athlete.coach_id == coach_id
+        case SearchKind.ATHLETE:
+            model = athlete
+            columns = (athlete.id, athlete.full_name, NO_ID, NO_TEXT, cast(athlete.created_at, Date))
+            document = func.coalesce(athlete.notes, "")
+            base = select(model)
+            owned = athlete.coach_id == coach_id
+        case SearchKind.TALENT_REPORT | SearchKind.WEEKLY_INSIGHT:
+            model = ai_models.TalentReport if kind == SearchKind.TALENT_REPORT else ai_models.WeeklyInsight
+            columns = (athlete.id, athlete.full_name, NO_ID, NO_TEXT, cast(model.created_at, Date))
+            document = model.report_text
+            base = select(model).join(athlete, athlete.id == model.athlete_id)
+            owned = athlete.coach_id == coach_id
+        case SearchKind.GROUP_INSIGHT:
+            model = ai_models.GroupInsight
+            group = coaching_models.Group
+            columns = (NO_ID, NO_TEXT, group.id, group.name, cast(model.created_at, Date))
+            document = model.report_text
+            base = select(model).join(group, group.id == model.group_id)
+            owned = group.coach_id == coach_id
+
+    athlete_id, athlete_name, group_id, title, day = columns
+    return base.with_only_columns(
+        literal(kind.value).label("kind"),
+        model.id.label("id"),
+        athlete_id.label("athlete_id"),
+        athlete_name.label("athlete_name"),
+        group_id.label("group_id"),
+        title.label("title"),
+        day.label("date"),
+        func.ts_rank_cd(model.search_vector, query, RANK_NORMALIZATION).label("rank"),
+        document.label("document"),
+        maintain_column_froms=True,
+    ).where(owned, model.search_vector.bool_op("@@")(query))
+
+
+async def search(
+    db: AsyncSession,
+    coach_id: uuid.UUID,
+    q: str,
+    kinds: list[SearchKind] | None = None,
+    offset: int = 0,
+    limit: int = 20,
+) -> search_schemas.SearchPage:
+    """A page of the coach's records matching `q`, best match first."""
+    await db.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+    query = func.websearch_to_tsquery(CONFIG, q)
+    sources = [_source(kind, query, coach_id) for kind in dict.fromkeys(kinds or SearchKind)]
+    page = (
+        union_all(*sources)
+        .order_by(literal_column("rank").desc(), literal_column("date").desc(), literal_column("id"))
+        .offset(offset)
+        .limit(limit + 1)
+        .subquery()
+    )
+    stmt = select(
+        page.c.kind,
+        page.c.id,
+        page.c.athlete_id,
+        page.c.athlete_name,
+        page.c.group_id,
+        page.c.title,
+        page.c.date,
+        page.c.rank,
+        func.ts_headline(
+            CONFIG, func.translate(page.c.document, MARK_START + MARK_STOP, ""), query, HEADLINE_OPTIONS
+        ).label("highlight"),
+    ).order_by(page.c.rank.desc(), page.c.date.desc(), page.c.id)
+    result = await db.execute(stmt)
+    hits = as_dicts(result.all())
+    for hit in hits:
+        hit["highlight"] = _highlight(hit["highlight"])
+    metrics.increment("search.queries")
+
+    next_offset = offset + limit if len(hits) > limit else None
+    return search_schemas.SearchPage(
+        items=[search_schemas.SearchHit(**hit) for hit in hits[:limit]], next_offset=next_offset
+    )
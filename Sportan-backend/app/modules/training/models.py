@@ -3,11 +3,12 @@ from datetime import date, datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import JSON, Date, DateTime, ForeignKey, String
+from sqlalchemy import JSON, Date, DateTime, ForeignKey, Index, String
 from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import UTC_NOW_SERVER_DEFAULT, UUID_SERVER_DEFAULT, Base, tsvector_of
 
 if TYPE_CHECKING:
     from app.modules.identity.models import Athlete
@@ -22,14 +23,14 @@ class WorkoutStatus(str, Enum):
 class AssignedWorkout(Base):
     __tablename__ = "assigned_workouts"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
     athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id"), nullable=False)
 
     scheduled_date: Mapped[date] = mapped_column(Date)
     title: Mapped[str] = mapped_column(String)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
-    status: Mapped[WorkoutStatus] = mapped_column(SQLEnum(WorkoutStatus), default=WorkoutStatus.PENDING)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    status: Mapped[WorkoutStatus] = mapped_column(SQLEnum(WorkoutStatus), server_default=WorkoutStatus.PENDING.name)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
 
     # Relationships
     athlete: Mapped["Athlete"] = relationship("app.modules.identity.models.Athlete", back_populates="assigned_workouts")
@@ -41,9 +42,10 @@ class AssignedWorkout(Base):
 
 class Workout(Base):
     __tablename__ = "workouts"
+    __table_args__ = (Index("ix_workouts_search_vector", "search_vector", postgresql_using="gin"),)
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=UUID_SERVER_DEFAULT)
+    athlete_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("athletes.id"), nullable=False, index=True)
     assigned_workout_id: Mapped[uuid.UUID | None] = mapped_column(
         ForeignKey("assigned_workouts.id"),
         nullable=True,
@@ -54,7 +56,9 @@ class Workout(Base):
     title: Mapped[str] = mapped_column(String)
     notes: Mapped[str | None] = mapped_column(String, nullable=True)
     metrics: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW_SERVER_DEFAULT)
+    # Full-text search (see search.service); deferred so loading the entity does not read it
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, tsvector_of(("title", "A"), ("notes", "B")), deferred=True)
 
     # Relationships
     athlete: Mapped["Athlete"] = relationship("app.modules.identity.models.Athlete", back_populates="workouts")
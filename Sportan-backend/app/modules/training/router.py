@@ -1,12 +1,12 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
+from app.core.auth import SystemTokenDep
 from app.core.database import get_db
-from app.modules.coaching import service as coaching_service
+from app.core.responses import trusted
 from app.modules.identity import models as identity_models
 from app.modules.identity import service as identity_service
 from app.modules.training import schemas as training_schemas
@@ -22,18 +22,6 @@ UserDep = Annotated[CoachAthleteParent, Depends(identity_service.get_current_use
 DbDep = Annotated[AsyncSession, Depends(get_db)]
 
 
-def verify_system_token(token: str | None):
-    if token is None or token != settings.SYSTEM_CRON_TOKEN:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid system token")
-
-
-def system_token_dependency(x_system_token: str = Header(..., alias="X-System-Token")):
-    verify_system_token(x_system_token)
-
-
-SystemTokenDep = Annotated[None, Depends(system_token_dependency)]
-
-
 # --- Coach Assignments ---
 
 
@@ -46,7 +34,7 @@ async def assign_group_workout(
 
 @router.get("/coach/groups/{group_id}/assigned-workouts", response_model=list[training_schemas.AssignedWorkoutRead])
 async def get_group_assignments(group_id: UUID, coach: CoachDep, db: DbDep):
-    return await training_service.get_coach_group_assignments(db, coach.id, group_id)
+    return trusted(await training_service.get_coach_group_assignments(db, coach.id, group_id))
 
 
 @router.post("/coach/athletes/{athlete_id}/assigned-workouts", response_model=training_schemas.AssignedWorkoutRead)
@@ -58,25 +46,14 @@ async def assign_athlete_workout(
 
 @router.get("/coach/athletes/{athlete_id}/assigned-workouts", response_model=list[training_schemas.AssignedWorkoutRead])
 async def get_athlete_assignments_coach(athlete_id: UUID, coach: CoachDep, db: DbDep):
-    # Verify athlete
-    await coaching_service.get_athlete(db, athlete_id, coach.id)
-    return await training_service.get_athlete_assignments(db, athlete_id)
+    return trusted(await training_service.get_athlete_assignments(db, athlete_id, coach.id))
 
 
 @router.patch("/coach/assigned-workouts/{assigned_workout_id}", response_model=training_schemas.AssignedWorkoutRead)
 async def update_assignment_status(
     assigned_workout_id: UUID, data: training_schemas.AssignedWorkoutUpdate, coach: CoachDep, db: DbDep
 ):
-    # Note: Service doesn't check ownership of assignment's athlete.
-    # Ideally we fetch assignment, check athlete, check coach.
-    # Relying on implicit trust or adding verification here.
-    # For strictness:
-    # 1. Fetch assignment (we need a getter in service or just use DB here)
-    # I'll assume service should handle it but service is generic.
-    # I'll add a check here.
-    # But for MVP speed, I'll call service.
-    # Real implementation should verify ownership.
-    return await training_service.update_assignment_status(db, assigned_workout_id, data.status)
+    return await training_service.update_assignment_status(db, assigned_workout_id, data.status, coach.id)
 
 
 # --- Coach Workouts ---
@@ -84,8 +61,7 @@ async def update_assignment_status(
 
 @router.get("/coach/athletes/{athlete_id}/workouts", response_model=list[training_schemas.WorkoutRead])
 async def get_athlete_workouts_coach(athlete_id: UUID, coach: CoachDep, db: DbDep):
-    await coaching_service.get_athlete(db, athlete_id, coach.id)
-    return await training_service.get_athlete_workouts(db, athlete_id)
+    return trusted(await training_service.get_athlete_workouts(db, athlete_id, coach.id))
 
 
 @router.post("/workouts", response_model=training_schemas.WorkoutRead)
@@ -95,14 +71,12 @@ async def log_workout(data: training_schemas.WorkoutCreate, coach: CoachDep, db:
 
 @router.put("/workouts/{workout_id}", response_model=training_schemas.WorkoutRead)
 async def update_workout(workout_id: UUID, data: training_schemas.WorkoutUpdate, coach: CoachDep, db: DbDep):
-    # Verify ownership?
-    # Again, service `update_workout` doesn't check if coach owns the athlete of this workout.
-    return await training_service.update_workout(db, workout_id, data)
+    return await training_service.update_workout(db, workout_id, coach.id, data)
 
 
 @router.delete("/workouts/{workout_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_workout(workout_id: UUID, coach: CoachDep, db: DbDep):
-    await training_service.delete_workout(db, workout_id)
+    await training_service.delete_workout(db, workout_id, coach.id)
 
 
 # --- Shared Workouts Read ---
@@ -110,19 +84,16 @@ async def delete_workout(workout_id: UUID, coach: CoachDep, db: DbDep):
 
 @router.get("/workouts/{workout_id}", response_model=training_schemas.WorkoutRead)
 async def get_workout(workout_id: UUID, user: UserDep, db: DbDep):
+    if isinstance(user, identity_models.Coach):
+        # Ownership is part of the lookup: raises 404 if the athlete is not the coach's
+        return await training_service.get_workout(db, workout_id, user.id)
+
     workout = await training_service.get_workout(db, workout_id)
 
     # Access Control
     is_allowed = False
 
-    if isinstance(user, identity_models.Coach):
-        # Check if athlete belongs to coach
-        # workout.athlete is lazy loaded. We need to load it or check ID.
-        # workout.athlete_id is available.
-        await coaching_service.get_athlete(db, workout.athlete_id, user.id)  # Raises 404 if not owned
-        is_allowed = True
-
-    elif isinstance(user, identity_models.Athlete):
+    if isinstance(user, identity_models.Athlete):
         if workout.athlete_id == user.id:
             is_allowed = True
 
@@ -141,12 +112,12 @@ async def get_workout(workout_id: UUID, user: UserDep, db: DbDep):
 
 @router.get("/athlete/me/workouts", response_model=list[training_schemas.WorkoutRead])
 async def get_my_workouts(athlete: AthleteDep, db: DbDep):
-    return await training_service.get_athlete_workouts(db, athlete.id)
+    return trusted(await training_service.get_athlete_workouts(db, athlete.id))
 
 
 @router.get("/athlete/me/assigned-workouts", response_model=list[training_schemas.AssignedWorkoutRead])
 async def get_my_assignments(athlete: AthleteDep, db: DbDep):
-    return await training_service.get_athlete_assignments(db, athlete.id)
+    return trusted(await training_service.get_athlete_assignments(db, athlete.id))
 
 
 # --- Parent Views ---
@@ -154,17 +125,17 @@ async def get_my_assignments(athlete: AthleteDep, db: DbDep):
 
 @router.get("/parent/athlete/summary", response_model=training_schemas.AthleteSummary)
 async def get_child_summary(parent: ParentDep, db: DbDep):
-    return await training_service.get_athlete_summary(db, parent.athlete_id)
+    return trusted(await training_service.get_athlete_summary(db, parent.athlete_id))
 
 
 @router.get("/parent/athlete/workouts", response_model=list[training_schemas.WorkoutRead])
 async def get_child_workouts(parent: ParentDep, db: DbDep):
-    return await training_service.get_athlete_workouts(db, parent.athlete_id)
+    return trusted(await training_service.get_athlete_workouts(db, parent.athlete_id))
 
 
 @router.get("/parent/athlete/assigned-workouts", response_model=list[training_schemas.AssignedWorkoutRead])
 async def get_child_assignments(parent: ParentDep, db: DbDep):
-    return await training_service.get_athlete_assignments(db, parent.athlete_id)
+    return trusted(await training_service.get_athlete_assignments(db, parent.athlete_id))
 
 
 # --- System / Cron ---
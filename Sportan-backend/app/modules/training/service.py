@@ -1,36 +1,52 @@
 import uuid
 from datetime import datetime, timedelta
+from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import projection
+from app.modules.ai import summaries as ai_summaries
+from app.modules.analytics import service as analytics_service
 from app.modules.coaching import models as coaching_models
+from app.modules.coaching import scoping
 from app.modules.coaching import service as coaching_service
 from app.modules.identity import models as identity_models
 from app.modules.training import models as training_models
 from app.modules.training import schemas as training_schemas
 
+# Columns the list endpoints serialize, selected as plain rows instead of ORM entities
+ASSIGNMENT_READ_COLUMNS = projection.columns_for(training_models.AssignedWorkout, training_schemas.AssignedWorkoutRead)
+WORKOUT_READ_COLUMNS = projection.columns_for(training_models.Workout, training_schemas.WorkoutRead)
+
 # --- Assignments ---
 
 
 async def create_assignment_for_group(
     db: AsyncSession, coach_id: uuid.UUID, group_id: uuid.UUID, data: training_schemas.AssignedWorkoutCreate
 ) -> list[training_models.AssignedWorkout]:
-    # Get athletes in group
-    athletes = await coaching_service.get_group_athletes(db, group_id, coach_id)
-
-    assignments = []
-    for athlete in athletes:
-        assignment = training_models.AssignedWorkout(
-            athlete_id=athlete.id,
-            scheduled_date=data.scheduled_date,
-            title=data.title,
-            description=data.description,
-            status=training_models.WorkoutStatus.PENDING,
+    # One INSERT ... SELECT over the coach's group roster, RETURNING every new assignment
+    roster = (
+        select(
+            coaching_models.GroupAthlete.athlete_id,
+            literal(data.scheduled_date, training_models.AssignedWorkout.scheduled_date.type),
+            literal(data.title, training_models.AssignedWorkout.title.type),
+            literal(data.description, training_models.AssignedWorkout.description.type),
         )
-        db.add(assignment)
-        assignments.append(assignment)
+        .join(coaching_models.Group, coaching_models.Group.id == coaching_models.GroupAthlete.group_id)
+        .where(coaching_models.Group.id == group_id, coaching_models.Group.coach_id == coach_id)
+    )
+    result = await db.execute(
+        insert(training_models.AssignedWorkout)
+        .from_select(["athlete_id", "scheduled_date", "title", "description"], roster)
+        .returning(training_models.AssignedWorkout)
+    )
+    assignments = list(result.scalars().all())
+
+    if not assignments:
+        # Empty roster or someone else's group; only this rare path pays for the distinction
+        await coaching_service.get_group_by_id(db, group_id, coach_id)
 
     await db.commit()
     return assignments
@@ -39,63 +55,84 @@ async def create_assignment_for_group(
 async def create_assignment_for_athlete(
     db: AsyncSession, coach_id: uuid.UUID, athlete_id: uuid.UUID, data: training_schemas.AssignedWorkoutCreate
 ) -> training_models.AssignedWorkout:
-    # Verify athlete belongs to coach
-    # coaching_service.get_athlete checks ownership
-    await coaching_service.get_athlete(db, athlete_id, coach_id)
-
-    assignment = training_models.AssignedWorkout(
-        athlete_id=athlete_id,
-        scheduled_date=data.scheduled_date,
-        title=data.title,
-        description=data.description,
-        status=training_models.WorkoutStatus.PENDING,
+    # Insert only if the athlete belongs to the coach
+    result = await db.execute(
+        scoping.insert_if_owned(
+            training_models.AssignedWorkout,
+            scoping.owned_athlete(athlete_id, coach_id),
+            {
+                "athlete_id": athlete_id,
+                "scheduled_date": data.scheduled_date,
+                "title": data.title,
+                "description": data.description,
+            },
+        )
     )
-    db.add(assignment)
+    assignment = result.scalars().first()
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Athlete not found")
+
     await db.commit()
-    await db.refresh(assignment)
     return assignment
 
 
 async def update_assignment_status(
-    db: AsyncSession, assigned_workout_id: uuid.UUID, status_enum: training_models.WorkoutStatus
+    db: AsyncSession,
+    assigned_workout_id: uuid.UUID,
+    status_enum: training_models.WorkoutStatus,
+    coach_id: uuid.UUID,
 ) -> training_models.AssignedWorkout:
     result = await db.execute(
-        select(training_models.AssignedWorkout).where(training_models.AssignedWorkout.id == assigned_workout_id)
+        update(training_models.AssignedWorkout)
+        .where(
+            training_models.AssignedWorkout.id == assigned_workout_id,
+            training_models.AssignedWorkout.athlete_id.in_(scoping.owned_athlete_ids(coach_id)),
+        )
+        .values(status=status_enum)
+        .returning(training_models.AssignedWorkout)
     )
     assignment = result.scalars().first()
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
 
-    assignment.status = status_enum
     await db.commit()
-    await db.refresh(assignment)
     return assignment
 
 
 async def get_coach_group_assignments(
     db: AsyncSession, coach_id: uuid.UUID, group_id: uuid.UUID
-) -> list[training_models.AssignedWorkout]:
-    # Verify group
-    await coaching_service.get_group_by_id(db, group_id, coach_id)
-
-    # Get athletes
-    # We need to query Assignments where athlete is in group
-    # Join GroupAthlete
+) -> list[dict[str, Any]]:
+    # Verify group and query Assignments where athlete is in group, in one statement
     query = (
-        select(training_models.AssignedWorkout)
-        .join(identity_models.Athlete, training_models.AssignedWorkout.athlete_id == identity_models.Athlete.id)
-        .join(coaching_models.GroupAthlete, identity_models.Athlete.id == coaching_models.GroupAthlete.athlete_id)
-        .where(coaching_models.GroupAthlete.group_id == group_id)
+        scoping.owned_group(group_id, coach_id)
+        .add_columns(*ASSIGNMENT_READ_COLUMNS)
+        .outerjoin(coaching_models.GroupAthlete, coaching_models.GroupAthlete.group_id == coaching_models.Group.id)
+        .outerjoin(
+            training_models.AssignedWorkout,
+            training_models.AssignedWorkout.athlete_id == coaching_models.GroupAthlete.athlete_id,
+        )
     )
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    rows = await scoping.fetch_scoped(db, query, "Group not found")
+    return projection.as_dicts(scoping.joined_columns(rows), skip=1)
+
+
+async def get_athlete_assignments(
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID | None = None
+) -> list[dict[str, Any]]:
+    if coach_id is not None:
+        query = (
+            scoping.owned_athlete(athlete_id, coach_id)
+            .add_columns(*ASSIGNMENT_READ_COLUMNS)
+            .outerjoin(
+                training_models.AssignedWorkout,
+                training_models.AssignedWorkout.athlete_id == identity_models.Athlete.id,
+            )
+        )
+        rows = await scoping.fetch_scoped(db, query, "Athlete not found")
+        return projection.as_dicts(scoping.joined_columns(rows), skip=1)
 
-
-async def get_athlete_assignments(db: AsyncSession, athlete_id: uuid.UUID) -> list[training_models.AssignedWorkout]:
-    result = await db.execute(
-        select(training_models.AssignedWorkout).where(training_models.AssignedWorkout.athlete_id == athlete_id)
-    )
-    return list(result.scalars().all())
+    query = select(*ASSIGNMENT_READ_COLUMNS).where(training_models.AssignedWorkout.athlete_id == athlete_id)
+    return await projection.fetch_dicts(db, query)
 
 
 # --- Workouts ---
@@ -104,41 +141,58 @@ async def get_athlete_assignments(db: AsyncSession, athlete_id: uuid.UUID) -> li
 async def log_workout(
     db: AsyncSession, coach_id: uuid.UUID, data: training_schemas.WorkoutCreate
 ) -> training_models.Workout:
-    # Verify athlete
-    await coaching_service.get_athlete(db, data.athlete_id, coach_id)
-
-    workout = training_models.Workout(
-        athlete_id=data.athlete_id,
-        assigned_workout_id=data.assigned_workout_id,
-        date=data.date,
-        title=data.title,
-        notes=data.notes,
-        metrics=data.metrics,
+    # Insert only if the athlete belongs to the coach, and the linked assignment (if any) to the athlete
+    anchor = scoping.owned_athlete(data.athlete_id, coach_id)
+    if data.assigned_workout_id:
+        anchor = anchor.where(
+            select(training_models.AssignedWorkout.id)
+            .where(
+                training_models.AssignedWorkout.id == data.assigned_workout_id,
+                training_models.AssignedWorkout.athlete_id == data.athlete_id,
+            )
+            .exists()
+        )
+    result = await db.execute(
+        scoping.insert_if_owned(
+            training_models.Workout,
+            anchor,
+            {
+                "athlete_id": data.athlete_id,
+                "assigned_workout_id": data.assigned_workout_id,
+                "date": data.date,
+                "title": data.title,
+                "notes": data.notes,
+                "metrics": data.metrics,
+            },
+        )
     )
-
-    db.add(workout)
+    workout = result.scalars().first()
+    if not workout:
+        # Someone else's athlete (404), or an assignment that is missing or not this athlete's (400);
+        # only this rare path pays for the distinction
+        await coaching_service.get_athlete(db, data.athlete_id, coach_id)
+        raise HTTPException(status_code=400, detail="Assignment does not belong to this athlete")
 
     # If linked to assignment, update status
     if data.assigned_workout_id:
-        result = await db.execute(
-            select(training_models.AssignedWorkout).where(
-                training_models.AssignedWorkout.id == data.assigned_workout_id
-            )
+        await db.execute(
+            update(training_models.AssignedWorkout)
+            .where(training_models.AssignedWorkout.id == data.assigned_workout_id)
+            .values(status=training_models.WorkoutStatus.COMPLETED)
         )
-        assignment = result.scalars().first()
-        if assignment:
-            if assignment.athlete_id != data.athlete_id:
-                raise HTTPException(status_code=400, detail="Assignment does not belong to this athlete")
-            assignment.status = training_models.WorkoutStatus.COMPLETED
-            db.add(assignment)  # Ensure update
 
     await db.commit()
-    await db.refresh(workout)
     return workout
 
 
-async def get_workout(db: AsyncSession, workout_id: uuid.UUID) -> training_models.Workout:
-    result = await db.execute(select(training_models.Workout).where(training_models.Workout.id == workout_id))
+async def get_workout(
+    db: AsyncSession, workout_id: uuid.UUID, coach_id: uuid.UUID | None = None
+) -> training_models.Workout:
+    query = select(training_models.Workout).where(training_models.Workout.id == workout_id)
+    if coach_id is not None:
+        # Not found and not owned are the same answer for coaches
+        query = scoping.join_owning_athlete(query, training_models.Workout.athlete_id, coach_id)
+    result = await db.execute(query)
     workout = result.scalars().first()
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
@@ -146,26 +200,35 @@ async def get_workout(db: AsyncSession, workout_id: uuid.UUID) -> training_model
 
 
 async def update_workout(
-    db: AsyncSession, workout_id: uuid.UUID, data: training_schemas.WorkoutUpdate
+    db: AsyncSession, workout_id: uuid.UUID, coach_id: uuid.UUID, data: training_schemas.WorkoutUpdate
 ) -> training_models.Workout:
-    workout = await get_workout(db, workout_id)
+    changes = data.model_dump(exclude_none=True)
+    if not changes:
+        return await get_workout(db, workout_id, coach_id)
 
-    if data.title is not None:
-        workout.title = data.title
-    if data.date is not None:
-        workout.date = data.date
-    if data.notes is not None:
-        workout.notes = data.notes
-    if data.metrics is not None:
-        workout.metrics = data.metrics
+    result = await db.execute(
+        update(training_models.Workout)
+        .where(
+            training_models.Workout.id == workout_id,
+            training_models.Workout.athlete_id.in_(scoping.owned_athlete_ids(coach_id)),
+        )
+        .values(**changes)
+        .returning(training_models.Workout)
+    )
+    workout = result.scalars().first()
+    if not workout:
+        raise HTTPException(status_code=404, detail="Workout not found")
 
+    await ai_summaries.invalidate(db, workout.athlete_id)
+    await analytics_service.invalidate(db, workout.athlete_id)
     await db.commit()
-    await db.refresh(workout)
     return workout
 
 
-async def delete_workout(db: AsyncSession, workout_id: uuid.UUID):
-    workout = await get_workout(db, workout_id)
+async def delete_workout(db: AsyncSession, workout_id: uuid.UUID, coach_id: uuid.UUID):
+    workout = await get_workout(db, workout_id, coach_id)
+    await ai_summaries.invalidate(db, workout.athlete_id)
+    await analytics_service.invalidate(db, workout.athlete_id)
 
     # Cascade rule: Deleting workout deletes assigned_workout too if linked
     if workout.assigned_workout_id:
@@ -197,53 +260,57 @@ async def delete_workout(db: AsyncSession, workout_id: uuid.UUID):
     await db.commit()
 
 
-async def get_athlete_workouts(db: AsyncSession, athlete_id: uuid.UUID) -> list[training_models.Workout]:
-    result = await db.execute(select(training_models.Workout).where(training_models.Workout.athlete_id == athlete_id))
-    return list(result.scalars().all())
+async def get_athlete_workouts(
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID | None = None
+) -> list[dict[str, Any]]:
+    if coach_id is not None:
+        query = (
+            scoping.owned_athlete(athlete_id, coach_id)
+            .add_columns(*WORKOUT_READ_COLUMNS)
+            .outerjoin(training_models.Workout, training_models.Workout.athlete_id == identity_models.Athlete.id)
+        )
+        rows = await scoping.fetch_scoped(db, query, "Athlete not found")
+        return projection.as_dicts(scoping.joined_columns(rows), skip=1)
 
+    query = select(*WORKOUT_READ_COLUMNS).where(training_models.Workout.athlete_id == athlete_id)
+    return await projection.fetch_dicts(db, query)
 
-# --- Summary & Analytics ---
 
+# --- Summary & Analytics ---
 
-async def get_athlete_summary(db: AsyncSession, athlete_id: uuid.UUID) -> training_schemas.AthleteSummary:
-    # 1. Total Workouts
-    total_res = await db.execute(
-        select(func.count(training_models.Workout.id)).where(training_models.Workout.athlete_id == athlete_id)
-    )
-    total_workouts = total_res.scalar() or 0
 
-    # 2. Workouts this week
+async def get_athlete_summary(
+    db: AsyncSession, athlete_id: uuid.UUID, coach_id: uuid.UUID | None = None
+) -> training_schemas.AthleteSummary:
     today = datetime.utcnow().date()
     week_start = today - timedelta(days=today.weekday())  # Monday
-    week_res = await db.execute(
-        select(func.count(training_models.Workout.id)).where(
-            training_models.Workout.athlete_id == athlete_id, training_models.Workout.date >= week_start
-        )
+    month_start = today.replace(day=1)
+
+    # Total, this week, this month and last workout date as one aggregate
+    aggregates = (
+        func.count(training_models.Workout.id),
+        func.count(training_models.Workout.id).filter(training_models.Workout.date >= week_start),
+        func.count(training_models.Workout.id).filter(training_models.Workout.date >= month_start),
+        func.max(training_models.Workout.date),
     )
-    workouts_this_week = week_res.scalar() or 0
 
-    # 3. Workouts this month
-    month_start = today.replace(day=1)
-    month_res = await db.execute(
-        select(func.count(training_models.Workout.id)).where(
-            training_models.Workout.athlete_id == athlete_id, training_models.Workout.date >= month_start
+    if coach_id is not None:
+        query = (
+            scoping.owned_athlete(athlete_id, coach_id)
+            .add_columns(*aggregates)
+            .outerjoin(training_models.Workout, training_models.Workout.athlete_id == identity_models.Athlete.id)
+            .group_by(identity_models.Athlete.id)
         )
-    )
-    workouts_this_month = month_res.scalar() or 0
-
-    # 4. Last workout date
-    last_res = await db.execute(
-        select(training_models.Workout.date)
-        .where(training_models.Workout.athlete_id == athlete_id)
-        .order_by(training_models.Workout.date.desc())
-        .limit(1)
-    )
-    last_workout_date = last_res.scalar()
+        rows = await scoping.fetch_scoped(db, query, "Athlete not found")
+        _, total_workouts, workouts_this_week, workouts_this_month, last_workout_date = rows[0]
+    else:
+        result = await db.execute(select(*aggregates).where(training_models.Workout.athlete_id == athlete_id))
+        total_workouts, workouts_this_week, workouts_this_month, last_workout_date = result.one()
 
     return training_schemas.AthleteSummary(
-        total_workouts=total_workouts,
-        workouts_this_week=workouts_this_week,
-        workouts_this_month=workouts_this_month,
+        total_workouts=total_workouts or 0,
+        workouts_this_week=workouts_this_week or 0,
+        workouts_this_month=workouts_this_month or 0,
         last_workout_date=last_workout_date,
     )
 
@@ -254,19 +321,16 @@ async def update_skipped_assignments(db: AsyncSession):
     """
     today = datetime.utcnow().date()
 
-    # Find assignments
-    # We could use update() directly
-    stmt = select(training_models.AssignedWorkout).where(
-        training_models.AssignedWorkout.status == training_models.WorkoutStatus.PENDING,
-        training_models.AssignedWorkout.scheduled_date < today,
+    result = await db.execute(
+        update(training_models.AssignedWorkout)
+        .where(
+            training_models.AssignedWorkout.status == training_models.WorkoutStatus.PENDING,
+            training_models.AssignedWorkout.scheduled_date < today,
+        )
+        .values(status=training_models.WorkoutStatus.SKIPPED)
+        .execution_options(synchronize_session=False)
     )
-    result = await db.execute(stmt)
-    assignments = result.scalars().all()
-
-    count = 0
-    for a in assignments:
-        a.status = training_models.WorkoutStatus.SKIPPED
-        count += 1
+    count = result.rowcount
 
     await db.commit()
     return count
@@ -0,0 +1,294 @@
+"""
+Throughput and tail latency of the AI routes next to CRUD traffic, over HTTP.
+
+Starts scripts/fake_openai_server.py and the API (uvicorn, with the current coach bound to a
+throwaway bench coach) as subprocesses, seeds `--athletes` athletes with a few weeks of
+workouts in DATABASE_URL, then for `--duration` seconds runs:
+
+- `--crud-clients` clients, each looping over GET /coach/athletes/{id}/workouts,
+  GET /coach/athletes/{id} and POST /workouts (6:3:1),
+- `--ai-clients` clients, each looping over a talent report stream (time to the first
+  delta and to `done`), a weekly insights job polled until it finishes, and
+  GET .../ai/talent-recognition.
+
+AI requests pass `force_refresh=true` unless `--use-cache` is given, so every one reaches
+the provider. The fake provider's latency distribution and error rate are set from the
+command line; `--provider-url` uses an already running provider instead. Prints requests,
+throughput and p50/p95/p99 per route, then deletes the coach.
+
+Measured on one machine (API, provider and load in three processes, PostgreSQL 16) with 20
+athletes, 8 CRUD and 8 AI clients for 30 s, lognormal provider latency (median 1 s, sigma 0.5),
+2% injected errors, 2 report workers:
+
+    route                                     count    req/s     p50     p95     p99  errors
+    GET  /coach/athletes/{id}                   773     22.7      83     149     255       0
+    GET  /coach/athletes/{id}/workouts         1526     44.7      83     145     228       0
+    POST /workouts                              250      7.3     113     179     242       0
+    POST talent stream (first delta)             61      1.8    1034    2097    2430       0
+    POST talent stream (done)                    61      1.8    1879    3275    4479       0
+    weekly insights job (enqueue to done)        61      1.8    2050    3065    3484       0
+    GET  .../ai/talent-recognition               61      1.8     104     175     253       0
+
+Latencies in ms. Errors count failed responses, `error` stream events and failed jobs; the
+injected errors above were absorbed by the SDK's retries.
+
+Usage:
+    uv run python scripts/bench_ai_load.py [--duration 30] [--athletes 20]
+        [--crud-clients 8] [--ai-clients 8] [--latency 1.0] [--distribution lognormal]
+        [--error-rate 0.02] [--provider-url http://127.0.0.1:8765/v1] [--use-cache]
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.modules.identity import models as identity_models  # noqa: E402
+from app.modules.training import models as training_models  # noqa: E402
+
+TITLES = ("Sprint intervals", "Tempo run", "Strength circuit")
+
+
+async def seed(athletes: int) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    today = date.today()
+    async with AsyncSessionLocal() as db:
+        coach = identity_models.Coach(email=f"bench-{uuid.uuid4()}@sportan.test", full_name="Bench Coach")
+        db.add(coach)
+        await db.commit()
+        result = await db.execute(
+            insert(identity_models.Athlete)
+            .values([{"coach_id": coach.id, "full_name": f"Bench Athlete {i}"} for i in range(athletes)])
+            .returning(identity_models.Athlete.id)
+        )
+        athlete_ids = list(result.scalars().all())
+        workouts = [
+            {
+                "athlete_id": athlete_id,
+                "title": TITLES[day % 3],
+                "date": today - timedelta(days=day),
+                "metrics": {"60m": round(8.9 + day % 10 / 10, 2), "rpe": 5 + day % 4},
+            }
+            for athlete_id in athlete_ids
+            for day in range(0, 28, 2)
+        ]
+        await db.execute(insert(training_models.Workout), workouts)
+        await db.commit()
+        return coach.id, athlete_ids
+
+
+async def delete_coach(coach_id: uuid.UUID):
+    async with AsyncSessionLocal() as db:
+        # ORM cascades take the coach's athletes and their data with it
+        await db.delete(await db.get(identity_models.Coach, coach_id))
+        await db.commit()
+
+
+def serve(coach_id: uuid.UUID, port: int):
+    """API process: the app with the current user bound to the bench coach."""
+    import uvicorn
+
+    from app.modules.identity import service as identity_service
+
+    async def load_coach():
+        async with AsyncSessionLocal() as db:
+            coach = await db.get(identity_models.Coach, coach_id)
+        # The pool's connections belong to this event loop, not uvicorn's
+        await engine.dispose()
+        return coach
+
+    coach = asyncio.run(load_coach())
+    app.dependency_overrides[identity_service.get_current_user] = lambda: coach
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def percentile_ms(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted latencies in seconds, in milliseconds."""
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)] * 1e3
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def add(self, route: str, seconds: float, ok: bool = True):
+        self.latencies[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+    def report(self, duration: float):
+        print(f"{'route':<40} {'count':>6} {'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'errors':>7}")
+        for route, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            p50, p95, p99 = (percentile_ms(ordered, q) for q in (50, 95, 99))
+            print(
+                f"{route:<40} {len(ordered):>6} {len(ordered) / duration:>8.1f} "
+                f"{p50:>7.0f} {p95:>7.0f} {p99:>7.0f} {self.errors[route]:>7}"
+            )
+
+
+async def crud_client(client: httpx.AsyncClient, athletes: list[uuid.UUID], until: float, rng, recorder: Recorder):
+    while time.monotonic() < until:
+        athlete_id = rng.choice(athletes)
+        roll = rng.random()
+        t0 = time.monotonic()
+        if roll < 0.6:
+            route = "GET  /coach/athletes/{id}/workouts"
+            response = await client.get(f"/coach/athletes/{athlete_id}/workouts")
+        elif roll < 0.9:
+            route = "GET  /coach/athletes/{id}"
+            response = await client.get(f"/coach/athletes/{athlete_id}")
+        else:
+            route = "POST /workouts"
+            workout = {"athlete_id": str(athlete_id), "title": rng.choice(TITLES), "date": date.today().isoformat()}
+            response = await client.post("/workouts", json={**workout, "metrics": {"rpe": rng.randint(4, 9)}})
+        recorder.add(route, time.monotonic() - t0, response.is_success)
+
+
+async def stream_talent_report(client: httpx.AsyncClient, athlete_id: uuid.UUID, params: dict, recorder: Recorder):
+    t0 = time.monotonic()
+    first = None
+    ok = False
+    async with client.stream("POST", f"/coach/athletes/{athlete_id}/ai/talent-recognition/stream", params=params) as r:
+        event = None
+        async for line in r.aiter_lines():
+            if line.startswith("event: "):
+                event = line.removeprefix("event: ")
+            if event == "delta" and first is None:
+                first = time.monotonic() - t0
+            if event in ("done", "error"):
+                ok = event == "done"
+                break
+        ok = ok and r.is_success
+    elapsed = time.monotonic() - t0
+    recorder.add("POST talent stream (first delta)", first if first is not None else elapsed, ok)
+    recorder.add("POST talent stream (done)", elapsed, ok)
+
+
+async def weekly_insights_job(client: httpx.AsyncClient, athlete_id: uuid.UUID, params: dict, recorder: Recorder):
+    t0 = time.monotonic()
+    response = await client.post(f"/coach/athletes/{athlete_id}/ai/weekly-insights", params=params)
+    job = response.json() if response.is_success else {"status": "failed"}
+    while job["status"] in ("queued", "running"):
+        await asyncio.sleep(0.1)
+        job = (await client.get(f"/coach/ai/jobs/{job['id']}")).json()
+    recorder.add("weekly insights job (enqueue to done)", time.monotonic() - t0, job["status"] == "succeeded")
+
+
+async def ai_client(
+    client: httpx.AsyncClient, athletes: list[uuid.UUID], until: float, rng, recorder: Recorder, params: dict
+):
+    while time.monotonic() < until:
+        athlete_id = rng.choice(athletes)
+        await stream_talent_report(client, athlete_id, params, recorder)
+        await weekly_insights_job(client, rng.choice(athletes), params, recorder)
+        t0 = time.monotonic()
+        response = await client.get(f"/coach/athletes/{athlete_id}/ai/talent-recognition")
+        recorder.add("GET  .../ai/talent-recognition", time.monotonic() - t0, response.status_code in (200, 404))
+
+
+async def wait_until_up(url: str, process: subprocess.Popen):
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            if process.poll() is not None:
+                raise RuntimeError(f"{url} exited with {process.returncode}")
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not start")
+
+
+async def main(args: argparse.Namespace):
+    coach_id, athletes = await seed(args.athletes)
+    processes = []
+    try:
+        provider_url = args.provider_url
+        if provider_url is None:
+            provider_url = f"http://127.0.0.1:{args.provider_port}/v1"
+            provider = [
+                sys.executable,
+                str(ROOT / "scripts" / "fake_openai_server.py"),
+                f"--port={args.provider_port}",
+                f"--latency={args.latency}",
+                f"--distribution={args.distribution}",
+                f"--spread={args.spread}",
+                f"--error-rate={args.error_rate}",
+            ]
+            processes.append(subprocess.Popen(provider))
+            await wait_until_up(f"http://127.0.0.1:{args.provider_port}/stats", processes[-1])
+
+        env = {**os.environ, "AI_BASE_URL": provider_url, "AI_API_KEY": "fake", "AI_PROVIDERS": "[]"}
+        api = [sys.executable, __file__, "serve", f"--coach-id={coach_id}", f"--port={args.port}"]
+        processes.append(subprocess.Popen(api, env=env))
+        base_url = f"http://127.0.0.1:{args.port}"
+        await wait_until_up(f"{base_url}/docs", processes[-1])
+
+        recorder = Recorder()
+        params = {} if args.use_cache else {"force_refresh": "true"}
+        limits = httpx.Limits(max_connections=args.crud_clients + args.ai_clients)
+        async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+            t0 = time.monotonic()
+            until = t0 + args.duration
+            await asyncio.gather(
+                *(crud_client(client, athletes, until, random.Random(i), recorder) for i in range(args.crud_clients)),
+                *(
+                    ai_client(client, athletes, until, random.Random(1000 + i), recorder, params)
+                    for i in range(args.ai_clients)
+                ),
+            )
+            recorder.report(time.monotonic() - t0)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+        await delete_coach(coach_id)
+        await engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command")
+    serve_parser = commands.add_parser("serve", help="internal: run the API for the bench coach")
+    serve_parser.add_argument("--coach-id", type=uuid.UUID, required=True)
+    serve_parser.add_argument("--port", type=int, required=True)
+
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--athletes", type=int, default=20)
+    parser.add_argument("--crud-clients", type=int, default=8)
+    parser.add_argument("--ai-clients", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8790, help="API port")
+    parser.add_argument("--provider-url", help="use this provider instead of starting the fake one")
+    parser.add_argument("--provider-port", type=int, default=8791)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--distribution", default="lognormal")
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--use-cache", action="store_true", help="let AI requests hit the report cache")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.command == "serve":
+        serve(arguments.coach_id, arguments.port)
+    else:
+        asyncio.run(main(arguments))
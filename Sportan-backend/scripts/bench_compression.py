@@ -0,0 +1,124 @@
+"""
+Bytes on the wire per list route with gzip and brotli at the configured levels.
+
+Renders representative payloads for the heaviest read routes the same way the API does
+(orjson) and compresses them through CompressionMiddleware's encoders. In a running
+deployment the same numbers come from the `app.core.compression` DEBUG log, one
+`raw=... wire=...` line per response keyed by route template.
+
+Measured with 200 rows per list (gzip level 6, brotli quality 4):
+
+    route                                          raw     gzip       br
+    GET /coach/athletes/{id}/workouts          60032 B   9731 B   8563 B
+    GET /coach/athletes/{id}/assigned-workouts 52866 B   6746 B   5522 B
+    GET /coach/groups/{id}/athletes            39091 B   6200 B   5467 B
+    GET /parent/athlete/summary                  103 B   (below threshold)
+
+Each list compresses in about 1 ms.
+
+Usage:
+    uv run python scripts/bench_compression.py [--rows 200]
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.compression import CompressionMiddleware  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.responses import ORJSONResponse  # noqa: E402
+from app.modules.training.models import WorkoutStatus  # noqa: E402
+
+
+def payloads(rows: int) -> dict[str, bytes]:
+    athlete_id, coach_id = uuid.uuid4(), uuid.uuid4()
+    today = date.today()
+    now = datetime.utcnow()
+    workouts = [
+        {
+            "title": ("Sprint intervals", "Tempo run", "Strength circuit")[i % 3],
+            "date": today - timedelta(days=i),
+            "notes": "Felt strong in the last reps" if i % 4 else None,
+            "metrics": {"60m": round(8.9 + (i % 10) / 10, 2), "reps": 6, "rpe": 5 + i % 4},
+            "id": uuid.uuid4(),
+            "athlete_id": athlete_id,
+            "assigned_workout_id": uuid.uuid4() if i % 2 else None,
+            "created_at": now - timedelta(days=i),
+        }
+        for i in range(rows)
+    ]
+    assignments = [
+        {
+            "title": ("Sprint intervals", "Tempo run", "Strength circuit")[i % 3],
+            "description": "Warm up 15 min, then the main set",
+            "scheduled_date": today - timedelta(days=i),
+            "id": uuid.uuid4(),
+            "athlete_id": athlete_id,
+            "status": (WorkoutStatus.COMPLETED, WorkoutStatus.SKIPPED, WorkoutStatus.PENDING)[i % 3],
+            "created_at": now - timedelta(days=i),
+        }
+        for i in range(rows)
+    ]
+    athletes = [
+        {
+            "id": uuid.uuid4(),
+            "coach_id": coach_id,
+            "full_name": f"Athlete {i}",
+            "dob": date(2012, 1 + i % 12, 1 + i % 28),
+            "notes": None,
+            "created_at": now,
+        }
+        for i in range(rows)
+    ]
+    summary = {"total_workouts": rows, "workouts_this_week": 3, "workouts_this_month": 12, "last_workout_date": today}
+    return {
+        "GET /coach/athletes/{id}/workouts": ORJSONResponse(workouts).body,
+        "GET /coach/athletes/{id}/assigned-workouts": ORJSONResponse(assignments).body,
+        "GET /coach/groups/{id}/athletes": ORJSONResponse(athletes).body,
+        "GET /parent/athlete/summary": ORJSONResponse(summary).body,
+    }
+
+
+def compress(middleware: CompressionMiddleware, encoding: str, body: bytes) -> tuple[int, float]:
+    t0 = time.perf_counter()
+    stream = middleware.stream(encoding)
+    size = len(stream.compress(body) + stream.finish())
+    return size, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200)
+    args = parser.parse_args()
+
+    middleware = CompressionMiddleware(
+        app=None,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+        brotli_quality=settings.BROTLI_COMPRESSION_QUALITY,
+    )
+    print(
+        f"{args.rows} rows, gzip level {middleware.gzip_level}, brotli quality {middleware.brotli_quality}, "
+        f"threshold {middleware.minimum_size} B"
+    )
+    for route, body in payloads(args.rows).items():
+        if len(body) < middleware.minimum_size:
+            print(f"{route:<45} raw {len(body):>8} B  (below threshold)")
+            continue
+        gzip_size, gzip_time = compress(middleware, "gzip", body)
+        br_size, br_time = compress(middleware, "br", body)
+        print(
+            f"{route:<45} raw {len(body):>8} B  gzip {gzip_size:>7} B ({gzip_time * 1e3:.2f} ms)"
+            f"  br {br_size:>7} B ({br_time * 1e3:.2f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Talent-report prompt size as the workout history grows.
+
+Seeds a throwaway coach and athlete in DATABASE_URL with `--sessions` workouts (about one
+a day, going back in time) and builds the talent-report prompt the way the workers do. It
+then stores the rolling digest with a report-sized narrative, as a finished report does,
+logs `--new-sessions` more workouts and builds the next prompt. Prints estimated tokens
+against AI_PROMPT_TOKEN_BUDGET; the coach is deleted at the end.
+
+Measured with the default budget (6000 tokens) and 5 sessions between reports:
+
+    sessions   every session listed    first report          next report
+          50          1250 tokens     1258 tokens   11 ms     1231 tokens   14 ms
+         500         10843 tokens     3972 tokens   40 ms     1233 tokens    8 ms
+        5000        106751 tokens     5775 tokens  126 ms     1235 tokens   10 ms
+
+Usage:
+    uv run python scripts/bench_prompt_budget.py [--sessions 50 500 5000] [--new-sessions 5]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import AsyncSessionLocal, engine  # noqa: E402
+from app.modules.ai import prompts, summaries  # noqa: E402
+from app.modules.ai import service as ai_service  # noqa: E402
+from app.modules.analytics import service as analytics_service  # noqa: E402
+from app.modules.coaching import schemas as coaching_schemas  # noqa: E402
+from app.modules.coaching import service as coaching_service  # noqa: E402
+from app.modules.identity import models as identity_models  # noqa: E402
+from app.modules.training import models as training_models  # noqa: E402
+
+TITLES = ("Sprint intervals", "Tempo run", "Strength circuit", "Long run")
+# Stands in for the previous talent report, which is about this long
+NARRATIVE = "Strong acceleration and consistent sprint times; keep building the aerobic base. " * 45
+
+
+def workout_rows(athlete_id: uuid.UUID, sessions: int, offset: int = 0) -> list[dict]:
+    today = date.today()
+    return [
+        {
+            "athlete_id": athlete_id,
+            "title": TITLES[i % len(TITLES)],
+            "date": today - timedelta(days=i - offset),
+            "metrics": {"60m": round(8.9 + (i % 10) / 10, 2), "reps": 6, "rpe": 5 + i % 4},
+            "notes": "Felt strong in the last reps" if i % 3 else None,
+        }
+        for i in range(sessions)
+    ]
+
+
+async def seed(sessions: int) -> tuple[uuid.UUID, uuid.UUID, list[dict]]:
+    async with AsyncSessionLocal() as db:
+        coach = identity_models.Coach(email=f"bench-{uuid.uuid4()}@sportan.test", full_name="Bench Coach")
+        db.add(coach)
+        await db.commit()
+        coach_id = coach.id
+    async with AsyncSessionLocal() as db:
+        group = await coaching_service.create_group(db, coach_id, coaching_schemas.GroupCreate(name="Bench"))
+    async with AsyncSessionLocal() as db:
+        athlete = await coaching_service.create_athlete(
+            db, coach_id, group.id, coaching_schemas.AthleteCreate(full_name="Bench Athlete", dob=date(2010, 5, 1))
+        )
+
+    workouts = workout_rows(athlete.id, sessions)
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(training_models.Workout), workouts)
+        await db.commit()
+    return coach_id, athlete.id, workouts
+
+
+async def timed_inputs(athlete_id: uuid.UUID, coach_id: uuid.UUID) -> tuple[ai_service.ReportInputs, float]:
+    async with AsyncSessionLocal() as db:
+        t0 = time.perf_counter()
+        inputs = await ai_service.talent_report_inputs(db, athlete_id, coach_id)
+        return inputs, time.perf_counter() - t0
+
+
+async def measure(sessions: int, new_sessions: int):
+    coach_id, athlete_id, workouts = await seed(sessions)
+    try:
+        async with AsyncSessionLocal() as db:
+            athlete = await coaching_service.get_athlete(db, athlete_id, coach_id)
+            summary = await summaries.roll_forward(db, athlete_id)
+            indicators = await analytics_service.athlete_features(db, athlete_id)
+        unbudgeted = ai_service._talent_prompt(
+            athlete, summary, indicators, "\n".join(prompts.workout_line(w) for w in workouts)
+        )
+
+        first, first_elapsed = await timed_inputs(athlete_id, coach_id)
+
+        # Store the digest with a report-sized narrative, as a finished report does, then log more sessions
+        async with AsyncSessionLocal() as db:
+            await db.execute(summaries.save_statement(athlete_id, first.summary, NARRATIVE))
+            await db.execute(insert(training_models.Workout), workout_rows(athlete_id, new_sessions, offset=1))
+            await db.commit()
+        rolled, rolled_elapsed = await timed_inputs(athlete_id, coach_id)
+
+        print(
+            f"{sessions:>8} {prompts.estimate_tokens(unbudgeted):>10} tokens"
+            f" {prompts.estimate_tokens(first.prompt):>8} tokens {first_elapsed * 1e3:>5.0f} ms"
+            f" {prompts.estimate_tokens(rolled.prompt):>8} tokens {rolled_elapsed * 1e3:>5.0f} ms"
+        )
+    finally:
+        async with AsyncSessionLocal() as db:
+            # ORM cascades take the coach's groups, athletes and their data with it
+            await db.delete(await db.get(identity_models.Coach, coach_id))
+            await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--new-sessions", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"budget {settings.AI_PROMPT_TOKEN_BUDGET} tokens, {args.new_sessions} sessions logged between reports")
+    print("sessions  every session listed   first report          next report")
+    try:
+        for sessions in args.sessions:
+            await measure(sessions, args.new_sessions)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+Full-text search latency with millions of workout notes.
+
+Seeds `--coaches` throwaway coaches with `--athletes` athletes each and `--workouts` workouts
+in total into DATABASE_URL. Notes are 8-15 words drawn from a vocabulary of common training
+words, plus "hamstring strain" in about one note in a thousand. Then it times
+search.service.search for one coach, `--repeat` times per query, and deletes the seeded rows.
+
+Measured on one machine (PostgreSQL 16, defaults) with 1,000,000 workouts, 100 coaches of
+20 athletes; one coach owns about 10,000 workouts (ms):
+
+    query                          hits      p50      p95
+    hamstring                        16     14.4     94.4
+    "hamstring strain"               16     17.9     19.9
+    tempo                          1954     35.1     70.4
+    tempo drills                    341     30.1     34.3
+
+A rare word is found through the GIN index across all coaches; a common word by filtering
+the coach's own workouts. The first run of each query reads cold pages, hence the p95 of a
+rare word.
+
+Usage:
+    uv run python scripts/bench_search.py [--workouts 1000000] [--coaches 100] [--athletes 20] [--repeat 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import text
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.database import AsyncSessionLocal, engine  # noqa: E402
+from app.modules.search import service as search_service  # noqa: E402
+
+WORDS = (
+    "felt strong tired legs warm up cool down sprint tempo drills reps sets recovery stretch calf "
+    "knee ankle hip core form start block acceleration speed endurance hill track grass easy hard "
+    "pace rhythm breathing focus coach partner wind rain cold sore fresh good great slow fast long short"
+).split()
+QUERIES = ["hamstring", '"hamstring strain"', "tempo", "tempo drills"]
+
+
+async def seed(coaches: int, athletes: int, workouts: int) -> list[uuid.UUID]:
+    coach_ids = [uuid.uuid4() for _ in range(coaches)]
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO coaches (id, email, full_name, created_at) VALUES (:id, :email, 'Bench', now())"),
+            [{"id": coach_id, "email": f"bench-search-{coach_id}@example.com"} for coach_id in coach_ids],
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO athletes (coach_id, full_name) "
+                "SELECT c, 'Bench athlete ' || i FROM unnest(CAST(:coaches AS uuid[])) c, generate_series(1, :n) i"
+            ),
+            {"coaches": coach_ids, "n": athletes},
+        )
+        # The word subquery references g so that it is drawn again for every row
+        await conn.execute(
+            text(
+                """
+                WITH a AS (SELECT array_agg(id) AS ids FROM athletes WHERE coach_id = ANY(CAST(:coaches AS uuid[])))
+                INSERT INTO workouts (athlete_id, date, title, notes)
+                SELECT a.ids[1 + g % array_length(a.ids, 1)],
+                       current_date - g % 365,
+                       (ARRAY['Sprints', 'Long run', 'Gym', 'Drills', 'Tempo'])[1 + g % 5],
+                       array_to_string(ARRAY(
+                           SELECT (CAST(:words AS text[]))[1 + floor(random() * :nwords)::int]
+                           FROM generate_series(1, 8 + g % 8)
+                       ), ' ') || CASE WHEN random() < 0.001 THEN ' hamstring strain' ELSE '' END
+                FROM a, generate_series(1, :workouts) g
+                """
+            ),
+            {"coaches": coach_ids, "words": WORDS, "nwords": len(WORDS), "workouts": workouts},
+        )
+        await conn.execute(text("ANALYZE workouts"))
+        await conn.execute(text("ANALYZE athletes"))
+    return coach_ids
+
+
+async def cleanup(coach_ids: list[uuid.UUID]):
+    async with engine.begin() as conn:
+        owned = "SELECT id FROM athletes WHERE coach_id = ANY(CAST(:coaches AS uuid[]))"
+        await conn.execute(text(f"DELETE FROM workouts WHERE athlete_id IN ({owned})"), {"coaches": coach_ids})
+        await conn.execute(text(f"DELETE FROM athletes WHERE id IN ({owned})"), {"coaches": coach_ids})
+        await conn.execute(text("DELETE FROM coaches WHERE id = ANY(CAST(:coaches AS uuid[]))"), {"coaches": coach_ids})
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workouts", type=int, default=1_000_000)
+    parser.add_argument("--coaches", type=int, default=100)
+    parser.add_argument("--athletes", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    coach_ids = await seed(args.coaches, args.athletes, args.workouts)
+    print(f"seeded {args.workouts} workouts in {time.perf_counter() - t0:.0f} s")
+    try:
+        print(f"{'query':<28} {'hits':>6} {'p50':>8} {'p95':>8}")
+        async with AsyncSessionLocal() as db:
+            for q in QUERIES:
+                timings, hits = [], 0
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    page = await search_service.search(db, coach_ids[0], q, limit=20)
+                    timings.append(time.perf_counter() - t0)
+                hits = (
+                    await db.execute(
+                        text(
+                            "SELECT count(*) FROM workouts w JOIN athletes a ON a.id = w.athlete_id "
+                            "WHERE a.coach_id = :coach AND w.search_vector @@ websearch_to_tsquery('english', :q)"
+                        ),
+                        {"coach": coach_ids[0], "q": q},
+                    )
+                ).scalar()
+                assert len(page.items) == min(hits, 20)
+                p50 = statistics.median(timings)
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                print(f"{q:<28} {hits:>6} {p50 * 1e3:>8.1f} {p95 * 1e3:>8.1f}")
+    finally:
+        await cleanup(coach_ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+Response serialization cost for the workout-list and summary routes.
+
+Replays what FastAPI does after the endpoint returns, on in-memory service output:
+
+    stdlib     response_model validation -> JSON-mode dump -> json.dumps (previous default)
+    orjson     response_model validation -> JSON-mode dump -> orjson (routes not marked trusted)
+    trusted    orjson straight from the service rows (trusted() routes)
+
+Measured with 1000 workouts (best of 5):
+
+    workout list  stdlib 9.28 ms   orjson 6.03 ms  trusted 0.71 ms
+    summary       stdlib 13.76 us  orjson 7.12 us  trusted 7.93 us
+
+The summary is a single small model, so orjson is the whole win there.
+
+Usage:
+    uv run python scripts/bench_serialization.py [--rows 1000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.responses import ORJSONResponse, trusted  # noqa: E402
+from app.modules.training import schemas as training_schemas  # noqa: E402
+
+
+def workout_rows(count: int) -> list[dict]:
+    athlete_id = uuid.uuid4()
+    start = date.today() - timedelta(days=count)
+    return [
+        {
+            "title": "Sprint intervals",
+            "date": start + timedelta(days=i),
+            "notes": "Felt strong in the last reps",
+            "metrics": {"60m": 8.9 + (i % 10) / 10, "reps": 6, "rpe": 7},
+            "id": uuid.uuid4(),
+            "athlete_id": athlete_id,
+            "assigned_workout_id": None,
+            "created_at": datetime.utcnow(),
+        }
+        for i in range(count)
+    ]
+
+
+def validated(adapter: TypeAdapter, content, response_class):
+    # FastAPI's serialize_response: validate against response_model, dump in JSON mode, render
+    return response_class(adapter.dump_python(adapter.validate_python(content), mode="json"))
+
+
+def best_of(repeat: int, call) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = workout_rows(args.rows)
+    workouts = TypeAdapter(list[training_schemas.WorkoutRead])
+    summary = training_schemas.AthleteSummary(
+        total_workouts=args.rows, workouts_this_week=3, workouts_this_month=12, last_workout_date=date.today()
+    )
+    summary_adapter = TypeAdapter(training_schemas.AthleteSummary)
+
+    print(f"{args.rows} workouts, best of {args.repeat}")
+    cases = [
+        ("workout list", 1e3, "ms", rows, workouts),
+        ("summary", 1e6, "us", summary, summary_adapter),
+    ]
+    for label, scale, unit, content, adapter in cases:
+        stdlib = best_of(args.repeat, lambda c=content, a=adapter: validated(a, c, JSONResponse))
+        orjson_ = best_of(args.repeat, lambda c=content, a=adapter: validated(a, c, ORJSONResponse))
+        fast = best_of(args.repeat, lambda c=content: trusted(c))
+        print(
+            f"{label:<13} stdlib {stdlib * scale:.2f} {unit}  orjson {orjson_ * scale:.2f} {unit}"
+            f"  trusted {fast * scale:.2f} {unit}"
+        )
+
+
+if __name__ == "__main__":
+    main()
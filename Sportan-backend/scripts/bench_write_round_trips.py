@@ -0,0 +1,182 @@
+"""
+Count database round trips per write endpoint.
+
+Runs the coaching/training service write paths against DATABASE_URL and counts what
+reaches the server: BEGIN, every statement, and COMMIT. Uses a throwaway coach that is
+deleted again at the end.
+
+Measured on PostgreSQL 16 (round trips, before -> after the INSERT/UPDATE ... RETURNING rewrite):
+
+    POST  /coach/groups                           5 -> 3
+    PUT   /coach/groups/{id}                      6 -> 3
+    POST  /coach/groups/{id}/athletes             7 -> 4
+    PUT   /coach/athletes/{id}                    6 -> 3
+    PUT   /coach/parents/{id}                     6 -> 3
+    POST  /coach/athletes/{id}/assigned-workouts  6 -> 3
+    POST  /coach/groups/{id}/assigned-workouts    4 -> 3
+    PATCH /coach/assigned-workouts/{id}           6 -> 3
+    POST  /workouts                               6 -> 3
+    POST  /workouts (with assignment)             8 -> 4
+    PUT   /workouts/{id}                          6 -> 3
+
+(Create parent is not measured: it needs a live Supabase admin client.)
+
+Usage:
+    uv run python scripts/bench_write_round_trips.py
+"""
+
+import asyncio
+import sys
+import uuid
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import event
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.database import AsyncSessionLocal, engine  # noqa: E402
+from app.modules.ai import models as ai_models  # noqa: E402, F401
+from app.modules.coaching import schemas as coaching_schemas  # noqa: E402
+from app.modules.coaching import service as coaching_service  # noqa: E402
+from app.modules.identity import models as identity_models  # noqa: E402
+from app.modules.training import schemas as training_schemas  # noqa: E402
+from app.modules.training import service as training_service  # noqa: E402
+from app.modules.training.models import WorkoutStatus  # noqa: E402
+
+
+class RoundTripCounter:
+    def __init__(self):
+        self.count = 0
+
+    events = ("begin", "commit", "before_cursor_execute")
+
+    def install(self):
+        for name in self.events:
+            event.listen(engine.sync_engine, name, self._hit)
+
+    def uninstall(self):
+        for name in self.events:
+            event.remove(engine.sync_engine, name, self._hit)
+
+    def _hit(self, *args, **kwargs):
+        self.count += 1
+
+
+async def measure(counter: RoundTripCounter, label: str, call):
+    # Fresh session per endpoint, like a request
+    async with AsyncSessionLocal() as db:
+        start = counter.count
+        result = await call(db)
+        print(f"{label:<45} {counter.count - start}")
+        return result
+
+
+async def main():
+    counter = RoundTripCounter()
+
+    async with AsyncSessionLocal() as db:
+        coach = identity_models.Coach(email=f"bench-{uuid.uuid4()}@sportan.test", full_name="Bench Coach")
+        db.add(coach)
+        await db.commit()
+        coach_id = coach.id
+
+    counter.install()
+    today = date.today()
+    assignment_data = training_schemas.AssignedWorkoutCreate(title="Intervals", scheduled_date=today)
+
+    try:
+        group = await measure(
+            counter,
+            "POST /coach/groups",
+            lambda db: coaching_service.create_group(db, coach_id, coaching_schemas.GroupCreate(name="Bench")),
+        )
+        await measure(
+            counter,
+            "PUT  /coach/groups/{id}",
+            lambda db: coaching_service.update_group(
+                db, group.id, coach_id, coaching_schemas.GroupUpdate(name="Bench U12")
+            ),
+        )
+        athlete = await measure(
+            counter,
+            "POST /coach/groups/{id}/athletes",
+            lambda db: coaching_service.create_athlete(
+                db, coach_id, group.id, coaching_schemas.AthleteCreate(full_name="Bench Athlete")
+            ),
+        )
+        await measure(
+            counter,
+            "PUT  /coach/athletes/{id}",
+            lambda db: coaching_service.update_athlete(
+                db, athlete.id, coach_id, coaching_schemas.AthleteUpdate(notes="Sprinter")
+            ),
+        )
+
+        async with AsyncSessionLocal() as db:
+            parent = identity_models.Parent(
+                id=uuid.uuid4(), athlete_id=athlete.id, email=f"bench-{uuid.uuid4()}@sportan.test", full_name="P"
+            )
+            db.add(parent)
+            await db.commit()
+        await measure(
+            counter,
+            "PUT  /coach/parents/{id}",
+            lambda db: coaching_service.update_parent(db, parent.id, coaching_schemas.ParentUpdate(phone="555")),
+        )
+
+        assignment = await measure(
+            counter,
+            "POST /coach/athletes/{id}/assigned-workouts",
+            lambda db: training_service.create_assignment_for_athlete(db, coach_id, athlete.id, assignment_data),
+        )
+        await measure(
+            counter,
+            "POST /coach/groups/{id}/assigned-workouts",
+            lambda db: training_service.create_assignment_for_group(db, coach_id, group.id, assignment_data),
+        )
+        await measure(
+            counter,
+            "PATCH /coach/assigned-workouts/{id}",
+            lambda db: training_service.update_assignment_status(db, assignment.id, WorkoutStatus.SKIPPED, coach_id),
+        )
+        workout = await measure(
+            counter,
+            "POST /workouts",
+            lambda db: training_service.log_workout(
+                db,
+                coach_id,
+                training_schemas.WorkoutCreate(athlete_id=athlete.id, title="Run", date=today, metrics={"km": 5}),
+            ),
+        )
+        await measure(
+            counter,
+            "POST /workouts (with assignment)",
+            lambda db: training_service.log_workout(
+                db,
+                coach_id,
+                training_schemas.WorkoutCreate(
+                    athlete_id=athlete.id, title="Intervals", date=today, assigned_workout_id=assignment.id
+                ),
+            ),
+        )
+        await measure(
+            counter,
+            "PUT  /workouts/{id}",
+            lambda db: training_service.update_workout(
+                db, workout.id, coach_id, training_schemas.WorkoutUpdate(notes="Felt good")
+            ),
+        )
+    finally:
+        counter.uninstall()
+        async with AsyncSessionLocal() as db:
+            # ORM cascades take the coach's groups, athletes and their data with it
+            await db.delete(await db.get(identity_models.Coach, coach_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,273 @@
+"""
+OpenAI-compatible chat completions server for local runs and load tests without a provider.
+
+POST /v1/chat/completions answers with one of a few canned reports, picked by a hash of the
+prompt, so the same prompt always gets the same text. Plain and streamed (`stream: true`, one
+word per chunk) responses carry `usage` with token counts estimated like the backend does.
+With `response_format` of type `json_schema`, the reply is a JSON object built from the schema
+(sentences from the canned reports for strings, enum members for enums), also seeded by the
+prompt; `--no-json-mode` answers those requests with a 400, like a provider without JSON mode.
+
+- Latency per request is drawn from `--distribution`: `fixed` (always `--latency`),
+  `uniform` (`--latency` +/- `--spread` of it) or `lognormal` (median `--latency`,
+  sigma `--spread`). Streams spend half of it before the first chunk.
+- `--error-rate` of the requests fail with a status from `--error-status` and an
+  OpenAI-style error body, before any latency or chunk.
+- Latencies and errors come from a generator seeded with `--seed`, so the same sequence of
+  requests sees the same behaviour.
+
+GET /stats returns the request and error counts and the observed request rate, which is
+also logged every 50 requests. Point the backend at the server with:
+
+    AI_BASE_URL=http://127.0.0.1:8765/v1 AI_API_KEY=fake
+
+Usage:
+    uv run python scripts/fake_openai_server.py [--port 8765] [--latency 1.0]
+        [--distribution fixed|uniform|lognormal] [--spread 0.5]
+        [--error-rate 0.0] [--error-status 429 --error-status 503] [--seed 0] [--no-json-mode]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+import time
+from collections import Counter
+
+import orjson
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+REPORTS = (
+    "Consistency: sessions were spread evenly across the week. "
+    "Intensity: sprint times held steady with lower perceived effort. "
+    "Quality: notes show good focus in the final reps. "
+    "Tip: add one easy aerobic session before the next sprint day.",
+    "Consistency: four sessions, with a gap mid-week. "
+    "Intensity: tempo pace improved while heart rate stayed flat. "
+    "Quality: strength work was cut short twice. "
+    "Tip: move the strength circuit to the start of the session.",
+    "Strengths: reliable attendance and steady improvement in short sprints. "
+    "Areas to improve: endurance fades in the last third of longer runs. "
+    "Potential: well suited to 100 m and 200 m events. "
+    "Recommendations: one long aerobic run per week and regular starts practice.",
+)
+
+ERROR_TYPES = {
+    400: "invalid_request_error",
+    429: "rate_limit_exceeded",
+    500: "server_error",
+    503: "service_unavailable",
+}
+
+SENTENCES = [sentence.strip().rstrip(".") + "." for report in REPORTS for sentence in report.split(". ")]
+
+CHARS_PER_TOKEN = 4
+
+
+class Behaviour:
+    """Seeded latency and error draws, one per request."""
+
+    def __init__(
+        self, latency: float, distribution: str, spread: float, error_rate: float, statuses: list[int], seed: int
+    ):
+        self.latency = latency
+        self.distribution = distribution
+        self.spread = spread
+        self.error_rate = error_rate
+        self.statuses = statuses
+        self._random = random.Random(seed)
+
+    def draw_latency(self) -> float:
+        if self.distribution == "uniform":
+            return max(self._random.uniform(self.latency * (1 - self.spread), self.latency * (1 + self.spread)), 0.0)
+        if self.distribution == "lognormal":
+            return self._random.lognormvariate(math.log(self.latency), self.spread) if self.latency > 0 else 0.0
+        return self.latency
+
+    def draw_error(self) -> int | None:
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._random.choice(self.statuses)
+        return None
+
+
+class Stats:
+    def __init__(self):
+        self.requests = 0
+        self.errors: Counter[int] = Counter()
+        self.started = time.monotonic()
+
+    def record(self, status: int | None):
+        self.requests += 1
+        if status is not None:
+            self.errors[status] += 1
+        if self.requests % 50 == 0:
+            elapsed = time.monotonic() - self.started
+            print(f"{self.requests} requests, {self.requests / elapsed:.2f}/s, errors {dict(self.errors)}", flush=True)
+
+    def snapshot(self) -> dict:
+        elapsed = time.monotonic() - self.started
+        return {
+            "requests": self.requests,
+            "errors": {str(status): count for status, count in sorted(self.errors.items())},
+            "requests_per_second": round(self.requests / elapsed, 3) if elapsed else 0.0,
+        }
+
+
+def tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def prompt_text(messages: list[dict]) -> str:
+    return "\n".join(str(message.get("content", "")) for message in messages)
+
+
+def canned_report(prompt: str) -> str:
+    digest = hashlib.sha256(prompt.encode()).digest()
+    return REPORTS[digest[0] % len(REPORTS)]
+
+
+def sample(schema: dict, defs: dict, rng: random.Random):
+    """A value matching a (Pydantic-generated) JSON schema."""
+    if "$ref" in schema:
+        return sample(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, rng)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "anyOf" in schema:
+        return sample(next(option for option in schema["anyOf"] if option.get("type") != "null"), defs, rng)
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: sample(prop, defs, rng) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        count = min(schema.get("maxItems", 3), rng.randint(1, 3))
+        items = [sample(schema.get("items", {}), defs, rng) for _ in range(count)]
+        # Enum lists (focus areas) read better without repeats
+        return list(dict.fromkeys(items)) if all(isinstance(item, str) for item in items) else items
+    if kind in ("integer", "number"):
+        return rng.randint(1, 10)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return rng.choice(SENTENCES)
+
+
+def json_report(prompt: str, response_format: dict) -> str:
+    schema = response_format.get("json_schema", {}).get("schema", {})
+    rng = random.Random(hashlib.sha256(prompt.encode()).digest())
+    return orjson.dumps(sample(schema, schema.get("$defs", {}), rng)).decode()
+
+
+def usage(prompt: str, report: str) -> dict:
+    prompt_tokens, completion_tokens = tokens(prompt), tokens(report)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def completion(model: str, prompt: str, report: str) -> dict:
+    message = {"role": "assistant", "content": report}
+    choice = {"index": 0, "finish_reason": "stop", "message": message}
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [choice],
+        "usage": usage(prompt, report),
+    }
+
+
+def chunk(model: str, content: str | None, finish_reason: str | None = None, usage: dict | None = None) -> bytes:
+    choice = {"index": 0, "delta": {"content": content} if content else {}, "finish_reason": finish_reason}
+    body = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+    if usage is not None:
+        body["usage"] = usage
+    return b"data: " + orjson.dumps({**body, "choices": [choice]}) + b"\n\n"
+
+
+def error_response(status: int, message: str | None = None, param: str | None = None) -> Response:
+    error_type = ERROR_TYPES.get(status, "server_error")
+    message = message or f"Injected {status} from the fake provider"
+    body = {"error": {"message": message, "type": error_type, "param": param, "code": error_type}}
+    return Response(orjson.dumps(body), status_code=status, media_type="application/json")
+
+
+def create_app(behaviour: Behaviour, json_mode: bool = True) -> Starlette:
+    stats = Stats()
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake")
+        prompt = prompt_text(body.get("messages", []))
+        status = behaviour.draw_error()
+        stats.record(status)
+        if status is not None:
+            return error_response(status)
+
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            if not json_mode:
+                return error_response(
+                    400, "'response_format' of type 'json_schema' is not supported", "response_format"
+                )
+            report = json_report(prompt, response_format)
+        else:
+            report = canned_report(prompt)
+        latency = behaviour.draw_latency()
+        if not body.get("stream"):
+            await asyncio.sleep(latency)
+            return Response(orjson.dumps(completion(model, prompt, report)), media_type="application/json")
+
+        words = report.split(" ")
+        # Spend half the latency before the first token, the rest spread over the words
+        per_word = latency / 2 / len(words)
+
+        async def events():
+            await asyncio.sleep(latency / 2)
+            for index, word in enumerate(words):
+                yield chunk(model, word if index == 0 else " " + word)
+                await asyncio.sleep(per_word)
+            yield chunk(model, None, "stop", usage(prompt, report))
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def get_stats(request: Request):
+        return Response(orjson.dumps(stats.snapshot()), media_type="application/json")
+
+    return Starlette(
+        routes=[
+            Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+            Route("/stats", get_stats, methods=["GET"]),
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per completion (median)")
+    parser.add_argument("--distribution", choices=("fixed", "uniform", "lognormal"), default="fixed")
+    parser.add_argument("--spread", type=float, default=0.5, help="uniform: +/- fraction; lognormal: sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail")
+    parser.add_argument("--error-status", type=int, action="append", help="status of injected errors (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-json-mode", action="store_true", help="reject response_format like a text-only provider")
+    args = parser.parse_args()
+
+    behaviour = Behaviour(
+        args.latency, args.distribution, args.spread, args.error_rate, args.error_status or [429, 500, 503], args.seed
+    )
+    uvicorn.run(
+        create_app(behaviour, json_mode=not args.no_json_mode), host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Unit tests for the weekly insights batch."""
+
+import asyncio
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.modules.ai import batch as ai_batch
+
+
+class TestActiveAthletes:
+    """Tests for paging through recently active athletes."""
+
+    def test_page_continues_after_the_cursor(self):
+        """Test that a page is a keyset read after the cursor, limited to active athletes."""
+        # Arrange
+        result = Mock()
+        result.all.return_value = []
+        db = AsyncMock()
+        db.execute.return_value = result
+        run = SimpleNamespace(window_start=date(2026, 10, 12), cursor=uuid.uuid4())
+
+        # Act
+        asyncio.run(ai_batch._active_athletes(db, run, limit=50))
+
+        # Assert
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "EXISTS (SELECT" in sql
+        assert "athletes.id > " in sql
+        assert sql.endswith("ORDER BY athletes.id \n LIMIT %(param_1)s")
+
+
+class TestProcessPage:
+    """Tests for counting a page's outcomes."""
+
+    def test_outcomes_are_counted_per_kind(self):
+        """Test that each athlete's outcome lands in the page counts."""
+        # Arrange
+        athletes = [(uuid.uuid4(), uuid.uuid4()) for _ in range(4)]
+        outcomes = [
+            ai_batch.Outcome.GENERATED,
+            ai_batch.Outcome.SKIPPED,
+            ai_batch.Outcome.SKIPPED,
+            ai_batch.Outcome.FAILED,
+        ]
+
+        # Act
+        with patch.object(ai_batch, "_generate", AsyncMock(side_effect=outcomes)):
+            counts = asyncio.run(ai_batch._process_page(athletes, date(2026, 10, 12), concurrency=2))
+
+        # Assert
+        assert counts == {ai_batch.Outcome.GENERATED: 1, ai_batch.Outcome.SKIPPED: 2, ai_batch.Outcome.FAILED: 1}
+
+
+class TestGenerate:
+    """Tests for generating one athlete's insight in a batch."""
+
+    def test_insight_in_flight_elsewhere_is_skipped(self):
+        """Test that an athlete whose insight another request is generating is skipped without a provider call."""
+        # Arrange
+        athlete_id, coach_id = uuid.uuid4(), uuid.uuid4()
+        db = AsyncMock()
+        session = Mock(return_value=Mock(__aenter__=AsyncMock(return_value=db), __aexit__=AsyncMock(return_value=None)))
+        inputs = ai_batch.ai_service.ReportInputs(input_hash="0" * 64, prompt="Analyze")
+        claim = AsyncMock(return_value=(SimpleNamespace(id=uuid.uuid4()), False))
+        generate = AsyncMock()
+
+        # Act
+        with (
+            patch.object(ai_batch, "AsyncSessionLocal", session),
+            patch.object(ai_batch.ai_service, "weekly_insight_inputs", AsyncMock(return_value=inputs)) as mock_inputs,
+            patch.object(ai_batch.ai_service, "find_cached_report", AsyncMock(return_value=None)),
+            patch.object(ai_batch.usage, "over_budget", AsyncMock(return_value=False)),
+            patch.object(ai_batch.inflight, "claim", claim),
+            patch.object(ai_batch.ai_service, "generate_from_inputs", generate),
+        ):
+            outcome = asyncio.run(ai_batch._generate(athlete_id, coach_id, date(2026, 10, 12)))
+
+        # Assert
+        assert outcome == ai_batch.Outcome.SKIPPED
+        mock_inputs.assert_awaited_once_with(db, athlete_id, coach_id, date(2026, 10, 12))
+        claim.assert_awaited_once()
+        generate.assert_not_awaited()
+
+    def test_inputs_cover_the_runs_week(self):
+        """Test that an insight for a run resumed days later reads the workouts of the run's week."""
+        # Arrange
+        athlete_id = uuid.uuid4()
+        fetch = AsyncMock(return_value=[])
+
+        # Act
+        with (
+            patch.object(ai_batch.ai_service.coaching_service, "get_athlete", AsyncMock()),
+            patch.object(ai_batch.ai_service.summaries, "get_summary", AsyncMock(return_value=None)),
+            patch.object(ai_batch.ai_service.projection, "fetch_dicts", fetch),
+        ):
+            inputs = asyncio.run(
+                ai_batch.ai_service.weekly_insight_inputs(AsyncMock(), athlete_id, uuid.uuid4(), date(2026, 10, 5))
+            )
+
+        # Assert
+        assert inputs.prompt is None
+        params = fetch.await_args.args[1].compile(dialect=postgresql.dialect()).params
+        assert date(2026, 10, 5) in params.values() and date(2026, 10, 12) in params.values()
@@ -0,0 +1,82 @@
+"""Unit tests for group insight prompts."""
+
+import asyncio
+import json
+import uuid
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.modules.ai import groups
+
+
+class TestFitRoster:
+    """Tests for fitting one line per athlete into the prompt budget."""
+
+    def test_drops_metrics_then_folds_the_least_active(self):
+        """Test that metric details go first, then the least active athletes are folded into one line."""
+        # Arrange
+        lines = [
+            (
+                f"A{i}",
+                f"- A{i} Athlete {i}: {10 - i} sessions; sprint avg 12.1 (11.8-12.4)" * 3,
+                f"- A{i} Athlete {i}: {10 - i} sessions (Sprints)",
+                10 - i,
+            )
+            for i in range(1, 6)
+        ]
+
+        # Act
+        full, full_labels = groups._fit_roster(lines, budget=1000)
+        short, _ = groups._fit_roster(lines, budget=55)
+        folded, folded_labels = groups._fit_roster(lines, budget=45)
+
+        # Assert
+        assert full == [line[1] for line in lines] and len(full_labels) == 5
+        assert short == [line[2] for line in lines]
+        assert folded_labels == ["A1", "A2"]
+        assert folded[-1] == "- 3 more athletes: 18 sessions in total"
+
+
+class TestResolveLabels:
+    """Tests for mapping the provider's athlete labels back to athletes."""
+
+    def test_known_labels_get_ids_and_unknown_are_dropped(self):
+        """Test that notes are keyed by athlete id and name, and notes for labels not in the prompt are dropped."""
+        # Arrange
+        athlete_id = str(uuid.uuid4())
+        labels = {"A1": {"athlete_id": athlete_id, "name": "Jane Doe"}}
+        structured = {
+            "summary": "Solid week.",
+            "athletes": [{"athlete": "A1", "note": "Fast"}, {"athlete": "A9", "note": "?"}],
+        }
+
+        # Act
+        resolved = groups.resolve_labels(structured, labels)
+
+        # Assert
+        assert resolved["summary"] == "Solid week."
+        assert resolved["athletes"] == [{"athlete_id": athlete_id, "name": "Jane Doe", "note": "Fast"}]
+        assert json.loads(json.dumps(resolved)) == resolved
+
+    def test_resolved_sections_bind_to_jsonb(self):
+        """Test that notes resolved with the labels of real group inputs can be stored in the JSONB column."""
+        # Arrange
+        athlete_id = uuid.uuid4()
+        roster = [{"id": athlete_id, "full_name": "Jane Doe"}]
+        stats = {athlete_id: {"sessions": 3, "days": 3, "titles": ["Sprints"], "metrics": {}}}
+        structured = {"summary": "Solid week.", "athletes": [{"athlete": "A1", "note": "Fast"}]}
+
+        with (
+            patch.object(groups.coaching_service, "get_group_athletes", AsyncMock(return_value=roster)),
+            patch.object(groups, "weekly_stats", AsyncMock(return_value=stats)),
+        ):
+            inputs = asyncio.run(groups.group_insight_inputs(AsyncMock(), uuid.uuid4(), uuid.uuid4(), True))
+
+        # Act
+        resolved = groups.resolve_labels(structured, inputs.labels)
+        bound = JSONB().bind_processor(postgresql.dialect())(resolved)
+
+        # Assert
+        assert json.loads(bound)["athletes"] == [{"athlete_id": str(athlete_id), "name": "Jane Doe", "note": "Fast"}]
@@ -0,0 +1,161 @@
+"""Unit tests for the AI report job queue."""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy.dialects import postgresql
+
+from app.modules.ai import jobs as ai_jobs
+from app.modules.ai import models as ai_models
+from app.modules.ai import service as ai_service
+from app.modules.ai import summaries
+
+
+class TestClaimNextJob:
+    """Tests for claiming jobs across concurrent workers."""
+
+    def test_claim_skips_rows_locked_by_other_workers(self):
+        """Test that the claim is one UPDATE over a SKIP LOCKED candidate."""
+        # Arrange
+        result = Mock()
+        result.scalars.return_value.first.return_value = None
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act
+        claimed = asyncio.run(ai_jobs.claim_next_job(db))
+
+        # Assert
+        assert claimed is None
+        stmt = db.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE ai_report_jobs SET status=")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING" in sql
+        db.commit.assert_awaited_once()
+
+
+class TestEnqueueReportJob:
+    """Tests for queueing a report for an athlete."""
+
+    def test_unowned_athlete_raises_not_found(self):
+        """Test that nothing is queued for another coach's athlete."""
+        # Arrange
+        result = Mock()
+        result.scalars.return_value.first.return_value = None
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(ai_jobs.enqueue_report_job(db, ai_models.ReportKind.TALENT_REPORT, uuid.uuid4(), uuid.uuid4()))
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        db.commit.assert_not_awaited()
+
+    def test_duplicate_request_joins_the_in_flight_job(self):
+        """Test that a second request for the same inputs gets the job already queued for them."""
+        # Arrange
+        in_flight = Mock(spec=ai_models.ReportJob)
+        conflict, existing = Mock(), Mock()
+        conflict.scalars.return_value.first.return_value = None
+        existing.scalars.return_value.first.return_value = in_flight
+        db = AsyncMock()
+        db.execute.side_effect = [conflict, existing]
+        inputs = AsyncMock(return_value=ai_service.ReportInputs(input_hash="a" * 64, prompt="prompt"))
+
+        # Act
+        with patch.object(ai_service, "talent_report_inputs", inputs):
+            job = asyncio.run(
+                ai_jobs.enqueue_report_job(
+                    db, ai_models.ReportKind.TALENT_REPORT, uuid.uuid4(), uuid.uuid4(), force_refresh=True
+                )
+            )
+
+        # Assert
+        assert job is in_flight
+        sql = str(db.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (kind, athlete_id, coach_id, input_hash) WHERE status IN ('QUEUED', 'RUNNING')" in sql
+        assert "DO NOTHING" in sql
+
+    @patch("app.modules.ai.jobs.usage.check_budget", new_callable=AsyncMock)
+    @patch("app.modules.ai.service.prompts.workout_history", new_callable=AsyncMock)
+    @patch("app.modules.ai.service.analytics_service.athlete_features", new_callable=AsyncMock)
+    @patch("app.modules.ai.service.summaries.roll_forward", new_callable=AsyncMock)
+    @patch("app.modules.ai.service.coaching_service.get_athlete", new_callable=AsyncMock)
+    def test_forced_talent_report_rebuilds_the_digest(
+        self, mock_athlete, mock_roll_forward, mock_features, mock_history, mock_budget
+    ):
+        """Test that a forced talent report is queued with a digest rebuilt from the full history."""
+        # Arrange
+        athlete_id = uuid.uuid4()
+        mock_athlete.return_value = SimpleNamespace(full_name="Jane Doe", dob=None, notes=None)
+        mock_roll_forward.return_value = summaries.RolledSummary(
+            stats=None, through=None, revision=0, narrative=None, narrative_at=None, since=None
+        )
+        mock_features.return_value = {"sessions": 0}
+        mock_history.return_value = SimpleNamespace(text="")
+        inserted = Mock()
+        inserted.scalars.return_value.first.return_value = Mock(spec=ai_models.ReportJob)
+        db = AsyncMock()
+        db.execute.return_value = inserted
+
+        # Act
+        asyncio.run(
+            ai_jobs.enqueue_report_job(
+                db, ai_models.ReportKind.TALENT_REPORT, athlete_id, uuid.uuid4(), force_refresh=True
+            )
+        )
+
+        # Assert
+        mock_roll_forward.assert_awaited_once_with(db, athlete_id, rebuild=True)
+        db.commit.assert_awaited_once()
+
+
+class TestRunJob:
+    """Tests for running a claimed job."""
+
+    @patch("app.modules.ai.jobs.inflight.finish", new_callable=AsyncMock)
+    @patch("app.modules.ai.jobs.ai_service.generate_from_inputs", new_callable=AsyncMock)
+    @patch("app.modules.ai.jobs.scoping.fetch_scoped", new_callable=AsyncMock)
+    @patch("app.modules.ai.jobs.AsyncSessionLocal")
+    def test_stored_inputs_are_not_built_again(self, mock_session, mock_fetch, mock_generate, mock_finish):
+        """Test that the worker calls the provider with the prompt and digest stored when the job was queued."""
+        # Arrange
+        summary = summaries.RolledSummary(
+            stats={"sessions": 3, "first_date": "2026-10-01", "last_date": "2026-10-18", "titles": {}, "metrics": {}},
+            through=datetime(2026, 10, 18, 7, 30, 15, 120000),
+            revision=2,
+            narrative="Strong acceleration.",
+            narrative_at=datetime(2026, 10, 1, 9, 0),
+            since=None,
+        )
+        inputs = ai_service.ReportInputs(input_hash="a" * 64, prompt="prompt", summary=summary)
+        job = Mock(
+            spec=ai_models.ReportJob,
+            kind=ai_models.ReportKind.TALENT_REPORT,
+            athlete_id=uuid.uuid4(),
+            coach_id=uuid.uuid4(),
+            input_hash=inputs.input_hash,
+            force_refresh=False,
+            # Through the JSONB column and back
+            inputs=json.loads(json.dumps(ai_service.dump_inputs(inputs))),
+        )
+        mock_fetch.return_value = [(job.athlete_id, None)]
+
+        # Act
+        with patch.object(ai_service, "report_inputs", AsyncMock()) as mock_inputs:
+            asyncio.run(ai_jobs.run_job(job))
+
+        # Assert
+        mock_inputs.assert_not_awaited()
+        mock_generate.assert_awaited_once_with(job.kind, job.athlete_id, job.coach_id, inputs)
+        mock_finish.assert_awaited_once_with(
+            job.id, ai_models.ReportJobStatus.SUCCEEDED, report_id=mock_generate.return_value.id
+        )
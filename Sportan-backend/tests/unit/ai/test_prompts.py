@@ -0,0 +1,96 @@
+"""Unit tests for the token-budgeted workout history."""
+
+import asyncio
+import uuid
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, patch
+
+from app.modules.ai import prompts
+
+
+def recent(count: int) -> list[dict]:
+    today = date(2026, 10, 19)
+    return [
+        {
+            "date": today - timedelta(days=i),
+            "title": "Sprint intervals",
+            "metrics": {"60m": 9.1},
+            "notes": "Felt strong in the last reps",
+        }
+        for i in range(count)
+    ]
+
+
+def month(year: int, month_: int) -> dict:
+    return {
+        "month": date(year, month_, 1),
+        "sessions": 12,
+        "titles": ["Tempo run", "Sprint intervals"],
+        "metrics": [{"key": "60m", "avg": 9.25, "min": 8.9, "max": 9.6}],
+    }
+
+
+def build(budget: int, workouts: list[dict], months: list[dict]) -> tuple[prompts.WorkoutHistory, AsyncMock]:
+    # Both queries honour their limits in SQL; here they just slice the fixtures
+    async def recent_workouts(db, athlete_id, since, limit):
+        return workouts[:limit]
+
+    with (
+        patch.object(prompts, "_recent_workouts", recent_workouts),
+        patch.object(prompts, "_monthly_aggregates", AsyncMock(return_value=months)) as aggregates,
+    ):
+        history = asyncio.run(prompts.workout_history(None, uuid.uuid4(), budget))
+    return history, aggregates
+
+
+class TestMonthLine:
+    """Tests for the per-month summary line."""
+
+    def test_lists_sorted_titles_and_metric_stats(self):
+        """Test that a month renders its count, titles and avg (min-max) per metric."""
+        # Act
+        line = prompts.month_line(month(2026, 3))
+
+        # Assert
+        assert line == "- 2026-03: 12 sessions (Sprint intervals, Tempo run); 60m avg 9.25 (8.9-9.6)"
+
+
+class TestWorkoutHistory:
+    """Tests for fitting the history into the token budget."""
+
+    def test_short_history_is_listed_verbatim(self):
+        """Test that a history that fits is listed in full without aggregates."""
+        # Act
+        history, aggregates = build(1000, recent(5), [])
+
+        # Assert
+        assert history.verbatim_sessions == 5
+        assert history.aggregated_sessions == 0
+        aggregates.assert_not_awaited()
+
+    def test_long_history_stays_within_budget(self):
+        """Test that older sessions are summarised and the oldest months collapse to one line."""
+        # Arrange
+        months = [month(2026 - i // 12, 12 - i % 12) for i in range(120)]
+
+        # Act
+        history, aggregates = build(600, recent(400), months)
+
+        # Assert
+        assert history.tokens <= 600
+        assert 0 < history.verbatim_sessions < 400
+        assert history.aggregated_sessions == 120 * 12
+        assert "sessions over" in history.text.splitlines()[-1]
+
+    def test_cut_falls_on_a_day_boundary(self):
+        """Test that a day's sessions are never split between the listing and the aggregates."""
+        # Arrange
+        workouts = [w for w in recent(50) for _ in range(2)]
+
+        # Act
+        history, aggregates = build(400, workouts, [])
+
+        # Assert
+        assert history.verbatim_sessions % 2 == 0
+        through = aggregates.await_args.kwargs["through"]
+        assert through == workouts[history.verbatim_sessions]["date"]
@@ -0,0 +1,210 @@
+"""Unit tests for AI provider routing."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+from openai import BadRequestError, OpenAIError
+from pydantic import BaseModel
+
+from app.core.rate_limit import Limiter
+from app.modules.ai.providers import (
+    JSON_MODE_RETRY_SECONDS,
+    AIReportGenerationError,
+    CallWindow,
+    CircuitBreaker,
+    Provider,
+    ProviderRouter,
+)
+
+
+def fake_provider(
+    name: str,
+    latency: float = 0.0,
+    error: str | None = None,
+    json_mode: bool = True,
+    bad_request: dict | None = None,
+) -> Provider:
+    """A provider whose client answers with its own name after `latency` seconds, or raises.
+
+    With `json_mode=False` the client rejects `response_format` with a 400, like a text-only provider.
+    `bad_request` is the error body of a 400 for every call.
+    """
+    calls = []
+
+    def rejection(message: str, body: dict | None) -> BadRequestError:
+        request = httpx.Request("POST", "http://provider.test/v1/chat/completions")
+        return BadRequestError(message, response=httpx.Response(400, request=request), body=body)
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(latency)
+        if error:
+            raise OpenAIError(error)
+        if bad_request:
+            raise rejection(bad_request["message"], bad_request)
+        if "response_format" in kwargs and not json_mode:
+            raise rejection("response_format", None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"report from {name}"))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    provider = Provider(name, f"{name}-model", client, Limiter(concurrency=10, rate=1000, burst=1000))
+    provider.calls = calls
+    return provider
+
+
+class TestCallWindow:
+    """Tests for per-provider latency percentiles and error rate."""
+
+    def test_percentiles_and_error_rate(self):
+        """Test nearest-rank percentiles over recorded latencies and the share of failed calls."""
+        # Arrange
+        window = CallWindow(size=100)
+        for latency in range(1, 101):
+            window.record(ok=True, latency=latency / 100)
+        for _ in range(25):
+            window.record(ok=False)
+
+        # Act / Assert
+        assert window.percentile(50) == 0.5
+        assert window.percentile(95) == 0.95
+        assert window.error_rate == 0.25
+
+
+class TestCircuitBreaker:
+    """Tests for taking a failing provider out of rotation."""
+
+    def test_opens_then_allows_one_trial_after_cooldown(self):
+        """Test that the breaker opens after the threshold and lets a single call through after the cooldown."""
+        # Arrange
+        breaker = CircuitBreaker(threshold=3, cooldown=30)
+        clock = 1000.0
+
+        with patch("app.modules.ai.providers.time.monotonic", lambda: clock):
+            # Act
+            for _ in range(3):
+                breaker.record_failure()
+            opened = (breaker.state, breaker.allow())
+            clock += 31
+            trials = (breaker.allow(), breaker.allow())
+            breaker.record_failure()
+            reopened = breaker.state
+
+        # Assert
+        assert opened == ("open", False)
+        assert trials == (True, False)
+        assert reopened == "open"
+
+
+class TestJsonMode:
+    """Tests for structured output requests."""
+
+    def test_provider_without_json_mode_is_asked_for_text(self):
+        """Test that a 400 for response_format retries without it, is not a failure, and is remembered for a while."""
+
+        # Arrange
+        class Sections(BaseModel):
+            summary: str
+
+        provider = fake_provider("text-only", json_mode=False)
+
+        # Act
+        first = asyncio.run(provider.complete("prompt", Sections))
+        second = asyncio.run(provider.complete("prompt", Sections))
+
+        # Assert
+        assert first.text == second.text == "report from text-only"
+        assert [("response_format" in call) for call in provider.calls] == [True, False, False]
+        assert provider.window.error_rate == 0.0
+        assert provider.breaker.failures == 0
+
+    def test_json_mode_is_tried_again_after_the_retry_interval(self):
+        """Test that a rejection of response_format switches JSON mode off for a while, not for good."""
+
+        # Arrange
+        class Sections(BaseModel):
+            summary: str
+
+        provider = fake_provider("text-only", json_mode=False)
+        clock = 1000.0
+
+        # Only the provider's clock: asyncio's own must keep running
+        with patch("app.modules.ai.providers.time", SimpleNamespace(monotonic=lambda: clock)):
+            # Act
+            asyncio.run(provider.complete("prompt", Sections))
+            clock += JSON_MODE_RETRY_SECONDS + 1
+            asyncio.run(provider.complete("prompt", Sections))
+
+        # Assert
+        assert [("response_format" in call) for call in provider.calls] == [True, False, True, False]
+        assert provider.json_mode is True
+
+    def test_other_bad_requests_leave_json_mode_on(self):
+        """Test that a 400 about the prompt fails the call without falling back to text."""
+
+        # Arrange
+        class Sections(BaseModel):
+            summary: str
+
+        provider = fake_provider(
+            "strict",
+            bad_request={
+                "message": "This model's maximum context length is 8192 tokens.",
+                "type": "invalid_request_error",
+                "param": "messages",
+                "code": "context_length_exceeded",
+            },
+        )
+
+        # Act
+        with pytest.raises(AIReportGenerationError):
+            asyncio.run(provider.complete("prompt", Sections))
+        with pytest.raises(AIReportGenerationError):
+            asyncio.run(provider.complete("prompt", Sections))
+
+        # Assert
+        assert [("response_format" in call) for call in provider.calls] == [True, True]
+        assert provider.uses_json_mode is True
+        assert provider.breaker.failures == 2
+
+
+class TestProviderRouter:
+    """Tests for failover and hedged requests."""
+
+    def test_fails_over_to_the_next_provider(self):
+        """Test that a provider error sends the call to the next provider and counts against the first."""
+        # Arrange
+        primary = fake_provider("primary", error="overloaded")
+        backup = fake_provider("backup")
+        router = ProviderRouter([primary, backup], hedge_percentile=95, hedge_min_samples=20)
+
+        # Act
+        completion = asyncio.run(router.complete("prompt"))
+
+        # Assert
+        assert completion.text == "report from backup"
+        assert primary.window.error_rate == 1.0
+        assert backup.calls[0]["model"] == "backup-model"
+
+    def test_hedges_a_call_slower_than_the_percentile(self):
+        """Test that a duplicate goes to the next provider once the first runs past its p95, and the faster wins."""
+        # Arrange
+        primary = fake_provider("primary", latency=2.0)
+        backup = fake_provider("backup", latency=0.01)
+        for _ in range(20):
+            primary.window.record(ok=True, latency=0.05)
+        router = ProviderRouter([primary, backup], hedge_percentile=95, hedge_min_samples=20)
+
+        # Act
+        t0 = time.monotonic()
+        completion = asyncio.run(router.complete("prompt"))
+        elapsed = time.monotonic() - t0
+
+        # Assert
+        assert completion.text == "report from backup"
+        assert elapsed < 0.5
+        # The cancelled call still adds its lower-bound latency to the primary's window
+        assert primary.window.samples == 21
@@ -0,0 +1,75 @@
+"""Unit tests for content-addressed AI report caching."""
+
+import uuid
+from datetime import date, datetime
+from unittest.mock import patch
+
+from app.core import metrics
+from app.modules.ai import models as ai_models
+from app.modules.ai import service as ai_service
+
+
+def workout(day: int, title: str = "Sprint intervals", metrics_: dict | None = None) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "date": date(2026, 10, day),
+        "title": title,
+        "metrics": metrics_ or {"60m": 9.1},
+        "notes": None,
+        "created_at": datetime(2026, 10, day, 8, 0),
+    }
+
+
+def talent_hash(workouts: list[dict]) -> str:
+    return ai_service._input_hash(
+        ai_models.ReportKind.TALENT_REPORT,
+        ai_service.TALENT_PROMPT_VERSION,
+        profile={"full_name": "A", "dob": date(2012, 1, 1), "notes": None},
+        workouts=ai_service._prompt_workouts(workouts),
+    )
+
+
+class TestInputHash:
+    """Tests for the cache key over model, template version and prompt data."""
+
+    def test_same_inputs_in_any_order_share_a_key(self):
+        """Test that row order and row ids do not change the key."""
+        # Arrange
+        first, second = workout(1), workout(2, "Tempo run")
+
+        # Act & Assert
+        assert talent_hash([first, second]) == talent_hash([second, {**first, "id": uuid.uuid4()}])
+
+    def test_changed_workout_or_model_changes_the_key(self):
+        """Test that edited data or a different model never reuses a stored report."""
+        # Arrange
+        workouts = [workout(1), workout(2)]
+        baseline = talent_hash(workouts)
+
+        # Act
+        edited = talent_hash([workouts[0], {**workouts[1], "metrics": {"60m": 8.8}}])
+        with patch.object(ai_service.provider_router.providers[0], "model", "another-model"):
+            other_model = talent_hash(workouts)
+
+        # Assert
+        assert edited != baseline
+        assert other_model != baseline
+
+
+class TestMetricsSnapshot:
+    """Tests for hit-rate reporting."""
+
+    def test_hit_rate_from_hit_and_miss_counters(self):
+        """Test that hit/miss counter pairs are reported as a rate."""
+        # Arrange
+        metrics.reset()
+        metrics.increment("ai_report_cache.hit", 3)
+        metrics.increment("ai_report_cache.miss")
+
+        # Act
+        snapshot = metrics.snapshot()
+
+        # Assert
+        assert snapshot["counters"]["ai_report_cache.hit"] == 3
+        assert snapshot["hit_rates"] == {"ai_report_cache": 0.75}
+        metrics.reset()
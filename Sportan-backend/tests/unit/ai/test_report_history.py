@@ -0,0 +1,54 @@
+"""Unit tests for paging through an athlete's reports."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.modules.ai import models as ai_models
+from app.modules.ai import service as ai_service
+
+
+def reports(athlete_id: uuid.UUID, count: int) -> list[SimpleNamespace]:
+    newest = datetime(2026, 10, 19)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            athlete_id=athlete_id,
+            report_text=f"Report {index}",
+            sections=None,
+            created_at=newest - timedelta(days=index),
+        )
+        for index in range(count)
+    ]
+
+
+class TestReportHistory:
+    """Tests for keyset pages of talent reports."""
+
+    def test_page_continues_after_the_cursor_and_points_at_the_next(self):
+        """Test that a page is a keyset read after `before` and `next_before` is its last report."""
+        # Arrange
+        athlete_id = uuid.uuid4()
+        page = reports(athlete_id, 3)
+        result = Mock()
+        result.all.return_value = [(athlete_id, report) for report in page]
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act
+        history = asyncio.run(
+            ai_service.list_report_history(
+                db, ai_models.ReportKind.TALENT_REPORT, athlete_id, uuid.uuid4(), before=uuid.uuid4(), limit=2
+            )
+        )
+
+        # Assert
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "(talent_reports.created_at, talent_reports.id) < (SELECT" in sql
+        assert "ORDER BY talent_reports.created_at DESC, talent_reports.id DESC" in sql
+        assert [item.report_text for item in history.items] == ["Report 0", "Report 1"]
+        assert history.next_before == page[1].id
@@ -0,0 +1,220 @@
+"""Unit tests for streamed AI report generation."""
+
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.modules.ai import inflight
+from app.modules.ai import models as ai_models
+from app.modules.ai import service as ai_service
+
+
+def prepared(prompt: str | None = "Analyze", athlete_id: uuid.UUID | None = None) -> ai_service.PreparedReport:
+    return ai_service.PreparedReport(
+        kind=ai_models.ReportKind.WEEKLY_INSIGHT,
+        athlete_id=athlete_id or uuid.uuid4(),
+        coach_id=uuid.UUID(int=1),
+        inputs=ai_service.ReportInputs(input_hash="0" * 64, prompt=prompt),
+        cached=None,
+    )
+
+
+def saved_report(athlete_id: uuid.UUID, text: str) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), athlete_id=athlete_id, report_text=text, created_at=datetime(2026, 10, 19))
+
+
+async def events_of(report: ai_service.PreparedReport) -> list[tuple[str, dict]]:
+    return [event async for event in ai_service.stream_report(report)]
+
+
+def collect(report: ai_service.PreparedReport) -> list[tuple[str, dict]]:
+    return asyncio.run(events_of(report))
+
+
+class FakeInflight:
+    """In-memory ai.inflight: one in-flight job per (athlete, input hash), like the partial unique index."""
+
+    def __init__(self):
+        self.jobs: dict[uuid.UUID, SimpleNamespace] = {}
+        self.in_flight: dict[tuple, SimpleNamespace] = {}
+
+    async def claim(self, kind, athlete_id, coach_id, input_hash, inputs, force_refresh=False):
+        key = (kind, athlete_id, coach_id, input_hash)
+        if key in self.in_flight:
+            return self.in_flight[key], False
+        job = SimpleNamespace(
+            id=uuid.uuid4(), key=key, status=ai_models.ReportJobStatus.RUNNING, report_id=None, error=None
+        )
+        self.jobs[job.id] = self.in_flight[key] = job
+        return job, True
+
+    async def finish(self, job_id, status, report_id=None, error=None):
+        job = self.jobs[job_id]
+        job.status, job.report_id, job.error = status, report_id, error
+        del self.in_flight[job.key]
+
+    async def requeue(self, job_id):
+        self.jobs[job_id].status = ai_models.ReportJobStatus.QUEUED
+
+    async def wait_for(self, job_id):
+        while self.jobs[job_id].status not in inflight.FINISHED:
+            await asyncio.sleep(0)
+        return self.jobs[job_id]
+
+
+class TestStreamReport:
+    """Tests for forwarding provider deltas and saving the assembled report."""
+
+    def test_deltas_are_forwarded_then_the_full_text_is_saved(self):
+        """Test that each provider delta becomes an event and the joined text is stored once."""
+        # Arrange
+        report = prepared()
+        jobs = FakeInflight()
+
+        async def provider(prompt, usage):
+            for text in ("Solid", " week", "."):
+                yield text
+
+        save = AsyncMock(side_effect=lambda model, athlete_id, text, *args: saved_report(athlete_id, text))
+
+        # Act
+        with (
+            patch.object(ai_service, "inflight", jobs),
+            patch.object(ai_service, "_stream_ai_report", provider),
+            patch.object(ai_service, "_save_report", save),
+        ):
+            events = collect(report)
+
+        # Assert
+        assert [data["text"] for event, data in events if event == "delta"] == ["Solid", " week", "."]
+        assert events[-1][0] == "done"
+        assert events[-1][1]["report"].report_text == "Solid week."
+        save.assert_awaited_once()
+        [job] = jobs.jobs.values()
+        assert job.status == ai_models.ReportJobStatus.SUCCEEDED
+        assert job.report_id == events[-1][1]["report"].id
+
+    def test_provider_failure_ends_with_an_error_and_saves_nothing(self):
+        """Test that a provider error mid-stream is reported as an event, not a saved report."""
+        # Arrange
+        report = prepared()
+        jobs = FakeInflight()
+
+        async def provider(prompt, usage):
+            yield "Solid"
+            raise ai_service.AIReportGenerationError("AI provider error: overloaded")
+
+        save = AsyncMock()
+
+        # Act
+        with (
+            patch.object(ai_service, "inflight", jobs),
+            patch.object(ai_service, "_stream_ai_report", provider),
+            patch.object(ai_service, "_save_report", save),
+        ):
+            events = collect(report)
+
+        # Assert
+        assert events == [("delta", {"text": "Solid"}), ("error", {"detail": "AI provider error: overloaded"})]
+        save.assert_not_awaited()
+        [job] = jobs.jobs.values()
+        assert job.status == ai_models.ReportJobStatus.FAILED
+        assert job.error == "AI provider error: overloaded"
+
+
+class TestConcurrentStreams:
+    """Tests for streams of the same inputs sharing one provider call."""
+
+    def test_second_stream_waits_for_the_first_report(self):
+        """Test that two concurrent streams for the same hash call the provider once and end with the same report."""
+        # Arrange
+        athlete_id = uuid.uuid4()
+        jobs = FakeInflight()
+        saved = {}
+        calls = []
+
+        async def provider(prompt, usage):
+            calls.append(prompt)
+            for text in ("Solid", " week", "."):
+                await asyncio.sleep(0)
+                yield text
+
+        async def save(model, athlete_id, text, *args):
+            report = saved_report(athlete_id, text)
+            saved[report.id] = report
+            return report
+
+        async def load(kind, report_id):
+            return saved.get(report_id)
+
+        async def both():
+            return await asyncio.gather(
+                events_of(prepared(athlete_id=athlete_id)), events_of(prepared(athlete_id=athlete_id))
+            )
+
+        # Act
+        with (
+            patch.object(ai_service, "inflight", jobs),
+            patch.object(ai_service, "_stream_ai_report", provider),
+            patch.object(ai_service, "_save_report", save),
+            patch.object(ai_service, "_load_report", load),
+        ):
+            first, second = asyncio.run(both())
+
+        # Assert
+        assert len(calls) == 1
+        assert len(saved) == 1
+        assert [data["text"] for event, data in first if event == "delta"] == ["Solid", " week", "."]
+        assert second[0] == ("delta", {"text": "Solid week."})
+        assert first[-1][0] == second[-1][0] == "done"
+        assert first[-1][1]["report"].id == second[-1][1]["report"].id
+
+    def test_waiting_stream_gets_the_first_streams_error(self):
+        """Test that a stream waiting on a failed generation ends with that error and calls no provider."""
+        # Arrange
+        athlete_id = uuid.uuid4()
+        jobs = FakeInflight()
+        calls = []
+
+        async def provider(prompt, usage):
+            calls.append(prompt)
+            await asyncio.sleep(0)
+            raise ai_service.AIReportGenerationError("AI provider error: overloaded")
+            yield
+
+        async def both():
+            return await asyncio.gather(
+                events_of(prepared(athlete_id=athlete_id)), events_of(prepared(athlete_id=athlete_id))
+            )
+
+        # Act
+        with patch.object(ai_service, "inflight", jobs), patch.object(ai_service, "_stream_ai_report", provider):
+            first, second = asyncio.run(both())
+
+        # Assert
+        assert len(calls) == 1
+        assert first == second == [("error", {"detail": "AI provider error: overloaded"})]
+
+    def test_disconnect_hands_the_job_to_the_workers(self):
+        """Test that closing the stream mid-generation puts its job back in the queue."""
+        # Arrange
+        jobs = FakeInflight()
+
+        async def provider(prompt, usage):
+            yield "Solid"
+            yield " week"
+
+        async def disconnect():
+            stream = ai_service.stream_report(prepared())
+            await anext(stream)
+            await stream.aclose()
+
+        # Act
+        with patch.object(ai_service, "inflight", jobs), patch.object(ai_service, "_stream_ai_report", provider):
+            asyncio.run(disconnect())
+
+        # Assert
+        [job] = jobs.jobs.values()
+        assert job.status == ai_models.ReportJobStatus.QUEUED
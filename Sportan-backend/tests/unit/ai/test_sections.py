@@ -0,0 +1,37 @@
+"""Unit tests for structured AI report sections."""
+
+from app.modules.ai import models as ai_models
+from app.modules.ai import sections
+
+TALENT = ai_models.ReportKind.TALENT_REPORT
+
+
+class TestParse:
+    """Tests for validating provider replies against the sections schema."""
+
+    def test_fenced_json_is_validated(self):
+        """Test that a JSON object inside a markdown fence is parsed and checked against the schema."""
+        # Arrange
+        reply = """```json
+        {"strengths": ["Fast starts"], "areas_to_improve": ["Endurance"], "specialization": "Sprinter",
+         "recommendations": ["Long aerobic runs"], "focus_areas": ["endurance"]}
+        ```"""
+
+        # Act
+        parsed = sections.parse(TALENT, reply)
+
+        # Assert
+        assert parsed["focus_areas"] == ["endurance"]
+        assert sections.render(TALENT, parsed).startswith("Strengths:\n- Fast starts")
+
+    def test_prose_or_unknown_focus_area_is_not_sections(self):
+        """Test that replies which are not valid sections fall back to text."""
+        # Arrange
+        invalid = (
+            '{"strengths": [], "areas_to_improve": [], "specialization": "", '
+            '"recommendations": [], "focus_areas": ["juggling"]}'
+        )
+
+        # Act & Assert
+        assert sections.parse(TALENT, "Strengths: fast starts.") is None
+        assert sections.parse(TALENT, invalid) is None
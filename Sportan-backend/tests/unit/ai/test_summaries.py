@@ -0,0 +1,146 @@
+"""Unit tests for the rolling athlete digest."""
+
+import asyncio
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from app.modules.ai import summaries
+
+
+def stats(sessions: int, first: str, last: str, titles: dict, metrics: dict) -> dict:
+    return {"sessions": sessions, "first_date": first, "last_date": last, "titles": titles, "metrics": metrics}
+
+
+class TestMergeStats:
+    """Tests for folding newly logged workouts into the stored digest."""
+
+    def test_merge_matches_aggregating_everything_at_once(self):
+        """Test that counts and sums add, ranges widen and dates extend."""
+        # Arrange
+        old = stats(
+            3, "2026-01-05", "2026-03-01", {"Run": 3}, {"60m": {"count": 3, "sum": 27.5, "min": 9.0, "max": 9.25}}
+        )
+        new = stats(
+            2,
+            "2026-03-02",
+            "2026-03-09",
+            {"Run": 1, "Hills": 1},
+            {
+                "60m": {"count": 1, "sum": 8.75, "min": 8.75, "max": 8.75},
+                "hills": {"count": 1, "sum": 10, "min": 10, "max": 10},
+            },
+        )
+
+        # Act
+        merged = summaries.merge_stats(old, new)
+
+        # Assert
+        assert merged == stats(
+            5,
+            "2026-01-05",
+            "2026-03-09",
+            {"Run": 4, "Hills": 1},
+            {
+                "60m": {"count": 4, "sum": 36.25, "min": 8.75, "max": 9.25},
+                "hills": {"count": 1, "sum": 10, "min": 10, "max": 10},
+            },
+        )
+        assert old["metrics"]["60m"]["count"] == 3
+
+    def test_nothing_new_keeps_the_stored_digest(self):
+        """Test that an empty delta leaves the digest as it was."""
+        # Arrange
+        old = stats(1, "2026-01-05", "2026-01-05", {"Run": 1}, {})
+
+        # Act & Assert
+        assert summaries.merge_stats(old, None) == old
+        assert summaries.merge_stats(None, old) == old
+
+
+def _session(stored, *aggregates):
+    """An AsyncSession mock with `stored` as the digest and, per aggregate, its first row then title rows."""
+    results = []
+    for first, titles in aggregates:
+        head, title_rows, metric_rows = Mock(), Mock(), Mock()
+        head.one.return_value = first
+        title_rows.all.return_value = titles
+        metric_rows.all.return_value = []
+        results.extend([head, title_rows, metric_rows])
+    db = AsyncMock()
+    db.get.return_value = stored
+    db.execute.side_effect = results
+    return db
+
+
+class TestRollForward:
+    """Tests for folding new workouts into the stored digest."""
+
+    stored = SimpleNamespace(
+        stats=stats(3, "2026-10-01", "2026-10-10", {"Run": 3}, {}),
+        through=datetime(2026, 10, 10, 8, 0),
+        revision=2,
+        narrative="Strong acceleration.",
+        narrative_at=datetime(2026, 10, 10, 9, 0),
+    )
+
+    def test_new_workouts_are_folded_in(self):
+        """Test that workouts logged after `through` are added to the stored stats."""
+        # Arrange
+        logged = datetime(2026, 10, 12, 7, 0)
+        db = _session(self.stored, ((1, date(2026, 10, 12), date(2026, 10, 12), logged, 4), [("Hills", 1)]))
+
+        # Act
+        rolled = asyncio.run(summaries.roll_forward(db, uuid.uuid4()))
+
+        # Assert
+        assert rolled.stats == stats(4, "2026-10-01", "2026-10-12", {"Run": 3, "Hills": 1}, {})
+        assert rolled.through == logged and rolled.since == self.stored.through
+        assert db.execute.await_count == 3
+
+    def test_workout_committed_below_the_watermark_triggers_a_rebuild(self):
+        """Test that a digest missing a workout logged before `through` is rebuilt from the full history."""
+        # Arrange
+        logged = datetime(2026, 10, 12, 7, 0)
+        db = _session(
+            self.stored,
+            # One new workout, but the athlete has five: one committed late, below `through`
+            ((1, date(2026, 10, 12), date(2026, 10, 12), logged, 5), [("Hills", 1)]),
+            ((5, date(2026, 10, 1), date(2026, 10, 12), logged, 5), [("Run", 4), ("Hills", 1)]),
+        )
+
+        # Act
+        rolled = asyncio.run(summaries.roll_forward(db, uuid.uuid4()))
+
+        # Assert
+        assert rolled.stats == stats(5, "2026-10-01", "2026-10-12", {"Run": 4, "Hills": 1}, {})
+        assert rolled.through == logged
+        assert rolled.since is None
+        assert rolled.narrative == "Strong acceleration." and rolled.revision == 2
+        assert db.execute.await_count == 6
+
+
+class TestDigestText:
+    """Tests for the digest as shown in prompts."""
+
+    def test_renders_counts_titles_and_metric_averages(self):
+        """Test that the digest lists sessions, most frequent titles and metric avg/range."""
+        # Arrange
+        digest = stats(
+            4,
+            "2026-01-05",
+            "2026-03-09",
+            {"Run": 3, "Hills": 1},
+            {"60m": {"count": 4, "sum": 36.4, "min": 8.8, "max": 9.4}},
+        )
+
+        # Act
+        text = summaries.digest_text(digest)
+
+        # Assert
+        assert text.splitlines() == [
+            "- 4 sessions from 2026-01-05 to 2026-03-09",
+            "- Most frequent: Run (3), Hills (1)",
+            "- 60m: avg 9.10, range 8.8-9.4 over 4 sessions",
+        ]
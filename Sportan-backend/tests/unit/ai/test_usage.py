@@ -0,0 +1,69 @@
+"""Unit tests for AI usage metering and daily token budgets."""
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.rate_limit import Limiter
+from app.modules.ai import models as ai_models
+from app.modules.ai import usage
+from app.modules.ai.providers import Provider, Usage
+
+
+def provider_replying(reported) -> Provider:
+    async def create(**kwargs):
+        message = SimpleNamespace(content="Solid week of training.")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=reported)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return Provider("primary", "primary-model", client, Limiter(concurrency=1, rate=1000, burst=1000))
+
+
+class TestProviderUsage:
+    """Tests for the usage reported with each completion."""
+
+    def test_reported_tokens_are_kept_and_missing_ones_estimated(self):
+        """Test that the provider's token counts are used, and estimated from the text when absent."""
+        # Arrange
+        reported = SimpleNamespace(prompt_tokens=120, completion_tokens=30)
+
+        # Act
+        metered = asyncio.run(provider_replying(reported).complete("x" * 400)).usage
+        estimated = asyncio.run(provider_replying(None).complete("x" * 400)).usage
+
+        # Assert
+        assert (metered.provider, metered.model) == ("primary", "primary-model")
+        assert (metered.prompt_tokens, metered.completion_tokens, metered.estimated) == (120, 30, False)
+        assert (estimated.prompt_tokens, estimated.completion_tokens, estimated.estimated) == (100, 6, True)
+
+
+class TestDailyBudget:
+    """Tests for rejecting provider calls once a coach's tokens for the day are used up."""
+
+    def test_buffered_usage_counts_against_the_budget(self):
+        """Test that events not yet written are added to the stored total before comparing to the budget."""
+        # Arrange
+        coach_id = uuid.uuid4()
+        writer = usage.UsageWriter(batch_size=100, flush_seconds=60, max_pending=100)
+        writer.record(coach_id, uuid.uuid4(), ai_models.ReportKind.TALENT_REPORT, Usage("p", "m", 150, 50))
+        writer.record(uuid.uuid4(), uuid.uuid4(), ai_models.ReportKind.TALENT_REPORT, Usage("p", "m", 5000, 0))
+        result = Mock()
+        result.scalar_one.return_value = 850
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act
+        with (
+            patch.object(usage, "usage_writer", writer),
+            patch.object(usage.settings, "AI_COACH_DAILY_TOKEN_BUDGET", 1000),
+            pytest.raises(HTTPException) as raised,
+        ):
+            asyncio.run(usage.check_budget(db, coach_id))
+
+        # Assert
+        assert raised.value.status_code == 429
+        assert 0 < int(raised.value.headers["Retry-After"]) <= 86400
@@ -0,0 +1,146 @@
+"""Unit tests for numeric talent indicators."""
+
+import uuid
+from datetime import date
+
+import numpy as np
+
+from app.modules.analytics import features, similarity
+
+
+def observations(sessions: list[tuple[int, int]], values: list[tuple[int, str, int, float]]) -> features.Observations:
+    """Observations from (athlete, day) sessions and (athlete, key, day, value) metric rows."""
+    keys = sorted({key for _, key, _, _ in values})
+    return features.Observations(
+        session_athlete=np.array([a for a, _ in sessions], dtype=np.int64),
+        session_day=np.array([d for _, d in sessions], dtype=np.int64),
+        metric_athlete=np.array([a for a, _, _, _ in values], dtype=np.int64),
+        metric_key=np.array([keys.index(k) for _, k, _, _ in values], dtype=np.int64),
+        metric_day=np.array([d for _, _, d, _ in values], dtype=np.int64),
+        metric_value=np.array([v for _, _, _, v in values], dtype=float),
+        keys=keys,
+    )
+
+
+class TestTrainingFeatures:
+    """Tests for per-athlete features from grouped sums."""
+
+    def test_consistency_trend_and_direction(self):
+        """Test weeks-active consistency, and that a falling sprint time is an improvement."""
+        # Arrange
+        today = features.WINDOW_DAYS
+        sessions = [(0, today - 20), (0, today - 13), (0, today - 12), (0, today)]
+        values = [(0, "60m", today - 20, 9.0), (0, "60m", today - 12, 8.8), (0, "60m", today, 8.5)]
+
+        # Act
+        athlete, idle = features.training_features(observations(sessions, values), athlete_count=2)
+
+        # Assert
+        assert athlete["sessions"] == 4
+        # Active in every week since the first session
+        assert athlete["consistency"] == 1.0
+        assert athlete["metrics"]["60m"]["trend_per_30d"] < 0
+        assert athlete["metrics"]["60m"]["improvement"] > 0
+        assert idle == {"sessions": 0, "sessions_per_week": 0.0, "consistency": 0.0, "metrics": {}}
+
+
+class TestPercentiles:
+    """Tests for ranking athletes within their group."""
+
+    def test_mid_rank_within_groups(self):
+        """Test that ranks are per group, ties share a rank, and NaN is left out."""
+        # Arrange
+        values = np.array([1.0, 2.0, 3.0, 5.0, 5.0, np.nan, 7.0])
+        groups = np.array([0, 0, 0, 1, 1, 1, 2])
+
+        # Act
+        percentiles = features.group_percentiles(values, groups)
+
+        # Assert
+        assert percentiles[:5].tolist() == [0.0, 50.0, 100.0, 50.0, 50.0]
+        assert np.isnan(percentiles[5])
+        assert percentiles[6] == 50.0
+
+    def test_scores_rank_against_the_age_band(self):
+        """Test that the faster sprinter of a band gets the higher percentile and score."""
+        # Arrange
+        today = date(2026, 6, 1)
+        bands = [features.age_band(dob, today) for dob in (date(2014, 1, 1), date(2014, 3, 1), date(2010, 1, 1))]
+        stats = [
+            {
+                "sessions": 4,
+                "sessions_per_week": 1.0,
+                "consistency": 1.0,
+                "metrics": {"60m": {"mean": mean, "improvement": None}},
+            }
+            for mean in (8.5, 9.5, 10.0)
+        ]
+
+        # Act
+        scores = features.cohort_scores(stats, bands)
+
+        # Assert
+        assert bands == ["12-13", "12-13", "16-17"]
+        assert [s["metrics"]["60m"]["percentile"] for s in stats] == [100.0, 0.0, 50.0]
+        assert scores[0] > scores[1]
+
+
+class TestQuantiles:
+    """Tests for norm tables and lookups in them."""
+
+    def test_group_quantiles_match_numpy_per_group(self):
+        """Test that one sort gives the same quantiles as np.quantile on each group."""
+        # Arrange
+        rng = np.random.default_rng(0)
+        values = rng.normal(10, 2, 500)
+        groups = rng.integers(0, 7, 500)
+        levels = np.linspace(0, 1, 101)
+
+        # Act
+        codes, tables = features.group_quantiles(values, groups, levels)
+
+        # Assert
+        for code, table in zip(codes, tables, strict=True):
+            np.testing.assert_allclose(table, np.quantile(values[groups == code], levels))
+
+    def test_percentile_lookup_interpolates_and_clamps(self):
+        """Test lookups between, on and outside the table's quantiles."""
+        # Arrange
+        quantiles = np.array([1.0, 2.0, 2.0, 2.0, 3.0])
+
+        # Act & Assert
+        assert features.percentile_of(quantiles, 1.5) == 12.5
+        assert features.percentile_of(quantiles, 2.0) == 50.0
+        assert features.percentile_of(quantiles, 0.0) == 0.0
+        assert features.percentile_of(quantiles, 9.0) == 100.0
+
+
+class TestSimilarity:
+    """Tests for nearest neighbours over athlete feature vectors."""
+
+    def test_nearest_compares_only_the_query_athletes_metrics(self):
+        """Test that neighbours are ranked on the metrics the athlete logs, and idle athletes are left out."""
+
+        # Arrange
+        def stored(percentiles: dict[str, float], sessions: int = 5) -> dict:
+            metrics = {key: {"percentile": value} for key, value in percentiles.items()}
+            return {"sessions": sessions, "volume_percentile": 50.0, "consistency": 0.5, "metrics": metrics}
+
+        sprinter, close, far, jumper, idle = (uuid.uuid4() for _ in range(5))
+        index = similarity.build_index(
+            [
+                (sprinter, stored({"60m": 90.0})),
+                (close, stored({"60m": 80.0, "long_jump": 5.0})),
+                (far, stored({"60m": 10.0})),
+                (jumper, stored({"long_jump": 95.0})),
+                (idle, stored({"60m": 90.0}, sessions=0)),
+            ]
+        )
+
+        # Act
+        matches = similarity.nearest(index, sprinter, k=2)
+
+        # Assert
+        assert idle not in index.position
+        assert [athlete_id for athlete_id, _ in matches] == [close, jumper]
+        assert matches[0][1] < matches[1][1]
@@ -0,0 +1,120 @@
+"""Unit tests for refreshing stored talent scores."""
+
+import asyncio
+import uuid
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pytest
+from fastapi import HTTPException, status
+
+from app.modules.analytics import features
+from app.modules.analytics import service as analytics_service
+
+
+def observations(sessions: list[tuple[int, int]]) -> features.Observations:
+    """Observations with only (athlete, day) sessions."""
+    return features.Observations(
+        session_athlete=np.array([a for a, _ in sessions], dtype=np.int64),
+        session_day=np.array([d for _, d in sessions], dtype=np.int64),
+        metric_athlete=np.array([], dtype=np.int64),
+        metric_key=np.array([], dtype=np.int64),
+        metric_day=np.array([], dtype=np.int64),
+        metric_value=np.array([], dtype=float),
+        keys=[],
+    )
+
+
+def stored_features(days: list[int]) -> dict:
+    return features.training_features(observations([(0, day) for day in days]), 1)[0]
+
+
+def roster_row(computed_on: date | None, days: list[int], window_sessions: int | None = None):
+    """A roster row whose stored features came from sessions on `days`; the window now holds `window_sessions`."""
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        dob=date(2010, 5, 1),
+        features=stored_features(days),
+        computed_on=computed_on,
+        latest=datetime(2026, 10, 18, 9, 0),
+        window_sessions=len(days) if window_sessions is None else window_sessions,
+    )
+
+
+def _session(roster):
+    result = Mock()
+    result.all.return_value = roster
+    db = AsyncMock()
+    db.execute.side_effect = [result, Mock()]
+    return db
+
+
+class TestRefreshCoachScores:
+    """Tests for recomputing only stale athletes and re-ranking the whole roster."""
+
+    def test_fresh_roster_is_not_recomputed(self):
+        """Test that a roster scored today from the workouts now in its window reads nothing and writes nothing."""
+        # Arrange
+        today = datetime.now(UTC).date()
+        db = _session([roster_row(today, [1, 8]), roster_row(today, [])])
+
+        # Act
+        with patch.object(analytics_service, "observations", AsyncMock()) as mock_observations:
+            recomputed = asyncio.run(analytics_service.refresh_coach_scores(db, uuid.uuid4()))
+
+        # Assert
+        assert recomputed == 0
+        mock_observations.assert_not_awaited()
+        db.execute.assert_awaited_once()
+        db.commit.assert_not_awaited()
+
+    def test_only_stale_athletes_are_read_and_everyone_is_ranked(self):
+        """Test that only athletes whose window count changed are read, and all rows are re-ranked and upserted."""
+        # Arrange
+        today = datetime.now(UTC).date()
+        fresh = roster_row(today, [1, 8, 15])
+        # Its newest created_at is unchanged: the new workout committed late, with an older one
+        new_workout = roster_row(today, [1], window_sessions=2)
+        never_scored = roster_row(None, [], window_sessions=1)
+        db = _session([fresh, new_workout, never_scored])
+        obs = observations([(0, 1), (0, 2), (1, 3)])
+
+        # Act
+        with patch.object(analytics_service, "observations", AsyncMock(return_value=obs)) as mock_observations:
+            recomputed = asyncio.run(analytics_service.refresh_coach_scores(db, uuid.uuid4()))
+
+        # Assert
+        assert recomputed == 2
+        mock_observations.assert_awaited_once_with(db, [new_workout.id, never_scored.id], today)
+        rows = db.execute.await_args_list[1].args[1]
+        assert [row["athlete_id"] for row in rows] == [fresh.id, new_workout.id, never_scored.id]
+        assert rows[0]["features"]["sessions"] == 3
+        assert [row["features"]["sessions"] for row in rows[1:]] == [2, 1]
+        assert all(row["score"] is not None and row["computed_on"] == today for row in rows)
+        assert all(row["features"]["volume_percentile"] is not None for row in rows)
+        db.commit.assert_awaited_once()
+
+
+class TestScoreReads:
+    """Tests for reading scores after a refresh."""
+
+    def test_athlete_score_of_another_coach_is_not_found(self):
+        """Test that the read refreshes the coach's roster first and answers 404 for an athlete not in it."""
+        # Arrange
+        coach_id = uuid.uuid4()
+        result = Mock()
+        result.first.return_value = None
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act & Assert
+        with (
+            patch.object(analytics_service, "refresh_coach_scores", AsyncMock()) as mock_refresh,
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            asyncio.run(analytics_service.get_athlete_score(db, uuid.uuid4(), coach_id))
+
+        mock_refresh.assert_awaited_once_with(db, coach_id)
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
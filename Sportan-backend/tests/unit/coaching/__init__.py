@@ -0,0 +1 @@
+# Coaching unit tests module
@@ -0,0 +1,43 @@
+"""Unit tests for the coach's athlete typeahead."""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.modules.ai import models as ai_models  # noqa: F401
+from app.modules.coaching import service as coaching_service
+from app.modules.training import models as training_models  # noqa: F401
+
+
+class TestSearchAthletes:
+    """Tests for matching athletes by their own or their parent's name and email."""
+
+    def test_like_wildcards_in_the_query_are_escaped(self):
+        """Test that % and _ typed by the coach match literally."""
+        # Act & Assert
+        assert coaching_service._contains_pattern("ann") == "%ann%"
+        assert coaching_service._contains_pattern("50%_x\\") == "%50\\%\\_x\\\\%"
+
+    def test_both_branches_are_scoped_to_the_coach(self):
+        """Test that athlete and parent matches are each restricted to the coach, then limited to k."""
+        # Arrange
+        coach_id = uuid.uuid4()
+        result = Mock()
+        result.all.return_value = []
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act
+        hits = asyncio.run(coaching_service.search_athletes(db, coach_id, "jo", k=5))
+        stmt = db.execute.await_args.args[0]
+        # The app's dialect: the default psycopg2 one would render % as %%
+        sql = str(stmt.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+
+        # Assert
+        assert hits == []
+        assert sql.count(f"athletes.coach_id = '{coach_id}'") == 2
+        assert "'jo' <% athletes.full_name" in sql
+        assert "'jo' <% parents.email" in sql
+        assert "LIMIT 5" in sql
@@ -0,0 +1,63 @@
+"""Unit tests for the coach bootstrap payload."""
+
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.modules.coaching import bootstrap
+from app.modules.coaching import models as coaching_models
+from app.modules.identity import models as identity_models
+from app.modules.training import models as training_models
+from app.modules.training.models import WorkoutStatus
+
+
+class TestLoadBootstrap:
+    """Tests for the lists and counts built from the four reads."""
+
+    def test_lists_and_counts_agree_with_the_rows(self):
+        """Test that athletes appear once, ungrouped athletes are counted, and assignments split by day."""
+        # Arrange
+        today = datetime.now(UTC).date()
+        coach = SimpleNamespace(id=uuid.uuid4(), email="coach@example.com", full_name="Coach", created_at=None)
+        sprinters, jumpers = uuid.uuid4(), uuid.uuid4()
+        both, one, none = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        rows = {
+            coaching_models.Group: [{"id": sprinters, "name": "Sprinters"}, {"id": jumpers, "name": "Jumpers"}],
+            coaching_models.GroupAthlete: [
+                {"group_id": sprinters, "athlete_id": both},
+                {"group_id": jumpers, "athlete_id": both},
+                {"group_id": jumpers, "athlete_id": one},
+            ],
+            identity_models.Athlete: [{"id": both}, {"id": one}, {"id": none}],
+            training_models.AssignedWorkout: [
+                {"id": uuid.uuid4(), "scheduled_date": today, "status": WorkoutStatus.PENDING},
+                {"id": uuid.uuid4(), "scheduled_date": today, "status": WorkoutStatus.COMPLETED},
+                {"id": uuid.uuid4(), "scheduled_date": today, "status": WorkoutStatus.SKIPPED},
+                {"id": uuid.uuid4(), "scheduled_date": today + timedelta(days=2), "status": WorkoutStatus.PENDING},
+            ],
+        }
+
+        async def read(query):
+            return rows[query.column_descriptions[0]["entity"]]
+
+        # Act
+        with patch.object(bootstrap, "_read", read):
+            payload = asyncio.run(bootstrap.load_bootstrap(coach))
+
+        # Assert
+        assert [athlete["id"] for athlete in payload["athletes"]] == [both, one, none]
+        assert len(payload["memberships"]) == 3
+        assert [a["scheduled_date"] for a in payload["assignments_today"]] == [today] * 3
+        assert [a["scheduled_date"] for a in payload["assignments_upcoming"]] == [today + timedelta(days=2)]
+        assert payload["upcoming_until"] == today + timedelta(days=bootstrap.UPCOMING_DAYS)
+        assert payload["counts"] == {
+            "groups": 2,
+            "athletes": 3,
+            "athletes_without_group": 1,
+            "assignments_today": 3,
+            "assignments_today_pending": 1,
+            "assignments_today_completed": 1,
+            "assignments_upcoming": 1,
+        }
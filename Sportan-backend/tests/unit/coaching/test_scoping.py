@@ -0,0 +1,83 @@
+"""Unit tests for coach ownership scoping helpers."""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.modules.ai import models as ai_models  # noqa: F401
+from app.modules.coaching import scoping
+from app.modules.identity import models as identity_models
+from app.modules.training import models as training_models
+
+
+def compile_sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestScopedStatements:
+    """Tests that the coach predicate is folded into the main statement."""
+
+    def test_owned_athlete_outer_joins_data_onto_anchor(self):
+        """Test that athlete data is outer-joined onto the owned athlete row."""
+        # Arrange
+        athlete_id, coach_id = uuid.uuid4(), uuid.uuid4()
+
+        # Act
+        stmt = (
+            scoping.owned_athlete(athlete_id, coach_id)
+            .add_columns(training_models.Workout)
+            .outerjoin(training_models.Workout, training_models.Workout.athlete_id == identity_models.Athlete.id)
+        )
+        sql = compile_sql(stmt)
+
+        # Assert
+        assert "FROM athletes LEFT OUTER JOIN workouts" in sql
+        assert f"athletes.coach_id = '{coach_id}'" in sql
+        assert f"athletes.id = '{athlete_id}'" in sql
+
+    def test_join_owning_athlete_restricts_child_rows(self):
+        """Test that rows looked up by their own id are restricted to the coach's athletes."""
+        # Arrange
+        workout_id, coach_id = uuid.uuid4(), uuid.uuid4()
+        stmt = select(training_models.Workout).where(training_models.Workout.id == workout_id)
+
+        # Act
+        sql = compile_sql(scoping.join_owning_athlete(stmt, training_models.Workout.athlete_id, coach_id))
+
+        # Assert
+        assert "JOIN athletes ON athletes.id = workouts.athlete_id" in sql
+        assert f"athletes.coach_id = '{coach_id}'" in sql
+
+
+class TestFetchScoped:
+    """Tests for resolving anchored rows."""
+
+    def test_missing_anchor_raises_not_found(self):
+        """Test that an unowned or missing anchor is reported as 404."""
+        # Arrange
+        result = Mock()
+        result.all.return_value = []
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(scoping.fetch_scoped(db, select(1), "Athlete not found"))
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        assert exc_info.value.detail == "Athlete not found"
+        db.execute.assert_awaited_once()
+
+    def test_joined_drops_empty_outer_join_row(self):
+        """Test that an owned anchor with nothing attached yields an empty list."""
+        # Arrange
+        anchor_id = uuid.uuid4()
+
+        # Act & Assert
+        assert scoping.joined([(anchor_id, None)]) == []
+        assert scoping.joined([(anchor_id, "a"), (anchor_id, "b")]) == ["a", "b"]
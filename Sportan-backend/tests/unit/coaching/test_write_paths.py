@@ -0,0 +1,121 @@
+"""Unit tests for group, athlete and parent writes built on INSERT/UPDATE ... RETURNING."""
+
+import asyncio
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.modules.ai import models as ai_models  # noqa: F401
+from app.modules.coaching import schemas as coaching_schemas
+from app.modules.coaching import scoping
+from app.modules.coaching import service as coaching_service
+from app.modules.identity import models as identity_models
+from app.modules.training import models as training_models  # noqa: F401
+
+
+class TestInsertIfOwned:
+    """Tests for inserting rows only when the owning anchor row exists."""
+
+    def test_values_are_selected_from_the_anchor(self):
+        """Test that the values are an INSERT ... SELECT from the owned group, returning the new row."""
+        # Arrange
+        group_id, coach_id = uuid.uuid4(), uuid.uuid4()
+
+        # Act
+        stmt = scoping.insert_if_owned(
+            identity_models.Athlete,
+            scoping.owned_group(group_id, coach_id),
+            {"coach_id": coach_id, "full_name": "Jane Doe", "dob": None, "notes": None},
+        )
+        compiled = stmt.compile(dialect=asyncpg.dialect())
+        sql = " ".join(str(compiled).split())
+
+        # Assert
+        assert sql.startswith("INSERT INTO athletes (coach_id, full_name, dob, notes) SELECT")
+        assert "FROM groups WHERE groups.id = $5::UUID AND groups.coach_id = $6::UUID RETURNING athletes.id" in sql
+        assert group_id in compiled.params.values() and "Jane Doe" in compiled.params.values()
+
+
+class TestOwnedWrites:
+    """Tests that the owner gets the written row and anyone else gets 404."""
+
+    def test_athlete_is_created_in_an_owned_group(self, mock_session, compiled):
+        """Test that the new athlete is returned and added to the group."""
+        # Arrange
+        athlete = Mock(id=uuid.uuid4())
+        db = mock_session(athlete, None)
+        data = coaching_schemas.AthleteCreate(full_name="Jane Doe")
+
+        # Act
+        result = asyncio.run(coaching_service.create_athlete(db, uuid.uuid4(), uuid.uuid4(), data))
+
+        # Assert
+        assert result is athlete
+        assert str(compiled(db, 1)).startswith("INSERT INTO group_athletes")
+        db.commit.assert_awaited_once()
+
+    def test_athlete_in_someone_elses_group_is_not_found(self, mock_session):
+        """Test that an insert with no owned group to select from is reported as 404."""
+        # Arrange
+        db = mock_session(None)
+        data = coaching_schemas.AthleteCreate(full_name="Jane Doe")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(coaching_service.create_athlete(db, uuid.uuid4(), uuid.uuid4(), data))
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        assert exc_info.value.detail == "Group not found"
+        db.execute.assert_awaited_once()
+        db.commit.assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        ("update", "data", "table", "detail"),
+        [
+            (coaching_service.update_group, coaching_schemas.GroupUpdate(name="Sprinters"), "groups", "Group"),
+            (coaching_service.update_athlete, coaching_schemas.AthleteUpdate(notes="Fast"), "athletes", "Athlete"),
+        ],
+    )
+    def test_update_is_scoped_to_the_coach(self, mock_session, compiled, update, data, table, detail):
+        """Test that the coach predicate is part of the UPDATE and only the owner gets the row."""
+        # Arrange
+        coach_id = uuid.uuid4()
+        row = Mock()
+        owner_db, stranger_db = mock_session(row), mock_session(None)
+
+        # Act
+        result = asyncio.run(update(owner_db, uuid.uuid4(), coach_id, data))
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(update(stranger_db, uuid.uuid4(), uuid.uuid4(), data))
+        sql = compiled(owner_db)
+
+        # Assert
+        assert result is row
+        assert str(sql).startswith(f"UPDATE {table} SET")
+        assert f"{table}.coach_id = $" in str(sql) and f"RETURNING {table}.id" in str(sql)
+        assert coach_id in sql.params.values()
+        owner_db.commit.assert_awaited_once()
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        assert exc_info.value.detail == f"{detail} not found"
+        stranger_db.commit.assert_not_awaited()
+
+    def test_parent_update_returns_the_row_or_not_found(self, mock_session, compiled):
+        """Test that the parent update returns the updated row, and 404 when there is none."""
+        # Arrange
+        parent = Mock()
+        data = coaching_schemas.ParentUpdate(full_name="John Doe")
+        missing_db = mock_session(None)
+
+        # Act
+        result = asyncio.run(coaching_service.update_parent(mock_session(parent), uuid.uuid4(), data))
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(coaching_service.update_parent(missing_db, uuid.uuid4(), data))
+
+        # Assert
+        assert result is parent
+        assert str(compiled(missing_db)).startswith("UPDATE parents SET full_name=")
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        missing_db.commit.assert_not_awaited()
@@ -0,0 +1,33 @@
+"""Fixtures shared by the unit tests."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+
+@pytest.fixture
+def mock_session():
+    """Factory of AsyncSession mocks whose execute() calls return `firsts` in turn as their first row."""
+
+    def make(*firsts):
+        results = []
+        for first in firsts:
+            result = Mock()
+            result.scalars.return_value.first.return_value = first
+            results.append(result)
+        db = AsyncMock()
+        db.execute.side_effect = results
+        return db
+
+    return make
+
+
+@pytest.fixture
+def compiled():
+    """Compile the statement of a mock session's `call`-th execute() for asyncpg."""
+
+    def compile_call(db, call: int = 0):
+        return db.execute.await_args_list[call].args[0].compile(dialect=asyncpg.dialect())
+
+    return compile_call
@@ -0,0 +1,124 @@
+"""Unit tests for the response compression middleware."""
+
+import brotli
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+
+PAYLOAD = '{"title":"Sprint intervals","metrics":{"60m":9.1}}' * 100
+
+
+async def large(request):
+    return PlainTextResponse(PAYLOAD)
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(3):
+            yield PAYLOAD
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+async def events(request):
+    async def chunks():
+        yield "data: one\n\n"
+        yield "data: two\n\n"
+
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[Route("/large", large), Route("/small", small), Route("/stream", stream), Route("/events", events)]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+class TestCompressionMiddleware:
+    """Tests for encoding negotiation, the size threshold and streamed bodies."""
+
+    def test_prefers_brotli_with_exact_content_length(self, client):
+        """Test that a single-message body is brotli-compressed whole."""
+        # Act
+        response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+        # Assert
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(PAYLOAD) / 10
+        assert response.text == PAYLOAD
+
+    @pytest.mark.parametrize(
+        ("accept_encoding", "expected"),
+        [
+            ("br;q=0, gzip", "gzip"),
+            ("br;q=0.5, gzip;q=0.8", "gzip"),
+            ("gzip;q=0.5, br", "br"),
+            ("*;q=0.1, br;q=0", "gzip"),
+            ("identity", None),
+            ("identity, br;q=0, gzip;q=0", None),
+        ],
+    )
+    def test_encoding_follows_q_values(self, client, accept_encoding, expected):
+        """Test that refused codings (q=0) are never used and the highest q-value wins."""
+        # Act
+        response = client.get("/large", headers={"Accept-Encoding": accept_encoding})
+
+        # Assert
+        assert response.headers.get("content-encoding") == expected
+        assert response.text == PAYLOAD
+
+    def test_small_bodies_are_sent_uncompressed(self, client):
+        """Test that bodies under the threshold skip compression."""
+        # Act
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert "content-encoding" not in response.headers
+        assert response.text == "ok"
+
+    def test_streamed_bodies_are_compressed_chunk_by_chunk(self, client):
+        """Test that a streamed body is gzip-compressed incrementally without a Content-Length."""
+        # Act
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == PAYLOAD * 3
+
+    def test_event_streams_pass_through(self, client):
+        """Test that server-sent events are never compressed."""
+        # Act
+        response = client.get("/events", headers={"Accept-Encoding": "br"})
+
+        # Assert
+        assert "content-encoding" not in response.headers
+        assert response.text == "data: one\n\ndata: two\n\n"
+
+
+class TestBrotliStream:
+    """Tests that flushed brotli chunks decode as one stream."""
+
+    def test_flushed_chunks_concatenate(self):
+        """Test that per-chunk flushes still produce a single valid brotli stream."""
+        # Arrange
+        middleware = CompressionMiddleware(app=None)
+        compressor = middleware.stream("br")
+
+        # Act
+        data = compressor.compress(b"first,") + compressor.compress(b"second") + compressor.finish()
+
+        # Assert
+        assert brotli.decompress(data) == b"first,second"
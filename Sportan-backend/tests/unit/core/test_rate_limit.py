@@ -0,0 +1,57 @@
+"""Unit tests for the upstream call limiter."""
+
+import asyncio
+import time
+
+from app.core.rate_limit import Limiter, TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for pacing calls to a sustained rate."""
+
+    def test_burst_then_sustained_rate(self):
+        """Test that a full bucket allows a burst, then calls are spaced at the rate."""
+        # Arrange
+        bucket = TokenBucket(rate=50, capacity=5)
+
+        async def acquire_all(count: int) -> float:
+            t0 = time.monotonic()
+            for _ in range(count):
+                await bucket.acquire()
+            return time.monotonic() - t0
+
+        # Act
+        burst = asyncio.run(acquire_all(5))
+        paced = asyncio.run(acquire_all(10))
+
+        # Assert
+        assert burst < 0.02
+        assert paced >= 10 / 50 * 0.9
+
+
+class TestLimiter:
+    """Tests for bounding calls in flight."""
+
+    def test_concurrency_never_exceeds_the_limit(self):
+        """Test that at most `concurrency` calls run at once."""
+        # Arrange
+        limiter = Limiter(concurrency=3, rate=1000, burst=1000)
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        async def run():
+            await asyncio.gather(*(call() for _ in range(12)))
+
+        # Act
+        asyncio.run(run())
+
+        # Assert
+        assert peak == 3
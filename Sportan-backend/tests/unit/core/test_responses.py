@@ -0,0 +1,101 @@
+"""Unit tests for orjson-backed responses."""
+
+import json
+import uuid
+from datetime import date, datetime
+
+from pydantic import TypeAdapter
+from starlette.requests import Request
+
+from app.core.responses import ORJSONResponse, revalidated, trusted
+from app.modules.training import schemas as training_schemas
+from app.modules.training.models import WorkoutStatus
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestTrustedResponses:
+    """Tests that trusted output encodes the same JSON as the validated path."""
+
+    def test_trusted_rows_match_validated_response_model(self):
+        """Test that projected assignment rows serialize exactly like AssignedWorkoutRead."""
+        # Arrange
+        rows = [
+            {
+                "title": "Intervals",
+                "description": None,
+                "scheduled_date": date(2026, 10, 19),
+                "id": uuid.uuid4(),
+                "athlete_id": uuid.uuid4(),
+                "status": WorkoutStatus.COMPLETED,
+                "created_at": datetime(2026, 10, 18, 7, 30, 15, 120000),
+            }
+        ]
+        adapter = TypeAdapter(list[training_schemas.AssignedWorkoutRead])
+
+        # Act
+        response = trusted(rows)
+
+        # Assert
+        assert json.loads(response.body) == adapter.dump_python(adapter.validate_python(rows), mode="json")
+
+    def test_pydantic_models_are_encoded(self):
+        """Test that schema instances returned by services are encoded without a response model."""
+        # Arrange
+        summary = training_schemas.AthleteSummary(
+            total_workouts=3, workouts_this_week=1, workouts_this_month=2, last_workout_date=date(2026, 10, 19)
+        )
+
+        # Act
+        response = ORJSONResponse(summary)
+
+        # Assert
+        assert json.loads(response.body) == {
+            "total_workouts": 3,
+            "workouts_this_week": 1,
+            "workouts_this_month": 2,
+            "last_workout_date": "2026-10-19",
+        }
+
+
+class TestRevalidatedResponses:
+    """Tests for bodies revalidated by an ETag of their content."""
+
+    def test_first_request_gets_body_and_etag(self):
+        """Test that a request without If-None-Match gets the body, a weak ETag and no-cache."""
+        # Act
+        response = revalidated(_request(), {"groups": 2})
+
+        # Assert
+        assert response.status_code == 200
+        assert json.loads(response.body) == {"groups": 2}
+        assert response.headers["etag"].startswith('W/"')
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    def test_matching_etag_gets_not_modified(self):
+        """Test that sending back the ETag of an unchanged body returns 304 without a body."""
+        # Arrange
+        etag = revalidated(_request(), {"groups": 2}).headers["etag"]
+
+        # Act
+        response = revalidated(_request(etag), {"groups": 2})
+
+        # Assert
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
+
+    def test_changed_body_gets_new_etag(self):
+        """Test that a stale ETag gets the new body and its own ETag."""
+        # Arrange
+        etag = revalidated(_request(), {"groups": 2}).headers["etag"]
+
+        # Act
+        response = revalidated(_request(etag), {"groups": 3})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
@@ -0,0 +1,72 @@
+"""Unit tests for full-text search statements."""
+
+import asyncio
+import uuid
+from collections import namedtuple
+from datetime import date
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.modules.search import service as search_service
+from app.modules.search.schemas import SearchKind
+
+
+def compile_sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestSearchStatement:
+    """Tests for the statement behind GET /coach/search."""
+
+    def test_sources_are_scoped_and_highlighted_after_the_page(self):
+        """Test that each requested kind is limited to the coach, and ts_headline runs outside the LIMIT."""
+        # Arrange
+        coach_id = uuid.uuid4()
+        result = Mock()
+        result.all.return_value = []
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act
+        page = asyncio.run(
+            search_service.search(db, coach_id, "hamstring", [SearchKind.WORKOUT, SearchKind.GROUP_INSIGHT], limit=5)
+        )
+        sql = compile_sql(db.execute.await_args_list[-1].args[0])
+
+        # Assert
+        assert page.items == [] and page.next_offset is None
+        assert sql.count(f"coach_id = '{coach_id}'") == 2
+        assert "workouts.search_vector @@ websearch_to_tsquery('english', 'hamstring')" in sql
+        assert "group_insights.search_vector @@" in sql
+        assert "talent_reports" not in sql
+        # The headline is computed by the outer select, over the rows of the limited page only
+        assert sql.index("ts_headline") < sql.index("LIMIT 6")
+        assert "ts_headline" not in sql[sql.index("FROM (") :]
+
+    def test_highlight_escapes_the_text_but_not_the_marks(self):
+        """Test that markup in a note comes back escaped while the matched words are wrapped in <mark>."""
+        # Arrange
+        hit = {
+            "kind": "workout",
+            "id": uuid.uuid4(),
+            "athlete_id": uuid.uuid4(),
+            "athlete_name": "Jane Doe",
+            "group_id": None,
+            "title": "Intervals",
+            "date": date(2026, 10, 19),
+            "rank": 0.5,
+            "highlight": "sore hamstring <img src=x onerror=alert(1)> & pull",
+        }
+        result = Mock()
+        result.all.return_value = [namedtuple("Row", hit)(**hit)]
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        # Act
+        page = asyncio.run(search_service.search(db, uuid.uuid4(), "hamstring"))
+        sql = compile_sql(db.execute.await_args_list[-1].args[0])
+
+        # Assert
+        assert page.items[0].highlight == "sore <mark>hamstring</mark> &lt;img src=x onerror=alert(1)&gt; &amp; pull"
+        assert "ts_headline('english', translate(" in sql
@@ -0,0 +1 @@
+# Training unit tests module
@@ -0,0 +1,155 @@
+"""Unit tests for coach-scoped workout and assignment writes."""
+
+import asyncio
+import uuid
+from datetime import date
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.modules.ai import models as ai_models  # noqa: F401
+from app.modules.training import models as training_models
+from app.modules.training import schemas as training_schemas
+from app.modules.training import service as training_service
+
+
+def _workout_data(assigned_workout_id: uuid.UUID | None = None) -> training_schemas.WorkoutCreate:
+    return training_schemas.WorkoutCreate(
+        athlete_id=uuid.uuid4(),
+        assigned_workout_id=assigned_workout_id,
+        date=date(2026, 10, 19),
+        title="Intervals",
+        metrics={"sprint_100m": 12.1},
+    )
+
+
+class TestLogWorkout:
+    """Tests for logging a workout in one INSERT ... SELECT from the coach's athlete."""
+
+    def test_owner_gets_the_inserted_workout_and_completes_the_assignment(self, mock_session, compiled):
+        """Test that the insert is anchored on the owned athlete and that athlete's assignment."""
+        # Arrange
+        coach_id, assignment_id = uuid.uuid4(), uuid.uuid4()
+        workout = Mock()
+        db = mock_session(workout, None)
+
+        # Act
+        result = asyncio.run(training_service.log_workout(db, coach_id, _workout_data(assignment_id)))
+        insert_sql, update_sql = compiled(db, 0), compiled(db, 1)
+
+        # Assert
+        assert result is workout
+        assert str(insert_sql).startswith("INSERT INTO workouts")
+        assert "FROM athletes" in str(insert_sql) and "athletes.coach_id = $" in str(insert_sql)
+        assert "EXISTS (SELECT assigned_workouts.id" in str(insert_sql)
+        assert "assigned_workouts.athlete_id = $" in str(insert_sql)
+        assert "RETURNING workouts.id" in str(insert_sql)
+        assert coach_id in insert_sql.params.values() and assignment_id in insert_sql.params.values()
+        assert str(update_sql).startswith("UPDATE assigned_workouts SET status=")
+        assert update_sql.params["status"] == training_models.WorkoutStatus.COMPLETED
+        db.commit.assert_awaited_once()
+
+    def test_unowned_athlete_is_not_found(self, mock_session):
+        """Test that nothing inserted and no athlete of the coach is reported as 404."""
+        # Arrange
+        db = mock_session(None, None)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(training_service.log_workout(db, uuid.uuid4(), _workout_data(uuid.uuid4())))
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        db.commit.assert_not_awaited()
+
+    def test_missing_or_foreign_assignment_is_bad_request(self, mock_session):
+        """Test that an owned athlete with an assignment that is not theirs (or does not exist) gets 400."""
+        # Arrange
+        db = mock_session(None, Mock())
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(training_service.log_workout(db, uuid.uuid4(), _workout_data(uuid.uuid4())))
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert exc_info.value.detail == "Assignment does not belong to this athlete"
+        db.commit.assert_not_awaited()
+
+
+class TestScopedWrites:
+    """Tests that assignment and workout writes check ownership in the same statement."""
+
+    def test_assignment_for_unowned_athlete_is_not_found(self, mock_session, compiled):
+        """Test that an insert with no owned athlete to select from is reported as 404."""
+        # Arrange
+        coach_id = uuid.uuid4()
+        db = mock_session(None)
+        data = training_schemas.AssignedWorkoutCreate(scheduled_date=date(2026, 10, 20), title="Tempo")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(training_service.create_assignment_for_athlete(db, coach_id, uuid.uuid4(), data))
+
+        sql = compiled(db)
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        assert str(sql).startswith("INSERT INTO assigned_workouts") and "FROM athletes" in str(sql)
+        assert coach_id in sql.params.values()
+        db.commit.assert_not_awaited()
+
+    def test_assignment_status_returns_the_updated_row_to_its_owner(self, mock_session, compiled):
+        """Test that the status update is restricted to the coach's athletes and returns the row."""
+        # Arrange
+        coach_id = uuid.uuid4()
+        assignment = Mock()
+        db = mock_session(assignment)
+
+        # Act
+        result = asyncio.run(
+            training_service.update_assignment_status(db, uuid.uuid4(), training_models.WorkoutStatus.SKIPPED, coach_id)
+        )
+        sql = compiled(db)
+
+        # Assert
+        assert result is assignment
+        assert "assigned_workouts.athlete_id IN (SELECT athletes.id" in str(sql)
+        assert "RETURNING assigned_workouts.id" in str(sql)
+        assert coach_id in sql.params.values()
+        db.commit.assert_awaited_once()
+
+    def test_assignment_status_of_another_coach_is_not_found(self, mock_session):
+        """Test that an update matching no row of the coach is reported as 404."""
+        # Arrange
+        db = mock_session(None)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(
+                training_service.update_assignment_status(
+                    db, uuid.uuid4(), training_models.WorkoutStatus.SKIPPED, uuid.uuid4()
+                )
+            )
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        db.commit.assert_not_awaited()
+
+    @patch("app.modules.training.service.analytics_service.invalidate", new_callable=AsyncMock)
+    @patch("app.modules.training.service.ai_summaries.invalidate", new_callable=AsyncMock)
+    def test_workout_update_is_scoped_to_the_coach(self, mock_summaries, mock_analytics, mock_session, compiled):
+        """Test that the owner gets the updated workout and another coach gets 404."""
+        # Arrange
+        coach_id = uuid.uuid4()
+        workout = Mock()
+        data = training_schemas.WorkoutUpdate(notes="Felt strong")
+
+        # Act
+        updated = asyncio.run(training_service.update_workout(mock_session(workout), uuid.uuid4(), coach_id, data))
+        db = mock_session(None)
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(training_service.update_workout(db, uuid.uuid4(), uuid.uuid4(), data))
+
+        # Assert
+        assert updated is workout
+        mock_summaries.assert_awaited_once()
+        assert "workouts.athlete_id IN (SELECT athletes.id" in str(compiled(db))
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        db.commit.assert_not_awaited()